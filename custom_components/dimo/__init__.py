@@ -1,26 +1,58 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import logging
-from dataclasses import dataclass
+from collections.abc import AsyncIterator
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 import dimo as dimo_sdk
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_CLIENT_ID
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (DataUpdateCoordinator,
+                                                      UpdateFailed)
+from homeassistant.util import ssl as ssl_util
 from typing_extensions import Mapping
 
+from .breaker import CircuitBreaker
+from .cadence import SignalCadenceLearner
 from .config_flow import InvalidAuth, NoVehiclesException
-from .const import (CONF_AUTH_PROVIDER, CONF_POLL_INTERVAL, CONF_PRIVATE_KEY,
-                    DEFAULT_POLL_INTERVAL, DIMO_SENSORS, DOMAIN, PLATFORMS)
-from .dimoapi import (Auth, DimoClient, InvalidApiKeyFormat,
-                      InvalidClientIdError, InvalidCredentialsError)
-from .helpers import get_key
+from .const import (CONF_AUTH_PROVIDER, CONF_HEDGE_BUDGET,
+                    CONNECTION_KEEPALIVE_MARGIN,
+                    CONF_HEDGE_REQUESTS, CONF_MAX_CONCURRENT_REQUESTS,
+                    CONF_MAX_POLL_INTERVAL, CONF_MAX_VEHICLE_STALENESS,
+                    CONF_POLL_INTERVAL, CONF_POLL_SCHEDULING,
+                    CONF_PRIVATE_KEY, CONF_RATE_LIMIT,
+                    CONF_RATE_LIMIT_BURST, CONF_REWARDS_INTERVAL,
+                    CONF_VEHICLES_PER_TICK, DEFAULT_HEDGE_BUDGET,
+                    DEFAULT_HEDGE_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS,
+                    DEFAULT_MAX_POLL_INTERVAL, DEFAULT_MAX_VEHICLE_STALENESS,
+                    DEFAULT_POLL_INTERVAL,
+                    DEFAULT_POLL_SCHEDULING, DEFAULT_RATE_LIMIT,
+                    DEFAULT_RATE_LIMIT_BURST, DEFAULT_REWARDS_INTERVAL,
+                    DEFAULT_VEHICLES_PER_TICK, DIMO_SENSORS, DOMAIN, PLATFORMS,
+                    POLL_CYCLE_TIMEOUT, POLL_SCHEDULING_ROLLING,
+                    POLL_SCHEDULING_STAGGERED,
+                    STORAGE_SAVE_DELAY, STORAGE_VERSION,
+                    TOKEN_RENEWAL_CHECK_INTERVAL)
+from .dimoapi import (DEFAULT_CHUNK_CONCURRENCY, Auth, ConnectionStats,
+                      DimoClient, InvalidApiKeyFormat, InvalidClientIdError,
+                      InvalidCredentialsError, RateLimiter,
+                      connection_pool_size, create_client_session)
+from .helpers import get_changed_keys, get_key, get_min_poll_interval
+from .io_limiter import IOLimiter
+from .polling import (VehiclePollState, is_vehicle_active, jitter_interval,
+                      select_poll_interval, select_vehicle_shard,
+                      stagger_offsets)
+from .token_store import EncryptedTokenStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,14 +70,54 @@ type DIMOConfigEntry = ConfigEntry[DIMOConfigData]
 async def async_setup_entry(hass: HomeAssistant, entry: DIMOConfigEntry) -> bool:
     """Set up DIMO from a config entry."""
 
+    # A connector of our own, with a connection for every request that can
+    # run at once, kept open until the next poll so polls reuse connections
+    # instead of handshaking new ones
+    connection_stats = ConnectionStats()
+    session = create_client_session(
+        connection_pool_size(
+            entry.options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            ),
+            DEFAULT_CHUNK_CONCURRENCY,
+        ),
+        get_min_poll_interval(entry.options) + CONNECTION_KEEPALIVE_MARGIN,
+        ssl=ssl_util.client_context(),
+        connection_stats=connection_stats,
+    )
+    entry.async_on_unload(session.close)
+
     auth = Auth(
         entry.data[CONF_CLIENT_ID],
         entry.data[CONF_AUTH_PROVIDER],
         entry.data[CONF_PRIVATE_KEY],
+        session=session,
+        connection_stats=connection_stats,
+        rate_limiter=RateLimiter(
+            entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+            entry.options.get(CONF_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_BURST),
+        ),
+    )
+    # Restore the tokens of the previous run so warm restarts can skip the
+    # auth handshake and token exchanges
+    token_store = EncryptedTokenStore(
+        hass, entry.entry_id, entry.data[CONF_PRIVATE_KEY]
+    )
+    auth.import_tokens(await token_store.async_load())
+
+    client = DimoClient(
+        auth,
+        rewards_ttl=timedelta(
+            seconds=entry.options.get(CONF_REWARDS_INTERVAL, DEFAULT_REWARDS_INTERVAL)
+        ),
+        hedge_budget=(
+            entry.options.get(CONF_HEDGE_BUDGET, DEFAULT_HEDGE_BUDGET) / 100
+            if entry.options.get(CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS)
+            else None
+        ),
     )
-    client = DimoClient(auth)
     try:
-        await hass.async_add_executor_job(client.init)
+        await client.async_init()
     except (
         InvalidAuth,
         InvalidClientIdError,
@@ -55,6 +127,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: DIMOConfigEntry) -> bool
         _LOGGER.error(
             "Unable to setup Dimo integration due to invalid credentials. Please check them and try again"
         )
+        await session.close()
         return False
     except NoVehiclesException as ex:
         _LOGGER.error(
@@ -64,10 +137,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: DIMOConfigEntry) -> bool
     except Exception as ex:
         raise ConfigEntryNotReady from ex
 
-    coordinator = DimoUpdateCoordinator(hass, entry, client)
+    coordinator = DimoUpdateCoordinator(hass, entry, client, token_store)
     entry.runtime_data = DIMOConfigData(coordinator)
     await coordinator.async_initialise()
     await coordinator.async_config_entry_first_refresh()
+    await coordinator.async_refresh_rewards()
+    # In rolling mode the ticks refresh the vehicles not polled yet first,
+    # a shard at a time instead of the whole fleet at once
+    if coordinator.rolling:
+        await coordinator.async_refresh_vehicle_shard()
+    else:
+        await coordinator.async_refresh_vehicles()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -81,6 +161,19 @@ async def async_update_options(hass: HomeAssistant, entry: DIMOConfigEntry) -> N
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: DIMOConfigEntry) -> None:
+    """Delete the tokens and chunk plans stored for a removed entry."""
+    await EncryptedTokenStore(
+        hass, entry.entry_id, entry.data[CONF_PRIVATE_KEY]
+    ).async_remove()
+    await _chunk_plan_store(hass, entry).async_remove()
+
+
+def _chunk_plan_store(hass: HomeAssistant, entry: DIMOConfigEntry) -> Store:
+    """Return the store of the signal chunk plans learned for an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.chunk_plans")
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry, device_entry
 ) -> bool:
@@ -102,16 +195,25 @@ class VehicleData:
     available_signals: Optional[dict] = None
     signal_data: Optional[dict] = None
     signal_data_errors: Optional[dict] = None
+    # Signals whose chunk failed in the last fetch
+    failed_signals: list[str] = field(default_factory=list)
 
 
 class DimoUpdateCoordinator(DataUpdateCoordinator):
-    """Update coordinator."""
+    """
+    Account level update coordinator.
+
+    Sets up the vehicles and refreshes the data shared by the account, the
+    DIMO sensors and token rewards. Each vehicle's signals are refreshed by
+    its own DimoVehicleCoordinator.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         entry: DIMOConfigEntry,
         client: DimoClient,
+        token_store: Optional[EncryptedTokenStore] = None,
     ) -> None:
         """Initialise update coordinator."""
 
@@ -133,6 +235,35 @@ class DimoUpdateCoordinator(DataUpdateCoordinator):
 
         self.dimo_data: dict[str, Any] = {}
         self.vehicle_data: dict[str, VehicleData] = {}
+        self.vehicle_coordinators: dict[str, DimoVehicleCoordinator] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+        scheduling = entry.options.get(CONF_POLL_SCHEDULING, DEFAULT_POLL_SCHEDULING)
+        self.staggered = scheduling == POLL_SCHEDULING_STAGGERED
+        # In rolling mode each poll interval a shard of the vehicles is
+        # refreshed, instead of vehicles scheduling their own refreshes
+        self.rolling = scheduling == POLL_SCHEDULING_ROLLING
+        self._shard_lock = asyncio.Lock()
+        self.vehicles_per_tick = entry.options.get(
+            CONF_VEHICLES_PER_TICK, DEFAULT_VEHICLES_PER_TICK
+        )
+        self.max_vehicle_staleness = timedelta(
+            seconds=entry.options.get(
+                CONF_MAX_VEHICLE_STALENESS, DEFAULT_MAX_VEHICLE_STALENESS
+            )
+        )
+        self.rewards_data: dict[str, Any] = {}
+        self._token_rewards: dict[str, dict[str, Any]] = {}
+        # Keys of dimo_data changed by the last update, None to notify all
+        self.changed_keys: Optional[set[str]] = None
+        self.suppressed_writes = 0
+        self.cycle_timeouts = 0
+        self.io_limiter = IOLimiter(
+            entry.options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            )
+        )
+        self._chunk_plan_store: Optional[Store] = None
+        self._token_store = token_store
 
     async def _async_setup_single_vehicle(self, vehicle_token_id: str):
         """Fetch all required I/O data for a vehicle, then create the device."""
@@ -143,32 +274,188 @@ class DimoUpdateCoordinator(DataUpdateCoordinator):
         )
 
         self.create_vehicle_device(vehicle_token_id)
+        self.vehicle_coordinators[vehicle_token_id] = DimoVehicleCoordinator(
+            self.hass, self.entry, self, vehicle_token_id
+        )
+
+    async def async_refresh_vehicles(self):
+        """
+        Refresh every vehicle not polled yet, each failing on its own.
+
+        In staggered mode the following polls of the vehicles are then
+        spread evenly over the poll interval instead of all firing together.
+        """
+        await asyncio.gather(
+            *(
+                vehicle_coordinator.async_refresh()
+                for vehicle_coordinator in self.vehicle_coordinators.values()
+                if vehicle_coordinator.last_polled is None
+            )
+        )
+
+        if self.staggered:
+            offsets = stagger_offsets(
+                len(self.vehicle_coordinators),
+                timedelta(seconds=get_min_poll_interval(self.entry.options)),
+            )
+            for vehicle_coordinator, offset in zip(
+                self.vehicle_coordinators.values(), offsets
+            ):
+                vehicle_coordinator.delay_next_refresh(offset)
+
+    async def async_refresh_vehicle_shard(self, _now: Optional[datetime] = None):
+        """
+        Refresh the shard of vehicles most in need of it, in rolling mode.
+
+        A tick is skipped while the shard of the previous one is still
+        being refreshed.
+        """
+        if self._shard_lock.locked():
+            _LOGGER.debug("Previous shard still refreshing, skipping this tick")
+            return
+
+        async with self._shard_lock:
+            shard = select_vehicle_shard(
+                {
+                    token_id: vehicle_coordinator.poll_state
+                    for token_id, vehicle_coordinator in self.vehicle_coordinators.items()
+                },
+                self.vehicles_per_tick,
+                datetime.now(timezone.utc),
+                self.max_vehicle_staleness,
+            )
+            _LOGGER.debug(
+                "Refreshing %d of %d vehicles", len(shard), len(self.vehicle_coordinators)
+            )
+            await asyncio.gather(
+                *(
+                    self.vehicle_coordinators[token_id].async_refresh()
+                    for token_id in shard
+                )
+            )
 
     async def async_initialise(self):
         """Get initial static data."""
-        await self.get_vehicles_data()
+        await self._async_load_chunk_plans()
 
         # Add Dimo device for non vehicle specific sensors
         if DIMO_SENSORS:
             self.create_dimo_device()
             await self.get_dimo_sensor_data()
 
-        if self.vehicle_data:
-            # Run the setup process concurrently for all vehicles
-            await asyncio.gather(
-                *[
-                    self._async_setup_single_vehicle(vehicle_token_id)
-                    for vehicle_token_id in self.vehicle_data
-                ]
+        # Set up the vehicles of each page concurrently while the next
+        # page is still downloading
+        setup_tasks: list[asyncio.Task] = []
+        try:
+            async for vehicle_token_ids in self.async_iter_vehicles_data():
+                setup_tasks.extend(
+                    asyncio.create_task(
+                        self._async_setup_single_vehicle(vehicle_token_id)
+                    )
+                    for vehicle_token_id in vehicle_token_ids
+                )
+        except BaseException:
+            for task in setup_tasks:
+                task.cancel()
+            await asyncio.gather(*setup_tasks, return_exceptions=True)
+            raise
+
+        if setup_tasks:
+            await asyncio.gather(*setup_tasks)
+
+        # Renew privileged tokens ahead of expiry so polls never have to
+        # wait on a token exchange
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self.async_renew_tokens,
+                timedelta(seconds=TOKEN_RENEWAL_CHECK_INTERVAL),
+                name=f"{DOMAIN} token renewal",
+            )
+        )
+
+        # Rewards and rolling ticks run on their own schedule, as this
+        # coordinator only refreshes while its entities are enabled
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self.async_refresh_rewards,
+                self.update_interval,
+                name=f"{DOMAIN} token rewards",
+            )
+        )
+        if self.rolling:
+            self.entry.async_on_unload(
+                async_track_time_interval(
+                    self.hass,
+                    self.async_refresh_vehicle_shard,
+                    self.update_interval,
+                    name=f"{DOMAIN} rolling poll",
+                )
+            )
+
+    async def async_renew_tokens(self, _now: Optional[datetime] = None):
+        """Renew the privileged vehicle tokens that are about to expire."""
+        try:
+            failures = await self.client.auth.async_renew_privileged_tokens(
+                call=self._async_call
+            )
+        except Exception as ex:  # noqa: BLE001
+            _LOGGER.warning("Unable to renew vehicle tokens ahead of expiry: %s", ex)
+            return
+
+        for vehicle_token_id, ex in failures.items():
+            _LOGGER.debug(
+                "Unable to renew token for vehicle %s ahead of expiry: %s",
+                vehicle_token_id,
+                ex,
             )
 
+        self._async_save_tokens()
+
+    async def _async_load_chunk_plans(self):
+        """Restore the signal chunk plans learned before the last restart."""
+        self._chunk_plan_store = _chunk_plan_store(self.hass, self.entry)
+        self.client.import_chunk_plans(await self._chunk_plan_store.async_load())
+
+    @callback
+    def _async_save_chunk_plans(self):
+        """Schedule a save of the chunk plans if the client learned new ones."""
+        if self._chunk_plan_store and self.client.chunk_plans_changed:
+            self.client.chunk_plans_changed = False
+            self._chunk_plan_store.async_delay_save(
+                self.client.export_chunk_plans, STORAGE_SAVE_DELAY
+            )
+
+    @callback
+    def _async_save_tokens(self):
+        """Schedule a save of the tokens if any were refreshed."""
+        if self._token_store and self.client.auth.tokens_changed:
+            self.client.auth.tokens_changed = False
+            self._token_store.async_delay_save(
+                self.client.auth.export_tokens, STORAGE_SAVE_DELAY
+            )
+
+    async def async_shutdown(self) -> None:
+        """Persist the current tokens so a reload can reuse them."""
+        await super().async_shutdown()
+        if self._token_store:
+            await self._token_store.async_save(self.client.auth.export_tokens())
+
     async def get_dimo_sensor_data(self):
         """Get Dimo sensor data from DIMO_SENSORS defs in parallel."""
         async def fetch_sensor(key, sensor_def):
             if hasattr(self.client, sensor_def.value_fn):
                 fn = getattr(self.client, sensor_def.value_fn)
                 try:
-                    result = await self.hass.async_add_executor_job(fn)
+                    if sensor_def.local:
+                        result = fn()
+                    elif sensor_def.refresh_interval:
+                        result = await self.client.async_get_cached(
+                            fn, sensor_def.refresh_interval, call=self._async_call
+                        )
+                    else:
+                        result = await self._async_call(fn)
                 except Exception:  # noqa: BLE001
                     _LOGGER.exception(
                         "Error fetching DIMO sensor '%s' for key '%s'",
@@ -185,22 +472,28 @@ class DimoUpdateCoordinator(DataUpdateCoordinator):
         for key, value in results:
             self.dimo_data[key] = value
 
-    async def get_vehicles_data(self):
-        """Get all vehicle data."""
-        vehicles_data = await self.get_api_data(
-            self.client.get_all_vehicles_for_license, self.entry.data[CONF_CLIENT_ID]
+    async def async_iter_vehicles_data(self) -> AsyncIterator[list[str]]:
+        """Get all vehicle data, yielding the token ids of each page as it arrives."""
+        pages = self.client.async_iter_vehicles_for_license(
+            self.entry.data[CONF_CLIENT_ID]
         )
-        if vehicles_data is None:
-            _LOGGER.warning("Got no vehicle data from the API. Skipping update")
-            return
-
-        vehicles = get_key("data.vehicles.nodes", vehicles_data)
-        for vehicle in vehicles:
-            vehicle_token_id = vehicle.get("tokenId")
+        try:
+            async for vehicles in pages:
+                vehicle_token_ids = []
+                for vehicle in vehicles:
+                    vehicle_token_id = vehicle.get("tokenId")
 
-            self.vehicle_data[vehicle_token_id] = VehicleData(
-                definition=vehicle.get("definition")
-            )
+                    self.vehicle_data[vehicle_token_id] = VehicleData(
+                        definition=vehicle.get("definition")
+                    )
+                    vehicle_token_ids.append(vehicle_token_id)
+                yield vehicle_token_ids
+        except dimo_sdk.request.HTTPError as ex:
+            # Setting up with only some of the vehicles would silently drop
+            # the rest, retry the whole setup instead
+            raise ConfigEntryNotReady(
+                f"Unable to retrieve all vehicles from the DIMO api: {ex}"
+            ) from ex
 
     async def get_available_signals_for_vehicle(self, vehicle_token_id: str):
         """Get available signals for vehicle by token_id."""
@@ -208,7 +501,7 @@ class DimoUpdateCoordinator(DataUpdateCoordinator):
         # Validate vehicle is in our list
         if vehicle_token_id in self.vehicle_data:
             available_signals_data = await self.get_api_data(
-                self.client.get_available_signals, vehicle_token_id
+                self.client.async_get_available_signals, vehicle_token_id
             )
 
             if available_signals_data is None:
@@ -230,40 +523,78 @@ class DimoUpdateCoordinator(DataUpdateCoordinator):
                 vehicle_token_id,
             )
 
-    async def get_signals_data_for_vehicle(self, vehicle_token_id: str):
-        """Get data for list of available signals for vehicle."""
+    async def get_signals_data_for_vehicle(
+        self,
+        vehicle_token_id: str,
+        signal_names: Optional[list[str]] = None,
+        acquire_slot: bool = True,
+    ) -> bool:
+        """
+        Get data for list of available signals for vehicle.
+
+        When signal_names limits the query to some of the available signals,
+        the values of the other signals are kept. Vehicles that keep failing
+        are skipped by their circuit breaker until it lets a probe through.
+        Returns True if signals data was received.
+        """
         if self.vehicle_data.get(vehicle_token_id):
-            signals_task = self.get_api_data(
-                self.client.get_latest_signals_batched,
-                vehicle_token_id,
-                self.vehicle_data[vehicle_token_id].available_signals,
-            )
-            rewards_task = self.get_api_data(
-                self.client.get_rewards_for_vehicle,
-                vehicle_token_id,
+            vehicle = self.vehicle_data[vehicle_token_id]
+            partial = signal_names is not None and set(signal_names) != set(
+                vehicle.available_signals or []
             )
+            breaker = self.breakers.setdefault(vehicle_token_id, CircuitBreaker())
+            # Wait for an io slot before consulting the breaker, so time spent
+            # queued behind other vehicles is never held against this one
+            async with self.io_limiter.slot() if acquire_slot else nullcontext():
+                now = datetime.now(timezone.utc)
+                if not breaker.allow_request(now):
+                    _LOGGER.debug(
+                        "Skipping signals for %s, circuit breaker open until %s",
+                        vehicle_token_id,
+                        breaker.open_until,
+                    )
+                    return False
 
-            signals_data, rewards_data = await asyncio.gather(signals_task, rewards_task)
+                try:
+                    signals_data = await self.get_api_data(
+                        self.client.async_get_latest_signals_batched,
+                        vehicle_token_id,
+                        signal_names
+                        if signal_names is not None
+                        else vehicle.available_signals,
+                        acquire_slot=False,
+                    )
+                except (Exception, asyncio.CancelledError):
+                    # Cancelled by the poll deadline counts as a failure too
+                    breaker.record_failure(now)
+                    raise
 
             if signals_data is None:
+                breaker.record_failure(now)
                 _LOGGER.warning("Got no signals data from the API. Skipping update")
-                return
+                return False
+            breaker.record_success()
 
             _LOGGER.debug("SIGNALS DATA: %s", signals_data)
-            self.vehicle_data[vehicle_token_id].signal_data = get_key(
-                "data.signalsLatest", signals_data
-            )
+            signal_data = get_key("data.signalsLatest", signals_data)
+            failed_chunks = get_key("failed_chunks", signals_data) or []
+            # Signals of failed chunks keep their previous values
+            if (partial or failed_chunks) and vehicle.signal_data:
+                signal_data = {**vehicle.signal_data, **(signal_data or {})}
+            vehicle.signal_data = signal_data
+            vehicle.failed_signals = [
+                name for chunk in failed_chunks for name in chunk["signals"]
+            ]
             self.vehicle_data[vehicle_token_id].signal_data_errors = get_key(
                 "errors", signals_data
             )
+            return True
 
-            # Process and store token rewards
-            self._process_token_rewards(vehicle_token_id, rewards_data)
-        else:
-            _LOGGER.error(
-                "Unable to fetch signals data for %s.  Not a known vehicle on this account",
-                vehicle_token_id,
-            )
+        _LOGGER.error(
+            "Unable to fetch signals data for %s.  Not a known vehicle on this account",
+            vehicle_token_id,
+        )
+        return False
 
     @staticmethod
     def _get_current_timestamp():
@@ -274,25 +605,37 @@ class DimoUpdateCoordinator(DataUpdateCoordinator):
         """Retrieve VIN for a vehicle"""
         _LOGGER.debug("Retrieving VIN for %s", vehicle_token_id)
         try:
-            vin = await self.get_api_data(self.client.get_vin, vehicle_token_id)
+            vin = await self.get_api_data(self.client.async_get_vin, vehicle_token_id)
             if vin:
                 self.vehicle_data[vehicle_token_id].vin = vin
 
         except Exception as e:
             _LOGGER.error("Error getting VIN for vehicle %s: %s", vehicle_token_id, e)
 
+    def apply_token_rewards(self, vehicle_token_id: str):
+        """Store the last fetched token rewards alongside the vehicle's signals."""
+        self._process_token_rewards(
+            vehicle_token_id, self.rewards_data.get(vehicle_token_id)
+        )
+
     def _process_token_rewards(self, vehicle_token_id: str, rewards_data: dict | None):
         """Process and update token rewards for a vehicle."""
         if not rewards_data:
             return
         try:
-            timestamp = self._get_current_timestamp()
             earnings = rewards_data["data"]["vehicle"]["earnings"]["totalTokens"]
-            if self.vehicle_data[vehicle_token_id].signal_data is not None:
-                self.vehicle_data[vehicle_token_id].signal_data["tokenRewards"] = {
-                    "timestamp": timestamp,
+            # Keep the timestamp of unchanged earnings so they don't look new
+            token_rewards = self._token_rewards.get(vehicle_token_id)
+            if token_rewards is None or token_rewards["value"] != earnings:
+                token_rewards = {
+                    "timestamp": self._get_current_timestamp(),
                     "value": earnings,
                 }
+                self._token_rewards[vehicle_token_id] = token_rewards
+            if self.vehicle_data[vehicle_token_id].signal_data is not None:
+                self.vehicle_data[vehicle_token_id].signal_data["tokenRewards"] = (
+                    token_rewards
+                )
         except KeyError:
             _LOGGER.warning(
                 "Rewards data structure unexpected for vehicle %s.", vehicle_token_id
@@ -302,21 +645,76 @@ class DimoUpdateCoordinator(DataUpdateCoordinator):
                 "Error processing token rewards for vehicle %s: %s", vehicle_token_id, e
             )
 
+    async def async_refresh_rewards(self, _now: Optional[datetime] = None):
+        """
+        Refresh the token rewards of every vehicle.
+
+        Rewards of all vehicles come from one batched identity query, and
+        the vehicles' reward entities are notified of those that changed.
+        """
+        try:
+            async with asyncio.timeout(POLL_CYCLE_TIMEOUT):
+                rewards_data = await self.get_api_data(
+                    self.client.async_get_rewards_for_vehicles,
+                    list(self.vehicle_data),
+                )
+        except TimeoutError:
+            self.cycle_timeouts += 1
+            _LOGGER.warning(
+                "Refreshing token rewards took longer than %ss", POLL_CYCLE_TIMEOUT
+            )
+            return
+        except Exception as ex:  # noqa: BLE001
+            _LOGGER.warning("Unable to refresh token rewards: %s", ex)
+            return
+
+        if isinstance(rewards_data, dict):
+            self.rewards_data.update(rewards_data)
+            for token_id in self.vehicle_data:
+                self.apply_token_rewards(token_id)
+                if vehicle_coordinator := self.vehicle_coordinators.get(token_id):
+                    vehicle_coordinator.async_publish_token_rewards()
+
     async def async_update_data(self):
         """Update data from api."""
         _LOGGER.debug("Updating from the DIMO api")
-        tasks = [self.get_dimo_sensor_data()]
-        tasks.extend(
-            self.get_signals_data_for_vehicle(token_id)
-            for token_id in self.vehicle_data
-        )
-        await asyncio.gather(*tasks)
+        self.changed_keys = None
+        previous_dimo_data = dict(self.dimo_data)
+
+        try:
+            async with asyncio.timeout(POLL_CYCLE_TIMEOUT):
+                await self.get_dimo_sensor_data()
+        except TimeoutError as ex:
+            self.cycle_timeouts += 1
+            raise UpdateFailed(
+                f"Updating from the DIMO api took longer than {POLL_CYCLE_TIMEOUT}s"
+            ) from ex
+
+        self._async_save_chunk_plans()
+        self._async_save_tokens()
+
+        self.changed_keys = get_changed_keys(previous_dimo_data, self.dimo_data)
         return True
 
-    async def get_api_data(self, target, *args) -> Optional[Mapping[str, Any]]:
+    async def _async_call(self, target, *args, acquire_slot: bool = True):
+        """
+        Await async client methods directly, run blocking ones in the executor.
+
+        Either way the call waits for a slot in the io limiter first, bounding
+        how many api calls the fan-outs of setup and updates have running,
+        unless the caller already holds one.
+        """
+        async with self.io_limiter.slot() if acquire_slot else nullcontext():
+            if inspect.iscoroutinefunction(target):
+                return await target(*args)
+            return await self.hass.async_add_executor_job(target, *args)
+
+    async def get_api_data(
+        self, target, *args, acquire_slot: bool = True
+    ) -> Optional[Mapping[str, Any]]:
         """Request data from api."""
         try:
-            return await self.hass.async_add_executor_job(target, *args)
+            return await self._async_call(target, *args, acquire_slot=acquire_slot)
         except InvalidClientIdError:
             _LOGGER.error(
                 "Unable to retreive data from the Dimo api due to an invalid client id"
@@ -373,3 +771,181 @@ class DimoUpdateCoordinator(DataUpdateCoordinator):
             name=f"{vehicle.definition['make']} {vehicle.definition['model']}",
             model=vehicle.definition["model"],
         )
+
+
+class DimoVehicleCoordinator(DataUpdateCoordinator):
+    """
+    Update coordinator for the signals of a single vehicle.
+
+    Vehicles refresh, fail and notify their entities independently. Shared
+    state and API access go through the account coordinator. The update
+    interval adapts to whether the vehicle is being driven or is parked,
+    and each poll only requests the signals plausibly due for a new value.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: DIMOConfigEntry,
+        account: DimoUpdateCoordinator,
+        vehicle_token_id: str,
+    ) -> None:
+        """Initialise vehicle update coordinator."""
+        self.min_interval = timedelta(
+            seconds=get_min_poll_interval(entry.options)
+        )
+        self.max_interval = timedelta(
+            seconds=entry.options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL)
+        )
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} ({entry.unique_id}) vehicle {vehicle_token_id}",
+            update_method=self.async_update_data,
+            update_interval=None if account.rolling else self.min_interval,
+            config_entry=entry,
+        )
+
+        self.account = account
+        self.entry = entry
+        self.vehicle_token_id = vehicle_token_id
+
+        # Signal keys changed by the last update, None to notify all entities
+        self.changed_keys: Optional[set[str]] = None
+        self.suppressed_writes = 0
+        self.cycle_timeouts = 0
+        # Signal data entities were last notified of, None after a failed
+        # update so the next one notifies all of them again
+        self._published_signal_data: Optional[dict[str, Any]] = {}
+        self.cadence = SignalCadenceLearner()
+        # Interval chosen by adaptive polling, before any stagger or jitter
+        self.base_interval = self.min_interval
+        self.last_polled: Optional[datetime] = None
+        self.last_active: Optional[datetime] = None
+
+    @property
+    def poll_state(self) -> VehiclePollState:
+        """Return the polling state used to pick rolling shards."""
+        return VehiclePollState(self.last_polled, self.base_interval, self.last_active)
+
+    def delay_next_refresh(self, offset: timedelta):
+        """Push the next scheduled refresh back by offset, to stagger vehicles."""
+        self.update_interval = self.base_interval + offset
+
+    @callback
+    def async_publish_token_rewards(self) -> None:
+        """Notify the reward entities if the rewards changed since they were written."""
+        signal_data = self.vehicle_data[self.vehicle_token_id].signal_data
+        token_rewards = (signal_data or {}).get("tokenRewards")
+        if (
+            token_rewards is None
+            or self._published_signal_data is None
+            or self._published_signal_data.get("tokenRewards") == token_rewards
+        ):
+            return
+        self._published_signal_data["tokenRewards"] = token_rewards
+        self.changed_keys = {"tokenRewards"}
+        self.async_update_listeners()
+
+    @property
+    def vehicle_data(self) -> dict[str, VehicleData]:
+        """Return the vehicle data of the account."""
+        return self.account.vehicle_data
+
+    @property
+    def dimo_data(self) -> dict[str, Any]:
+        """Return the DIMO data of the account."""
+        return self.account.dimo_data
+
+    async def _async_fetch_signals(self, signal_names: list[str]) -> bool:
+        """
+        Fetch the signals, then retry those whose chunk failed once.
+
+        The caller holds an io slot for both fetches.
+        """
+        if not await self.account.get_signals_data_for_vehicle(
+            self.vehicle_token_id, signal_names, acquire_slot=False
+        ):
+            return False
+
+        vehicle = self.vehicle_data[self.vehicle_token_id]
+        if vehicle.failed_signals:
+            _LOGGER.debug(
+                "Retrying failed signals for %s: %s",
+                self.vehicle_token_id,
+                ", ".join(vehicle.failed_signals),
+            )
+            try:
+                await self.account.get_signals_data_for_vehicle(
+                    self.vehicle_token_id,
+                    list(vehicle.failed_signals),
+                    acquire_slot=False,
+                )
+            except Exception as ex:  # noqa: BLE001
+                # The rest of the signals were fetched, keep them
+                _LOGGER.warning(
+                    "Retrying failed signals for %s failed: %s",
+                    self.vehicle_token_id,
+                    ex,
+                )
+        return True
+
+    async def async_update_data(self):
+        """Update the vehicle's signals from the api."""
+        _LOGGER.debug("Updating vehicle %s from the DIMO api", self.vehicle_token_id)
+        self.changed_keys = None
+        now = datetime.now(timezone.utc)
+        self.last_polled = now
+        vehicle = self.vehicle_data[self.vehicle_token_id]
+        signal_names = self.cadence.due_signals(vehicle.available_signals or [], now)
+
+        try:
+            # Start the deadline once a slot is free, so vehicles queued behind
+            # the rest of a large fleet are not timed out by the wait alone
+            async with (
+                self.account.io_limiter.slot(),
+                asyncio.timeout(POLL_CYCLE_TIMEOUT),
+            ):
+                fetched = await self._async_fetch_signals(signal_names)
+        except TimeoutError as ex:
+            self._published_signal_data = None
+            self.cycle_timeouts += 1
+            raise UpdateFailed(
+                f"Updating vehicle {self.vehicle_token_id} took longer than "
+                f"{POLL_CYCLE_TIMEOUT}s"
+            ) from ex
+        except Exception:
+            self._published_signal_data = None
+            raise
+
+        if fetched:
+            self.cadence.observe(
+                vehicle.signal_data,
+                [name for name in signal_names if name not in vehicle.failed_signals],
+                now,
+            )
+        # A fresh signal fetch replaces signal_data, so re-add the rewards
+        self.account.apply_token_rewards(self.vehicle_token_id)
+        self.account._async_save_chunk_plans()
+
+        # Diff against what entities were last notified of, as the account
+        # coordinator may have updated the rewards in between
+        signal_data = dict(self.vehicle_data[self.vehicle_token_id].signal_data or {})
+        self.changed_keys = get_changed_keys(self._published_signal_data, signal_data)
+        if is_vehicle_active(signal_data, self._published_signal_data):
+            self.last_active = now
+        self.base_interval = select_poll_interval(
+            self.base_interval,
+            signal_data,
+            self._published_signal_data,
+            self.min_interval,
+            self.max_interval,
+        )
+        # Jitter keeps staggered vehicles from drifting back into lockstep
+        if self.account.staggered:
+            self.update_interval = jitter_interval(self.base_interval)
+        elif not self.account.rolling:
+            self.update_interval = self.base_interval
+        self._published_signal_data = signal_data
+        return True
@@ -1,21 +1,88 @@
 """Handles sensor entities."""
 
 import logging
-from typing import Any
+from collections.abc import Callable
+from typing import Any, Optional
 
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
-from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from custom_components.dimo.const import SignalDef
 
-from . import DimoUpdateCoordinator
+from . import DIMOConfigEntry, DimoUpdateCoordinator, DimoVehicleCoordinator
 from .const import DIMO_SENSORS, DOMAIN, SIGNALS
 
 _LOGGER = logging.getLogger(__name__)
 
+type VehicleEntitiesBuilder = Callable[
+    [DimoVehicleCoordinator, str, dict[str, Any]], list[Entity]
+]
+
+
+@callback
+def async_get_vehicle_entities(
+    entry: DIMOConfigEntry,
+    add_entities: AddEntitiesCallback,
+    build_entities: VehicleEntitiesBuilder,
+) -> list[Entity]:
+    """
+    Return the entities of the vehicles that have signal data.
+
+    Vehicles without any yet, because their first refresh failed or rolling
+    polls have not reached them, get their entities added once they do.
+    """
+    coordinator = entry.runtime_data.coordinator
+    entities: list[Entity] = []
+    for vehicle_token_id, vehicle_data in coordinator.vehicle_data.items():
+        vehicle_coordinator = coordinator.vehicle_coordinators[vehicle_token_id]
+        if vehicle_data.signal_data:
+            entities.extend(
+                build_entities(
+                    vehicle_coordinator, vehicle_token_id, vehicle_data.signal_data
+                )
+            )
+        else:
+            _async_add_entities_when_ready(
+                entry, add_entities, build_entities, vehicle_coordinator
+            )
+    return entities
+
+
+@callback
+def _async_add_entities_when_ready(
+    entry: DIMOConfigEntry,
+    add_entities: AddEntitiesCallback,
+    build_entities: VehicleEntitiesBuilder,
+    vehicle_coordinator: DimoVehicleCoordinator,
+) -> None:
+    """Add a vehicle's entities after the first refresh that gets signal data."""
+    vehicle_token_id = vehicle_coordinator.vehicle_token_id
+    remove_listener: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def _async_remove_listener() -> None:
+        nonlocal remove_listener
+        if remove_listener:
+            remove_listener()
+            remove_listener = None
+
+    @callback
+    def _async_add_entities() -> None:
+        signal_data = vehicle_coordinator.vehicle_data[vehicle_token_id].signal_data
+        if not signal_data or remove_listener is None:
+            return
+        add_entities(build_entities(vehicle_coordinator, vehicle_token_id, signal_data))
+        _async_remove_listener()
+
+    # Listening also keeps the vehicle polled while it has no entities
+    remove_listener = vehicle_coordinator.async_add_listener(_async_add_entities)
+    entry.async_on_unload(_async_remove_listener)
+
 
 class DimoBaseEntity(CoordinatorEntity):
     """Base entity."""
@@ -23,7 +90,10 @@ class DimoBaseEntity(CoordinatorEntity):
     _attr_has_entity_name = True
 
     def __init__(
-        self, coordinator: DimoUpdateCoordinator, vehicle_token_id: str, key: str
+        self,
+        coordinator: DimoUpdateCoordinator | DimoVehicleCoordinator,
+        vehicle_token_id: str,
+        key: str,
     ) -> None:
         """Initialise."""
         super().__init__(coordinator)
@@ -37,6 +107,7 @@ class DimoBaseEntity(CoordinatorEntity):
             self._attr_name = sensor_def.name
             self._attr_device_class = sensor_def.device_class
             self._attr_state_class = sensor_def.state_class
+            self._attr_entity_category = sensor_def.entity_category
         else:
             # Fallbacks if the key isn't found in DIMO_SENSORS
             self._attr_name = key
@@ -50,10 +121,30 @@ class DimoBaseEntity(CoordinatorEntity):
 
         # Use the built-in feature to automatically adopt the device's name
         self._attr_has_entity_name = True
+        # Coordinator success at the last state write, a flip must be written
+        self._written_update_success = True
+
+    @property
+    def _data_keys(self) -> set[str]:
+        """Return the data keys this entity's state is built from."""
+        return {self.key}
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        changed_keys = getattr(self.coordinator, "changed_keys", None)
+        update_success = getattr(self.coordinator, "last_update_success", True)
+        if (
+            changed_keys is not None
+            and changed_keys.isdisjoint(self._data_keys)
+            and update_success == self._written_update_success
+        ):
+            # Nothing this entity shows has changed, skip the state write
+            self.coordinator.suppressed_writes += 1
+            return
+
+        self._written_update_success = update_success
+
         _LOGGER.debug("%s device update requested", self.name)
         try:
             self.async_write_ha_state()
@@ -0,0 +1,80 @@
+"""Circuit breaker for vehicles whose api calls keep failing."""
+
+from datetime import datetime, timedelta
+from enum import StrEnum
+from typing import Any, Optional
+
+# Consecutive failures after which the breaker opens
+BREAKER_FAILURE_THRESHOLD = 3
+# How long the breaker first stays open, doubling with every failed probe
+BREAKER_BASE_BACKOFF = timedelta(minutes=1)
+BREAKER_MAX_BACKOFF = timedelta(hours=1)
+
+
+class BreakerState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling the api for a vehicle after repeated failures.
+
+    Once open, requests are skipped until the backoff has passed. The next
+    request is then let through as a probe: if it succeeds the breaker
+    closes, otherwise it opens again for twice as long.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_backoff: timedelta = BREAKER_BASE_BACKOFF,
+        max_backoff: timedelta = BREAKER_MAX_BACKOFF,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.open_until: Optional[datetime] = None
+
+    def allow_request(self, now: datetime) -> bool:
+        """Return True if a request may be made, moving to half open if due."""
+        if self.state == BreakerState.CLOSED:
+            return True
+        if self.state == BreakerState.OPEN and now >= self.open_until:
+            self.state = BreakerState.HALF_OPEN
+            return True
+        # Open, or a probe is already in flight
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.open_until = None
+
+    def record_failure(self, now: datetime) -> None:
+        """Count a failed request, opening the breaker if it keeps failing."""
+        self.failures += 1
+        if (
+            self.state == BreakerState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            backoff = min(
+                self.base_backoff * 2 ** (self.failures - self.failure_threshold),
+                self.max_backoff,
+            )
+            self.state = BreakerState.OPEN
+            self.open_until = now + backoff
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "open_until": self.open_until.isoformat() if self.open_until else None,
+        }
@@ -0,0 +1,114 @@
+"""Learn how often each vehicle signal really updates."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from .polling import IGNITION_KEY, LATITUDE_KEY, LONGITUDE_KEY, SPEED_KEY
+
+# Signal queried for the location, which responses report as the
+# latitude and longitude signals
+LOCATION_SIGNAL = "currentLocationCoordinates"
+
+# Signals adaptive polling depends on are requested every poll
+ALWAYS_POLLED_SIGNALS = frozenset(
+    {IGNITION_KEY, SPEED_KEY, LOCATION_SIGNAL, LATITUDE_KEY, LONGITUDE_KEY}
+)
+
+# Weight of the newest interval in the smoothed cadence estimate
+CADENCE_SMOOTHING = 0.3
+# A signal is due once this fraction of its cadence has passed since its
+# last update, so an update is rarely missed by a full poll interval
+CADENCE_DUE_FRACTION = 0.8
+# When a due signal had no new value, wait this fraction of its cadence
+# before asking again
+CADENCE_RECHECK_FRACTION = 0.5
+# Every signal is requested at least this often, in case its cadence changed
+MAX_SIGNAL_STALENESS = timedelta(minutes=30)
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class SignalCadence:
+    """Observed update behaviour of a single signal."""
+
+    last_timestamp: Optional[datetime] = None
+    interval: Optional[timedelta] = None
+    last_polled: Optional[datetime] = None
+
+
+class SignalCadenceLearner:
+    """
+    Tracks the update cadence of a vehicle's signals.
+
+    The cadence is a smoothed average of the time between successive
+    distinct timestamps reported for a signal. Signals are only requested
+    again once they are plausibly due for a new value.
+    """
+
+    def __init__(self) -> None:
+        self.signals: dict[str, SignalCadence] = {}
+
+    def observe(
+        self,
+        signal_data: Optional[dict[str, Any]],
+        polled_signals: list[str],
+        now: datetime,
+    ) -> None:
+        """Record the signals that were requested and the timestamps returned."""
+        for name in polled_signals:
+            self.signals.setdefault(name, SignalCadence()).last_polled = now
+
+        for name in polled_signals:
+            signal = (signal_data or {}).get(name)
+            timestamp = _parse_timestamp(
+                signal.get("timestamp") if isinstance(signal, dict) else None
+            )
+            if timestamp is None:
+                continue
+
+            cadence = self.signals[name]
+            if cadence.last_timestamp is not None and timestamp > cadence.last_timestamp:
+                delta = timestamp - cadence.last_timestamp
+                cadence.interval = (
+                    delta
+                    if cadence.interval is None
+                    else CADENCE_SMOOTHING * delta
+                    + (1 - CADENCE_SMOOTHING) * cadence.interval
+                )
+            if cadence.last_timestamp is None or timestamp > cadence.last_timestamp:
+                cadence.last_timestamp = timestamp
+
+    def is_due(self, name: str, now: datetime) -> bool:
+        """Return True if the signal should be included in the next query."""
+        cadence = self.signals.get(name)
+        if (
+            name in ALWAYS_POLLED_SIGNALS
+            or cadence is None
+            or cadence.interval is None
+            or cadence.last_polled is None
+            or cadence.last_timestamp is None
+        ):
+            return True
+
+        if now - cadence.last_polled >= MAX_SIGNAL_STALENESS:
+            return True
+
+        return (
+            now >= cadence.last_timestamp + cadence.interval * CADENCE_DUE_FRACTION
+            and now - cadence.last_polled
+            >= cadence.interval * CADENCE_RECHECK_FRACTION
+        )
+
+    def due_signals(self, signal_names: list[str], now: datetime) -> list[str]:
+        """Return the signals plausibly due for a new value, in their original order."""
+        return [name for name in signal_names if self.is_due(name, now)]
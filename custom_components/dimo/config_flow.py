@@ -13,11 +13,23 @@ from homeassistant.const import CONF_CLIENT_ID
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import (CONF_AUTH_PROVIDER, CONF_POLL_INTERVAL, CONF_PRIVATE_KEY,
-                    DEFAULT_POLL_INTERVAL, DOMAIN)
+from .const import (CONF_AUTH_PROVIDER, CONF_HEDGE_BUDGET,
+                    CONF_HEDGE_REQUESTS, CONF_MAX_CONCURRENT_REQUESTS,
+                    CONF_MAX_POLL_INTERVAL, CONF_MAX_VEHICLE_STALENESS,
+                    CONF_MIN_POLL_INTERVAL, CONF_POLL_INTERVAL,
+                    CONF_POLL_SCHEDULING, CONF_PRIVATE_KEY,
+                    CONF_RATE_LIMIT, CONF_RATE_LIMIT_BURST,
+                    CONF_REWARDS_INTERVAL, CONF_VEHICLES_PER_TICK,
+                    DEFAULT_HEDGE_BUDGET, DEFAULT_HEDGE_REQUESTS,
+                    DEFAULT_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_POLL_INTERVAL,
+                    DEFAULT_MAX_VEHICLE_STALENESS, DEFAULT_POLL_INTERVAL,
+                    DEFAULT_POLL_SCHEDULING, DEFAULT_RATE_LIMIT,
+                    DEFAULT_RATE_LIMIT_BURST, DEFAULT_REWARDS_INTERVAL,
+                    DEFAULT_VEHICLES_PER_TICK, DOMAIN, POLL_SCHEDULING_BURST,
+                    POLL_SCHEDULING_ROLLING, POLL_SCHEDULING_STAGGERED)
 from .dimoapi import (Auth, DimoClient, InvalidApiKeyFormat,
                       InvalidClientIdError, InvalidCredentialsError)
-from .helpers import get_key
+from .helpers import get_key, get_min_poll_interval
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -108,8 +120,14 @@ class DimoOptionsFlow(OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if get_min_poll_interval(user_input) > user_input.get(
+                CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+            ):
+                errors["base"] = "min_poll_interval_above_max"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
             step_id="init",
@@ -121,8 +139,80 @@ class DimoOptionsFlow(OptionsFlow):
                             CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Optional(
+                        CONF_MIN_POLL_INTERVAL,
+                        default=get_min_poll_interval(self.entry.options),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Optional(
+                        CONF_MAX_POLL_INTERVAL,
+                        default=self.entry.options.get(
+                            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=86400)),
+                    vol.Optional(
+                        CONF_POLL_SCHEDULING,
+                        default=self.entry.options.get(
+                            CONF_POLL_SCHEDULING, DEFAULT_POLL_SCHEDULING
+                        ),
+                    ): vol.In(
+                        [
+                            POLL_SCHEDULING_STAGGERED,
+                            POLL_SCHEDULING_BURST,
+                            POLL_SCHEDULING_ROLLING,
+                        ]
+                    ),
+                    vol.Optional(
+                        CONF_VEHICLES_PER_TICK,
+                        default=self.entry.options.get(
+                            CONF_VEHICLES_PER_TICK, DEFAULT_VEHICLES_PER_TICK
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+                    vol.Optional(
+                        CONF_MAX_VEHICLE_STALENESS,
+                        default=self.entry.options.get(
+                            CONF_MAX_VEHICLE_STALENESS, DEFAULT_MAX_VEHICLE_STALENESS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=86400)),
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=self.entry.options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+                    vol.Optional(
+                        CONF_HEDGE_REQUESTS,
+                        default=self.entry.options.get(
+                            CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_HEDGE_BUDGET,
+                        default=self.entry.options.get(
+                            CONF_HEDGE_BUDGET, DEFAULT_HEDGE_BUDGET
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                    vol.Optional(
+                        CONF_REWARDS_INTERVAL,
+                        default=self.entry.options.get(
+                            CONF_REWARDS_INTERVAL, DEFAULT_REWARDS_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=300, max=604800)),
+                    vol.Optional(
+                        CONF_RATE_LIMIT,
+                        default=self.entry.options.get(
+                            CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=100)),
+                    vol.Optional(
+                        CONF_RATE_LIMIT_BURST,
+                        default=self.entry.options.get(
+                            CONF_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_BURST
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=200)),
                 }
             ),
+            errors=errors,
         )
 
 
@@ -2,6 +2,7 @@
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import timedelta
 
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
@@ -9,6 +10,7 @@ from homeassistant.const import (
     DEGREE,
     PERCENTAGE,
     REVOLUTIONS_PER_MINUTE,
+    EntityCategory,
     Platform,
     UnitOfElectricPotential,
     UnitOfEnergy,
@@ -29,6 +31,45 @@ CONF_AUTH_PROVIDER = "auth_provider"
 CONF_LICENSE_ID = "license_id"
 CONF_POLL_INTERVAL = "poll_interval"
 DEFAULT_POLL_INTERVAL = 30
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+DEFAULT_MIN_POLL_INTERVAL = 30
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+DEFAULT_MAX_POLL_INTERVAL = 900
+CONF_POLL_SCHEDULING = "poll_scheduling"
+POLL_SCHEDULING_STAGGERED = "staggered"
+POLL_SCHEDULING_BURST = "burst"
+POLL_SCHEDULING_ROLLING = "rolling"
+DEFAULT_POLL_SCHEDULING = POLL_SCHEDULING_STAGGERED
+CONF_VEHICLES_PER_TICK = "vehicles_per_tick"
+DEFAULT_VEHICLES_PER_TICK = 20
+CONF_MAX_VEHICLE_STALENESS = "max_vehicle_staleness"
+DEFAULT_MAX_VEHICLE_STALENESS = 1800
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+CONF_HEDGE_REQUESTS = "hedge_requests"
+DEFAULT_HEDGE_REQUESTS = False
+CONF_HEDGE_BUDGET = "hedge_budget"
+DEFAULT_HEDGE_BUDGET = 5
+CONF_REWARDS_INTERVAL = "rewards_interval"
+DEFAULT_REWARDS_INTERVAL = 3600
+# Requests per second, and back to back requests, allowed towards the DIMO apis
+CONF_RATE_LIMIT = "rate_limit"
+DEFAULT_RATE_LIMIT = 10.0
+CONF_RATE_LIMIT_BURST = "rate_limit_burst"
+DEFAULT_RATE_LIMIT_BURST = 20
+
+# How often privileged tokens are checked for refresh-ahead renewal
+TOKEN_RENEWAL_CHECK_INTERVAL = 30
+
+# Seconds an update of the account or of a vehicle may take before it is cancelled
+POLL_CYCLE_TIMEOUT = 120
+
+# Seconds an idle connection outlives the shortest poll interval, so the
+# next poll can reuse it instead of handshaking a new one
+CONNECTION_KEEPALIVE_MARGIN = 10
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -54,15 +95,48 @@ class DimoSensorDef(SignalDef):
     """Class to hold sensor definition for non vehicle sensors."""
 
     value_fn: str | Callable | None = None
+    # Reuse the value for this long instead of fetching it every poll
+    refresh_interval: timedelta | None = None
+    # Read from client state without an api call, so no io slot is taken
+    local: bool = False
+    entity_category: EntityCategory | None = None
 
 
 DIMO_SENSORS: dict[str, DimoSensorDef] = {
     "total_vehicles": DimoSensorDef(
         "Total Dimo Vehicles",
         Platform.SENSOR,
-        value_fn="get_total_dimo_vehicles",
+        value_fn="async_get_total_dimo_vehicles",
+        state_class=SensorStateClass.MEASUREMENT,
+        refresh_interval=timedelta(hours=1),
+    ),
+    "api_rate_limit": DimoSensorDef(
+        "API Rate Limit",
+        Platform.SENSOR,
+        value_fn="get_rate_limit",
+        unit_of_measure="req/s",
         state_class=SensorStateClass.MEASUREMENT,
-    )
+        local=True,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "api_throttled": DimoSensorDef(
+        "API Throttled",
+        Platform.BINARY_SENSOR,
+        BinarySensorDeviceClass.PROBLEM,
+        value_fn="is_rate_limited",
+        local=True,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "api_retry_in": DimoSensorDef(
+        "API Retry In",
+        Platform.SENSOR,
+        SensorDeviceClass.DURATION,
+        UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn="get_rate_limit_retry_in",
+        local=True,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
 }
 
 SIGNALS: dict[str, SignalDef] = {
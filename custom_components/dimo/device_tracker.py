@@ -1,18 +1,20 @@
 """Handles device tracker entities."""
 
 import logging
+from typing import Any
 
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import DIMOConfigEntry, DimoUpdateCoordinator
-from .base_entity import DimoBaseVehicleEntity
+from . import DIMOConfigEntry, DimoVehicleCoordinator
+from .base_entity import DimoBaseVehicleEntity, async_get_vehicle_entities
 
 _LOGGER = logging.getLogger(__name__)
 
 LONG_KEY = "currentLocationLongitude"
 LAT_KEY = "currentLocationLatitude"
+ALTITUDE_KEY = "currentLocationAltitude"
 
 
 async def async_setup_entry(
@@ -22,27 +24,15 @@ async def async_setup_entry(
 ):
     """Initialise sensor platform."""
 
-    coordinator = entry.runtime_data.coordinator
+    add_entities(async_get_vehicle_entities(entry, add_entities, _vehicle_entities))
 
-    entities = []
-
-    for vehicle_token_id, vehicle_data in coordinator.vehicle_data.items():
-        latitude = vehicle_data.signal_data.get(LAT_KEY, {}).get("value")
-        longitude = vehicle_data.signal_data.get(LONG_KEY, {}).get("value")
-
-        if latitude is not None and longitude is not None:
-            entities.append(
-                DimoTrackerEntity(coordinator, vehicle_token_id, LAT_KEY, LONG_KEY)
-            )
-
-    add_entities(entities)
 
 class DimoTrackerEntity(DimoBaseVehicleEntity, TrackerEntity):
     """Sensor entity."""
 
     def __init__(
         self,
-        coordinator: DimoUpdateCoordinator,
+        coordinator: DimoVehicleCoordinator,
         vehicle_token_id: str,
         latitude_key: str,
         longitude_key: str,
@@ -52,6 +42,11 @@ class DimoTrackerEntity(DimoBaseVehicleEntity, TrackerEntity):
         self._latitude_key = latitude_key
         self._longitude_key = longitude_key
 
+    @property
+    def _data_keys(self) -> set[str]:
+        """Return the data keys this entity's state is built from."""
+        return {self._latitude_key, self._longitude_key, ALTITUDE_KEY}
+
     @property
     def source_type(self) -> str:
         """Return source type of the device"""
@@ -61,7 +56,7 @@ class DimoTrackerEntity(DimoBaseVehicleEntity, TrackerEntity):
     def extra_state_attributes(self):
         """Return additional tracker attributes"""
         data = self.coordinator.vehicle_data[self.vehicle_token_id].signal_data
-        return {"altitude": data.get("currentLocationAltitude", {}).get("value")}
+        return {"altitude": data.get(ALTITUDE_KEY, {}).get("value")}
 
     @property
     def latitude(self) -> float | None:
@@ -74,3 +69,16 @@ class DimoTrackerEntity(DimoBaseVehicleEntity, TrackerEntity):
         """Return longitude value of the device."""
         data = self.coordinator.vehicle_data[self.vehicle_token_id].signal_data
         return data.get(self._longitude_key, {}).get("value")
+
+
+def _vehicle_entities(
+    vehicle_coordinator: DimoVehicleCoordinator,
+    vehicle_token_id: str,
+    signal_data: dict[str, Any],
+) -> list[DimoTrackerEntity]:
+    """Return the tracker entity of a vehicle, if it reports its location."""
+    latitude = signal_data.get(LAT_KEY, {}).get("value")
+    longitude = signal_data.get(LONG_KEY, {}).get("value")
+    if latitude is None or longitude is None:
+        return []
+    return [DimoTrackerEntity(vehicle_coordinator, vehicle_token_id, LAT_KEY, LONG_KEY)]
@@ -33,4 +33,36 @@ def _async_get_diagnostics(
         {token_id: vehicle_data.__dict__}
         for token_id, vehicle_data in coordinator.vehicle_data.items()
     ]
+    diag["suppressed_writes"] = {
+        "dimo": coordinator.suppressed_writes,
+        "vehicles": {
+            token_id: vehicle_coordinator.suppressed_writes
+            for token_id, vehicle_coordinator in coordinator.vehicle_coordinators.items()
+        },
+    }
+    diag["breakers"] = {
+        token_id: breaker.as_dict()
+        for token_id, breaker in coordinator.breakers.items()
+    }
+    diag["quarantined_signals"] = {
+        token_id: quarantined
+        for token_id in coordinator.vehicle_data
+        if (quarantined := coordinator.client.quarantined_signals(token_id))
+    }
+    diag["vehicle_wide_errors"] = coordinator.client.vehicle_wide_errors.keys()
+    diag["timeouts"] = {
+        "requests": coordinator.client.auth.request_timeouts,
+        "cycles": {
+            "dimo": coordinator.cycle_timeouts,
+            "vehicles": {
+                token_id: vehicle_coordinator.cycle_timeouts
+                for token_id, vehicle_coordinator in coordinator.vehicle_coordinators.items()
+            },
+        },
+    }
+    if coordinator.client.hedger:
+        diag["hedging"] = coordinator.client.hedger.stats()
+    diag["io_limiter"] = coordinator.io_limiter.stats()
+    diag["rate_limiter"] = coordinator.client.auth.rate_limiter.state()
+    diag["connection_pools"] = coordinator.client.auth.connection_pool_stats()
     return diag
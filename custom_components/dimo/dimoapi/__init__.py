@@ -1,5 +1,7 @@
+from .async_dimo import ConnectionStats, create_client_session
 from .auth import (Auth, InvalidApiKeyFormat, InvalidClientIdError,
-                   InvalidCredentialsError)
-from .dimo_client import DimoClient
+                   InvalidCredentialsError, connection_pool_size)
+from .dimo_client import DEFAULT_CHUNK_CONCURRENCY, DimoClient
+from .rate_limiter import RateLimiter
 
 __all__ = ["Auth", "DimoClient"]
@@ -0,0 +1,438 @@
+import asyncio
+import json
+from typing import Any, Optional
+from urllib.parse import urlencode, urljoin
+
+import aiohttp
+from dimo.constants import dimo_constants
+from dimo.environments import dimo_environment
+from dimo.errors import HTTPError
+from dimo.eth_signer import EthSigner
+from dimo.permission_decoder import PermissionDecoder
+
+from .rate_limiter import MAX_RETRY_AFTER, RateLimiter, parse_retry_after
+
+# Times a request rejected with 429 is retried once the limiter allows it
+RATE_LIMIT_RETRIES = 2
+
+# Times a request failing with a server or connection error is retried,
+# waiting SERVER_ERROR_BACKOFF seconds and doubling that for every retry
+SERVER_ERROR_RETRIES = 3
+SERVER_ERROR_BACKOFF = 0.3
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+# Server errors that may say when to retry, as urllib3 honours them
+RETRY_AFTER_STATUSES = (413, 503)
+
+# Seconds a single request may take before it is abandoned
+DEFAULT_REQUEST_TIMEOUT = 30
+
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+CHECK_PRIVILEGES_QUERY = """
+query CheckPrivileges($tokenId: Int!) {
+  vehicle(tokenId: $tokenId) {
+    sacds(first: 100) {
+      nodes {
+        permissions
+        grantee
+      }
+    }
+  }
+}
+"""
+
+AVAILABLE_SIGNALS_QUERY = """
+query getAvailableSignals($tokenId: Int!) {
+  availableSignals(tokenId: $tokenId)
+}
+"""
+
+COUNT_VEHICLES_QUERY = """
+{
+  vehicles(first: 10) {
+    totalCount
+  }
+}
+"""
+
+LATEST_VIN_QUERY = """
+query GetLatestVinVC($tokenId: Int!) {
+  vinVCLatest(tokenId: $tokenId) {
+    vin
+  }
+}
+"""
+
+VIN_VC_GENERATED_MESSAGE = (
+    "VC generated successfully. Retrieve using the provided GQL URL and query parameter."
+)
+
+
+class ConnectionStats:
+    """
+    Connections opened and requests made per host, through request tracing.
+
+    Every connection opened to a DIMO api costs a TLS handshake, so the
+    fewer connections per request, the better they are being reused.
+    """
+
+    def __init__(self) -> None:
+        self.hosts: dict[str, dict[str, int]] = {}
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_connection_create_end.append(
+            self._on_connection_create_end
+        )
+
+    def _host_stats(self, host: str) -> dict[str, int]:
+        return self.hosts.setdefault(host, {"connections_opened": 0, "requests": 0})
+
+    async def _on_request_start(self, session, context, params) -> None:
+        context.host = params.url.host
+        self._host_stats(context.host)["requests"] += 1
+
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        self._host_stats(context.host)["connections_opened"] += 1
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        """Return the statistics of every host requested so far."""
+        return {host: dict(host_stats) for host, host_stats in self.hosts.items()}
+
+
+def create_client_session(
+    pool_size: int,
+    keepalive_timeout: float,
+    ssl: Any = True,
+    connection_stats: Optional[ConnectionStats] = None,
+) -> aiohttp.ClientSession:
+    """
+    Create a session keeping up to pool_size connections open per host.
+
+    Idle connections are kept for keepalive_timeout seconds so the next
+    poll can reuse them. When given, connection_stats traces the session.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=pool_size,
+            keepalive_timeout=keepalive_timeout,
+            ssl=ssl,
+        ),
+        trace_configs=[connection_stats.trace_config] if connection_stats else None,
+    )
+
+
+class AsyncDIMO:
+    """
+    Asyncio counterpart of the DIMO SDK client.
+
+    Only the endpoints used by the integration are implemented. Requests are
+    made on a shared aiohttp session so they run on the event loop instead of
+    occupying an executor thread each. Errors are raised as the SDK's
+    HTTPError so callers can handle both transports the same way.
+
+    Every request draws from the rate limiter, which backs off when the
+    api answers 429, and is abandoned once request_timeout has passed.
+    Server and connection errors are retried with an exponential backoff,
+    like the SDK's requests session does.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        env: str = "Production",
+        rate_limiter: Optional[RateLimiter] = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        connection_stats: Optional[ConnectionStats] = None,
+    ):
+        if env not in dimo_environment:
+            raise ValueError(f"Unknown environment: {env}")
+
+        self.env = env
+        self.urls = dimo_environment[env]
+        self.session = session
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self.timeouts = 0
+        self.connection_stats = connection_stats
+        self.client_id: Optional[str] = None
+
+        self.auth = AsyncAuth(self)
+        self.attestation = AsyncAttestation(self)
+        self.identity = AsyncIdentity(self)
+        self.telemetry = AsyncTelemetry(self)
+        self.token_exchange = AsyncTokenExchange(self)
+
+    @staticmethod
+    def _get_auth_headers(token: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+
+    async def request(
+        self,
+        http_method: str,
+        service: str,
+        path: str,
+        headers: Optional[dict[str, str]] = None,
+        data: Any = None,
+    ) -> Any:
+        """Perform a REST request against a DIMO service."""
+        url = urljoin(self.urls[service], path)
+        headers = headers or {}
+
+        if isinstance(data, dict) and headers.get("Content-Type") == "application/json":
+            data = json.dumps(data)
+
+        rate_limited = server_errors = 0
+        while True:
+            await self.rate_limiter.async_acquire()
+            try:
+                async with self.session.request(
+                    http_method, url, headers=headers, data=data, timeout=self.timeout
+                ) as response:
+                    if response.status == 429:
+                        self.rate_limiter.throttle(
+                            parse_retry_after(response.headers.get("Retry-After"))
+                        )
+                        if rate_limited < RATE_LIMIT_RETRIES:
+                            rate_limited += 1
+                            continue
+                    if (
+                        response.status in SERVER_ERROR_STATUSES
+                        and server_errors < SERVER_ERROR_RETRIES
+                    ):
+                        retry_after = (
+                            parse_retry_after(response.headers.get("Retry-After"))
+                            if response.status in RETRY_AFTER_STATUSES
+                            else None
+                        )
+                    elif response.status >= 400:
+                        raise HTTPError(
+                            status=response.status,
+                            message=f"Request failed for url: {url}",
+                            body=await self._read_body(response),
+                        )
+                    else:
+                        self.rate_limiter.record_success()
+                        return await self._read_body(response)
+            except TimeoutError as ex:
+                self.timeouts += 1
+                raise HTTPError(
+                    status=-1, message=f"Request timed out for url: {url}"
+                ) from ex
+            except aiohttp.ClientConnectionError as ex:
+                if server_errors >= SERVER_ERROR_RETRIES:
+                    raise HTTPError(status=-1, message=str(ex)) from ex
+                retry_after = None
+            except aiohttp.ClientError as ex:
+                raise HTTPError(status=-1, message=str(ex)) from ex
+
+            await asyncio.sleep(self._server_error_delay(server_errors, retry_after))
+            server_errors += 1
+
+    @staticmethod
+    def _server_error_delay(retries: int, retry_after: Optional[float]) -> float:
+        """Return how long to wait before retrying after a server error."""
+        if retry_after is not None:
+            return min(retry_after, MAX_RETRY_AFTER)
+        return SERVER_ERROR_BACKOFF * 2**retries
+
+    @staticmethod
+    async def _read_body(response: aiohttp.ClientResponse) -> Any:
+        """Return the decoded json body, or the raw bytes for other content types."""
+        raw = await response.read()
+        if "json" in response.headers.get("Content-Type", ""):
+            try:
+                return json.loads(raw)
+            except ValueError:
+                return raw
+        return raw
+
+    async def query(
+        self,
+        service: str,
+        query: str,
+        variables: Optional[dict] = None,
+        token: Optional[str] = None,
+    ) -> Any:
+        """Run a GraphQL query against the identity or telemetry api."""
+        headers = self._get_auth_headers(token) if token else {}
+        headers["Content-Type"] = "application/json"
+        headers["User-Agent"] = "dimo-python-sdk"
+
+        data = {"query": query, "variables": variables or {}}
+        return await self.request("POST", service, "", headers=headers, data=data)
+
+
+def _decode_json(response: Any) -> Any:
+    """Decode a response that the auth service returned as bytes."""
+    if isinstance(response, bytes):
+        return json.loads(response.decode("utf-8"))
+    return response
+
+
+class AsyncAuth:
+    """Developer JWT handshake."""
+
+    def __init__(self, dimo: AsyncDIMO):
+        self._dimo = dimo
+
+    async def get_dev_jwt(
+        self,
+        client_id: str,
+        domain: str,
+        private_key: str,
+        scope: str = "openid email",
+        response_type: str = "code",
+    ) -> dict:
+        """Generate, sign and submit a web3 challenge to obtain a developer JWT."""
+        self._dimo.client_id = client_id
+
+        challenge = _decode_json(
+            await self._dimo.request(
+                "POST",
+                "Auth",
+                "/auth/web3/generate_challenge",
+                headers=dict(FORM_HEADERS),
+                data=urlencode(
+                    {
+                        "client_id": client_id,
+                        "domain": domain,
+                        "scope": scope,
+                        "response_type": response_type,
+                        "address": client_id,
+                    }
+                ),
+            )
+        )
+
+        signature = EthSigner.sign_message(challenge["challenge"], private_key)
+
+        return _decode_json(
+            await self._dimo.request(
+                "POST",
+                "Auth",
+                "/auth/web3/submit_challenge",
+                headers=dict(FORM_HEADERS),
+                data=urlencode(
+                    {
+                        "client_id": client_id,
+                        "domain": domain,
+                        "state": challenge["state"],
+                        "signature": signature,
+                        "grant_type": "authorization_code",
+                    }
+                ),
+            )
+        )
+
+
+class AsyncAttestation:
+    """Attestation api."""
+
+    def __init__(self, dimo: AsyncDIMO):
+        self._dimo = dimo
+
+    async def create_vin_vc(self, vehicle_jwt: str, token_id: int) -> dict:
+        """Generate or retrieve the VIN verifiable credential for a vehicle."""
+        return await self._dimo.request(
+            "POST",
+            "Attestation",
+            f"/v2/attestation/vin/{token_id}",
+            headers=self._dimo._get_auth_headers(vehicle_jwt),
+        )
+
+
+class AsyncIdentity:
+    """Identity GraphQL api."""
+
+    def __init__(self, dimo: AsyncDIMO):
+        self._dimo = dimo
+
+    async def query(self, query: str, variables: Optional[dict] = None) -> dict:
+        return await self._dimo.query("Identity", query, variables=variables)
+
+    async def count_dimo_vehicles(self) -> dict:
+        return await self.query(COUNT_VEHICLES_QUERY)
+
+    async def check_vehicle_privileges(self, token_id: int) -> dict:
+        return await self.query(CHECK_PRIVILEGES_QUERY, {"tokenId": token_id})
+
+
+class AsyncTelemetry:
+    """Telemetry GraphQL api."""
+
+    def __init__(self, dimo: AsyncDIMO):
+        self._dimo = dimo
+
+    async def query(
+        self, query: str, vehicle_jwt: str, variables: Optional[dict] = None
+    ) -> dict:
+        return await self._dimo.query(
+            "Telemetry", query, variables=variables, token=vehicle_jwt
+        )
+
+    async def available_signals(self, vehicle_jwt: str, token_id: int) -> dict:
+        return await self.query(
+            AVAILABLE_SIGNALS_QUERY, vehicle_jwt, {"tokenId": token_id}
+        )
+
+    async def get_vin(self, vehicle_jwt: str, token_id: int) -> dict:
+        """Create the VIN credential if needed and return the latest VIN."""
+        attestation = await self._dimo.attestation.create_vin_vc(vehicle_jwt, token_id)
+        if _decode_json(attestation).get("message") != VIN_VC_GENERATED_MESSAGE:
+            raise ValueError(f"Unable to generate VIN credential: {attestation}")
+        return await self.query(LATEST_VIN_QUERY, vehicle_jwt, {"tokenId": token_id})
+
+
+class AsyncTokenExchange:
+    """Token exchange api."""
+
+    def __init__(self, dimo: AsyncDIMO):
+        self._dimo = dimo
+
+    async def _get_privileges(self, token_id: int, client_id: str) -> list[int]:
+        """Decode the privileges shared with our developer license."""
+        response = await self._dimo.identity.check_vehicle_privileges(token_id)
+        nodes = (
+            (response or {}).get("data", {}).get("vehicle", {}).get("sacds", {}).get("nodes")
+        )
+        if not nodes or not isinstance(nodes, list):
+            raise ValueError("Invalid response from server")
+
+        for node in nodes:
+            if (node.get("grantee") or "").lower() == client_id.lower():
+                return PermissionDecoder.decode_permission_bits(node["permissions"])
+
+        raise ValueError(
+            f"No permissions found for developer license: {client_id}. "
+            "Has this vehicle been shared?"
+        )
+
+    async def exchange(
+        self,
+        developer_jwt: str,
+        token_id: int,
+        client_id: Optional[str] = None,
+        privileges: Optional[list[int]] = None,
+    ) -> dict:
+        """Exchange a developer JWT for a vehicle JWT."""
+        client_id = client_id or self._dimo.client_id
+        if not client_id:
+            raise ValueError(
+                "No client_id found. Obtain a Developer JWT before calling token exchange."
+            )
+
+        if privileges is None:
+            privileges = await self._get_privileges(token_id, client_id)
+
+        return await self._dimo.request(
+            "POST",
+            "TokenExchange",
+            "/v1/tokens/exchange",
+            headers=self._dimo._get_auth_headers(developer_jwt),
+            data={
+                "nftContractAddress": dimo_constants[self._dimo.env]["NFT_address"],
+                "privileges": privileges,
+                "tokenId": token_id,
+            },
+        )
@@ -1,15 +1,53 @@
+import asyncio
+import hashlib
 import logging
+import threading
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional
 
+import aiohttp
 import dimo as dimo_sdk
 import jwt
 import requests
 from requests.adapters import HTTPAdapter, Retry
 
+from .async_dimo import (DEFAULT_REQUEST_TIMEOUT, RATE_LIMIT_RETRIES, AsyncDIMO,
+                         ConnectionStats)
+from .cache import TTLCache
+from .rate_limiter import RateLimiter, parse_retry_after
+
 _LOGGER = logging.getLogger(__name__)
 
+# How close to expiry a token may get before it is refreshed on demand
+DEFAULT_TOKEN_LEEWAY = timedelta(seconds=60)
+
+# Privileged tokens are renewed in the background this long before they
+# expire, plus a per vehicle offset within the spread so the renewals of
+# tokens issued together do not all happen at the same time
+TOKEN_REFRESH_AHEAD = timedelta(minutes=2)
+TOKEN_REFRESH_SPREAD = timedelta(minutes=2)
+# How long a vehicle whose renewal failed is left out of background renewals
+TOKEN_RENEWAL_BACKOFF = timedelta(minutes=10)
+
+# Connections kept per host at the least
+DEFAULT_POOL_SIZE = 10
+# Requests the account may have running outside the concurrency limit
+POOL_HEADROOM = 2
+
+
+def connection_pool_size(concurrency: int, chunk_concurrency: int) -> int:
+    """
+    Return how many connections to keep per host.
+
+    Enough for every request that can run at once, so requests never wait
+    for a connection: each api call in flight, up to the concurrency limit,
+    can have chunk_concurrency requests open, next to the account's own.
+    Never fewer than the default pool.
+    """
+    return max(concurrency * chunk_concurrency + POOL_HEADROOM, DEFAULT_POOL_SIZE)
+
 
 @dataclass
 class AuthToken:
@@ -28,10 +66,57 @@ class AuthToken:
             raise ValueError("JWT missing 'exp' claim")
         self.expiration = datetime.fromtimestamp(exp, tz=timezone.utc)
 
-    def is_expired(self, leeway: timedelta = timedelta(seconds=60)) -> bool:
+    def is_expired(self, leeway: timedelta = DEFAULT_TOKEN_LEEWAY) -> bool:
         return datetime.now(timezone.utc) + leeway >= self.expiration
 
 
+class _ServerErrorRetry(Retry):
+    """Retry that leaves 429 responses to the rate limited adapter."""
+
+    RETRY_AFTER_STATUS_CODES = frozenset({413, 503})
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTP adapter that paces requests through the shared rate limiter.
+
+    Requests sent without a timeout get request_timeout, so a hung
+    connection cannot hold an executor thread forever.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        **kwargs: Any,
+    ) -> None:
+        self.rate_limiter = rate_limiter
+        self.request_timeout = request_timeout
+        self.timeouts = 0
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        """Send a request, waiting and retrying while it is rate limited."""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.request_timeout
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except requests.exceptions.Timeout:
+                self.timeouts += 1
+                raise
+            if response.status_code != 429:
+                self.rate_limiter.record_success()
+                return response
+            self.rate_limiter.throttle(
+                parse_retry_after(response.headers.get("Retry-After"))
+            )
+            if attempt < RATE_LIMIT_RETRIES:
+                response.close()
+        return response
+
+
 class Auth:
     """Wrapper for the DIMO SDK authentication related features"""
 
@@ -41,23 +126,58 @@ class Auth:
         domain: str,
         private_key: str,
         dimo: Optional[dimo_sdk.DIMO] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        connection_stats: Optional[ConnectionStats] = None,
+        rate_limiter: Optional[RateLimiter] = None,
     ) -> None:
         """
         Initialize the authentication wrapper for the DIMO API.
+
+        When an aiohttp session is provided, an asyncio transport is
+        created alongside the SDK so the async_* methods can be used.
+        connection_stats is what traces that session, if anything.
+        Without a rate_limiter, requests are limited to the default rate.
+
+        Token refreshes are single-flight: concurrent callers needing the
+        same token wait for one refresh instead of each starting their own.
         """
         self.client_id = client_id
         self.domain = domain
         self.private_key = private_key
         self.access_token = None
         self.privileged_tokens: dict[str, AuthToken] = {}
+        # Vehicles whose background renewal failed recently
+        self._renewal_backoff = TTLCache(TOKEN_RENEWAL_BACKOFF)
+        # Set whenever a token is obtained, cleared by whoever persists them
+        self.tokens_changed = False
+        # Shared by both transports so the api sees a single request rate
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._adapter: Optional[RateLimitedAdapter] = None
         self.dimo = (
             dimo
             if dimo
             else dimo_sdk.DIMO(env="Production", session=self.build_session())
         )
+        self.async_dimo = (
+            AsyncDIMO(
+                session,
+                rate_limiter=self.rate_limiter,
+                connection_stats=connection_stats,
+            )
+            if session
+            else None
+        )
+
+        # Executor threads and the event loop refresh tokens independently,
+        # so each side gets its own set of locks
+        self._access_token_lock = threading.Lock()
+        self._privileged_token_locks: dict[str, threading.Lock] = {}
+        self._privileged_token_locks_lock = threading.Lock()
+        self._async_access_token_lock = asyncio.Lock()
+        self._async_privileged_token_locks: dict[str, asyncio.Lock] = {}
 
     def build_session(self) -> requests.Session:
-        retry_strategy = Retry(
+        retry_strategy = _ServerErrorRetry(
             total=3,
             backoff_factor=0.3,
             status_forcelist=(500, 502, 503, 504),
@@ -66,16 +186,48 @@ class Auth:
             respect_retry_after_header=True,
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = RateLimitedAdapter(self.rate_limiter, max_retries=retry_strategy)
+        self._adapter = adapter
         session = requests.Session()
 
         session.mount("https://", adapter)
         return session
 
+    def connection_pool_stats(self) -> dict[str, dict[str, int]]:
+        """Return connection statistics per host of the asyncio transport."""
+        if self.async_dimo and self.async_dimo.connection_stats:
+            return self.async_dimo.connection_stats.as_dict()
+        return {}
+
+    @property
+    def request_timeouts(self) -> int:
+        """Return how many requests of either transport timed out."""
+        return (self._adapter.timeouts if self._adapter else 0) + (
+            self.async_dimo.timeouts if self.async_dimo else 0
+        )
+
+    @staticmethod
+    def _needs_refresh(
+        token: Optional[AuthToken], leeway: timedelta = DEFAULT_TOKEN_LEEWAY
+    ) -> bool:
+        return token is None or token.is_expired(leeway)
+
+    def _get_privileged_token_lock(self, vehicle_token_id: str) -> threading.Lock:
+        with self._privileged_token_locks_lock:
+            return self._privileged_token_locks.setdefault(
+                vehicle_token_id, threading.Lock()
+            )
+
     def get_privileged_token(self, vehicle_token_id: str) -> AuthToken:
         """Get privileged token from DIMO token exchange API"""
-        token = self.privileged_tokens.get(vehicle_token_id)
-        if token is None or token.is_expired():
+        if not self._needs_refresh(self.privileged_tokens.get(vehicle_token_id)):
+            return self.privileged_tokens[vehicle_token_id]
+
+        with self._get_privileged_token_lock(vehicle_token_id):
+            # Another thread may have refreshed the token while we waited
+            if not self._needs_refresh(self.privileged_tokens.get(vehicle_token_id)):
+                return self.privileged_tokens[vehicle_token_id]
+
             _LOGGER.debug(f"Obtaining privileged token for {vehicle_token_id}")
             result = self.dimo.token_exchange.exchange(
                 developer_jwt=self.access_token.token,
@@ -87,8 +239,107 @@ class Auth:
                 raise ValueError(f"Token exchange failed for {vehicle_token_id}, response: {result}")
 
             self.privileged_tokens[vehicle_token_id] = AuthToken(token)
+            self.tokens_changed = True
+            return self.privileged_tokens[vehicle_token_id]
+
+    async def async_get_privileged_token(
+        self, vehicle_token_id: str, leeway: timedelta = DEFAULT_TOKEN_LEEWAY
+    ) -> AuthToken:
+        """Get privileged token from DIMO token exchange API without blocking"""
+        if not self._needs_refresh(
+            self.privileged_tokens.get(vehicle_token_id), leeway
+        ):
+            return self.privileged_tokens[vehicle_token_id]
+
+        lock = self._async_privileged_token_locks.setdefault(
+            vehicle_token_id, asyncio.Lock()
+        )
+        async with lock:
+            # Another task may have refreshed the token while we waited
+            if not self._needs_refresh(
+                self.privileged_tokens.get(vehicle_token_id), leeway
+            ):
+                return self.privileged_tokens[vehicle_token_id]
+
+            _LOGGER.debug(f"Obtaining privileged token for {vehicle_token_id}")
+            result = await self.async_dimo.token_exchange.exchange(
+                developer_jwt=self.access_token.token,
+                token_id=vehicle_token_id,
+                client_id=self.client_id,
+            )
+
+            token = result.get("token")
+            if not token:
+                raise ValueError(f"Token exchange failed for {vehicle_token_id}, response: {result}")
+
+            self.privileged_tokens[vehicle_token_id] = AuthToken(token)
+            self.tokens_changed = True
+            return self.privileged_tokens[vehicle_token_id]
 
-        return self.privileged_tokens[vehicle_token_id]
+    @staticmethod
+    def refresh_ahead_leeway(vehicle_token_id: str) -> timedelta:
+        """
+        Return how long before expiry the vehicle's token is renewed.
+
+        The offset within the spread is derived from the token id so it is
+        stable between checks and spreads vehicles evenly.
+        """
+        digest = hashlib.sha256(str(vehicle_token_id).encode()).digest()
+        spread = int(TOKEN_REFRESH_SPREAD.total_seconds())
+        offset = int.from_bytes(digest[:4], "big") % (spread + 1)
+        return TOKEN_REFRESH_AHEAD + timedelta(seconds=offset)
+
+    def privileged_tokens_due_for_renewal(self) -> list[str]:
+        """Return the vehicles whose privileged token should be renewed now."""
+        return [
+            vehicle_token_id
+            for vehicle_token_id, token in list(self.privileged_tokens.items())
+            if token.is_expired(self.refresh_ahead_leeway(vehicle_token_id))
+            and vehicle_token_id not in self._renewal_backoff
+        ]
+
+    async def async_renew_privileged_tokens(
+        self, call: Optional[Callable[..., Awaitable[Any]]] = None
+    ) -> dict[str, Exception]:
+        """
+        Renew the privileged tokens that are close to expiring.
+
+        Each request is awaited directly, unless call is given to dispatch
+        it. Returns the errors of failed renewals by vehicle. Those vehicles
+        are not renewed in the background again for TOKEN_RENEWAL_BACKOFF,
+        and tokens no longer usable are dropped: they will be obtained on
+        demand if still needed.
+        """
+        due = self.privileged_tokens_due_for_renewal()
+        if not due:
+            return {}
+
+        def dispatch(method, *args):
+            return call(method, *args) if call else method(*args)
+
+        await dispatch(self.async_get_access_token)
+        results = await asyncio.gather(
+            *[
+                dispatch(
+                    self.async_get_privileged_token,
+                    vehicle_token_id,
+                    self.refresh_ahead_leeway(vehicle_token_id),
+                )
+                for vehicle_token_id in due
+            ],
+            return_exceptions=True,
+        )
+        failures = {
+            vehicle_token_id: result
+            for vehicle_token_id, result in zip(due, results)
+            if isinstance(result, Exception)
+        }
+        for vehicle_token_id in failures:
+            self._renewal_backoff.set(vehicle_token_id, True)
+            token = self.privileged_tokens.get(vehicle_token_id)
+            if token is not None and token.is_expired():
+                del self.privileged_tokens[vehicle_token_id]
+        return failures
 
     def _get_auth(self):
         _LOGGER.debug("Retrieving access token")
@@ -99,6 +350,28 @@ class Auth:
                 private_key=self.private_key,
             )
             self.access_token = AuthToken(auth_header["access_token"])
+            self.tokens_changed = True
+            _LOGGER.debug("access token retrieved")
+        except dimo_sdk.request.HTTPError as e:
+            if e.status == 404:
+                raise InvalidClientIdError from e
+            if e.status == 400:
+                raise InvalidCredentialsError from e
+            raise  # Re-raise for unexpected errors
+
+        except ValueError as e:
+            raise InvalidApiKeyFormat from e
+
+    async def _async_get_auth(self):
+        _LOGGER.debug("Retrieving access token")
+        try:
+            auth_header = await self.async_dimo.auth.get_dev_jwt(
+                client_id=self.client_id,
+                domain=self.domain,
+                private_key=self.private_key,
+            )
+            self.access_token = AuthToken(auth_header["access_token"])
+            self.tokens_changed = True
             _LOGGER.debug("access token retrieved")
         except dimo_sdk.request.HTTPError as e:
             if e.status == 404:
@@ -116,16 +389,86 @@ class Auth:
         Will obtain a fresh token if no token exists or if
         the current token is expired
         """
-        if self.access_token is None or self.access_token.is_expired():
-            self._get_auth()
+        if self._needs_refresh(self.access_token):
+            with self._access_token_lock:
+                if self._needs_refresh(self.access_token):
+                    self._get_auth()
+        return self.access_token
+
+    async def async_get_access_token(self) -> AuthToken:
+        """
+        Get the DIMO API access token using the asyncio transport.
+        Will obtain a fresh token if no token exists or if
+        the current token is expired
+        """
+        if self._needs_refresh(self.access_token):
+            async with self._async_access_token_lock:
+                if self._needs_refresh(self.access_token):
+                    await self._async_get_auth()
         return self.access_token
 
+    def export_tokens(self) -> dict[str, Any]:
+        """Return the unexpired tokens in a form suitable for storage."""
+        return {
+            "access_token": (
+                None
+                if self._needs_refresh(self.access_token)
+                else self.access_token.token
+            ),
+            "privileged_tokens": [
+                {"token_id": vehicle_token_id, "token": token.token}
+                for vehicle_token_id, token in list(self.privileged_tokens.items())
+                if not token.is_expired()
+            ],
+        }
+
+    def import_tokens(self, data: Any) -> None:
+        """
+        Restore tokens previously returned by export_tokens.
+
+        Expired or malformed tokens are ignored, they will simply be
+        obtained again when needed.
+        """
+        if not isinstance(data, dict):
+            return
+
+        access_token = self._restore_token(data.get("access_token"))
+        if access_token:
+            self.access_token = access_token
+            # Normally set by get_dev_jwt, and required by the SDK's
+            # token exchange when the handshake is skipped
+            self.dimo._client_id = self.client_id
+            if self.async_dimo:
+                self.async_dimo.client_id = self.client_id
+
+        for item in data.get("privileged_tokens") or []:
+            if not isinstance(item, dict) or "token_id" not in item:
+                continue
+            token = self._restore_token(item.get("token"))
+            if token:
+                self.privileged_tokens[item["token_id"]] = token
+
+    def _restore_token(self, token: Any) -> Optional[AuthToken]:
+        if not isinstance(token, str):
+            return None
+        try:
+            restored = AuthToken(token)
+        except (jwt.PyJWTError, ValueError):
+            return None
+        return None if self._needs_refresh(restored) else restored
+
     def get_dimo(self):
         """
         Return current DIMO api instance
         """
         return self.dimo
 
+    def get_async_dimo(self) -> Optional[AsyncDIMO]:
+        """
+        Return the asyncio DIMO api instance, if a session was provided
+        """
+        return self.async_dimo
+
 
 class InvalidClientIdError(Exception):
     """ClientID value is invalid or unknown."""
@@ -0,0 +1,41 @@
+from collections.abc import Hashable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+
+class TTLCache:
+    """Cache whose entries expire a fixed time after they were stored."""
+
+    def __init__(self, ttl: timedelta):
+        self.ttl = ttl
+        self._entries: dict[Hashable, tuple[datetime, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        stored_at, value = entry
+        if datetime.now(timezone.utc) - stored_at >= self.ttl:
+            del self._entries[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, restarting its time to live."""
+        self._entries[key] = (datetime.now(timezone.utc), value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached value so the next lookup misses."""
+        self._entries.pop(key, None)
+
+    def keys(self) -> list[Hashable]:
+        """Return the keys of the entries that have not expired."""
+        return [key for key in list(self._entries) if key in self]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+
+_MISSING = object()
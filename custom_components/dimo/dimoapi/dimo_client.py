@@ -1,15 +1,82 @@
+import asyncio
 import logging
+import math
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from functools import wraps
 from typing import Any, Dict, List, Optional
 
+import dimo as dimo_sdk
 import requests
 
 from .auth import Auth
-from .queries import (CUSTOM_SIGNAL_FRAGMENTS, GET_ALL_VEHICLES_QUERY,
-                      GET_LATEST_SIGNALS_QUERY, GET_VEHICLE_REWARDS_QUERY)
+from .cache import TTLCache
+from .hedging import RequestHedger
+from .queries import (GET_ALL_VEHICLES_QUERY, GET_LATEST_SIGNALS_QUERY,
+                      GET_VEHICLES_REWARDS_QUERY, VEHICLE_REWARDS_SELECTION,
+                      GET_VEHICLE_REWARDS_QUERY)
+from .query_planner import (DEFAULT_COMPLEXITY_BUDGET, build_signal_selection,
+                            plan_signal_chunks)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of signalsLatest chunks in flight per vehicle
+DEFAULT_CHUNK_CONCURRENCY = 4
+
+# Number of vehicles requested per page of the vehicles query
+VEHICLES_PAGE_SIZE = 100
+
+# Maximum number of vehicles aliased into a single identity query
+MAX_VEHICLES_PER_IDENTITY_QUERY = 50
+
+# How long token rewards are reused before they are queried again. Earnings
+# are only updated weekly, so there is no point fetching them every poll.
+DEFAULT_REWARDS_TTL = timedelta(hours=1)
+
+# How long a learned chunk plan is trusted before larger chunks are tried again
+CHUNK_PLAN_REPROBE_INTERVAL = timedelta(hours=6)
+
+# How long a signal that makes the server return errors is left out of queries,
+# and how long errors found to concern a whole vehicle are not bisected again
+SIGNAL_QUARANTINE_PERIOD = timedelta(hours=6)
+
+# Requests a chunk's signal errors may cost per poll to find the signals
+# causing them
+SIGNAL_BISECT_BUDGET = 24
+
+
+@dataclass
+class ChunkPlan:
+    """Signal partition known to stay under the complexity limit for a vehicle."""
+
+    chunks: list[list[str]]
+    learned_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def matches(self, signal_names: list[str]) -> bool:
+        """Return True if the plan covers exactly the requested signals."""
+        return sorted(name for chunk in self.chunks for name in chunk) == sorted(
+            signal_names
+        )
+
+    def covers(self, signal_names: list[str]) -> bool:
+        """Return True if the plan was learned for every requested signal."""
+        return set(signal_names) <= {name for chunk in self.chunks for name in chunk}
+
+    def chunks_for(self, signal_names: list[str]) -> list[list[str]]:
+        """Return the plan's chunks limited to the requested signals."""
+        requested = set(signal_names)
+        chunks = [[name for name in chunk if name in requested] for chunk in self.chunks]
+        return [chunk for chunk in chunks if chunk]
+
+    def is_due_for_reprobe(self, default_chunk_count: int) -> bool:
+        """Return True if the plan was split further than the default and has aged."""
+        return (
+            len(self.chunks) > default_chunk_count
+            and datetime.now(timezone.utc) - self.learned_at
+            >= CHUNK_PLAN_REPROBE_INTERVAL
+        )
+
 
 def requires_vehicle_jwt(method):
     """Decorator that fetches vehicle jwt and unpacks token into call"""
@@ -22,10 +89,46 @@ def requires_vehicle_jwt(method):
     return wrapper
 
 
+def async_requires_vehicle_jwt(method):
+    """Decorator that fetches vehicle jwt without blocking and unpacks token into call"""
+
+    @wraps(method)
+    async def wrapper(self, token_id: str, *args, **kwargs):
+        vehicle_jwt = await self._async_fetch_privileged_token(token_id)
+        return await method(self, vehicle_jwt, token_id, *args, **kwargs)
+
+    return wrapper
+
+
 class DimoClient:
-    def __init__(self, auth: Auth):
+    def __init__(
+        self,
+        auth: Auth,
+        chunk_concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
+        complexity_budget: int = DEFAULT_COMPLEXITY_BUDGET,
+        rewards_ttl: timedelta = DEFAULT_REWARDS_TTL,
+        quarantine_period: timedelta = SIGNAL_QUARANTINE_PERIOD,
+        hedge_budget: Optional[float] = None,
+    ):
         self.auth = auth
         self.dimo = auth.get_dimo()
+        self.async_dimo = auth.get_async_dimo()
+        self.chunk_concurrency = chunk_concurrency
+        self.complexity_budget = complexity_budget
+        self.chunk_plans: dict[str, ChunkPlan] = {}
+        self.chunk_plans_changed = False
+        self.rewards_cache = TTLCache(rewards_ttl)
+        self.method_caches: dict[str, TTLCache] = {}
+        # (token id, signal name) of signals currently left out of queries
+        self.signal_quarantine = TTLCache(quarantine_period)
+        # Token ids of vehicles whose errors concern the vehicle, not signals
+        self.vehicle_wide_errors = TTLCache(quarantine_period)
+        # Slow signal chunks are hedged when a budget is given
+        self.hedger = (
+            RequestHedger(hedge_budget, rate_limiter=auth.rate_limiter)
+            if hedge_budget
+            else None
+        )
 
     def init(self) -> None:
         """Initialize the client by retrieving an authorization token"""
@@ -35,6 +138,14 @@ class DimoClient:
             _LOGGER.error(f"Failed to init Dimo client: {e}")
             raise
 
+    async def async_init(self) -> None:
+        """Initialize the client by retrieving an authorization token without blocking"""
+        try:
+            await self.auth.async_get_access_token()
+        except Exception as e:
+            _LOGGER.error(f"Failed to init Dimo client: {e}")
+            raise
+
     def _fetch_privileged_token(self, token_id: str) -> str:
         """Retrieve privileged token for specified token id"""
         try:
@@ -44,6 +155,39 @@ class DimoClient:
             _LOGGER.error(f"Failed to obtain privileged token for {token_id}: {e}")
             raise
 
+    async def _async_fetch_privileged_token(self, token_id: str) -> str:
+        """Retrieve privileged token for specified token id without blocking"""
+        try:
+            await self.auth.async_get_access_token()
+            return (await self.auth.async_get_privileged_token(token_id)).token
+        except Exception as e:
+            _LOGGER.error(f"Failed to obtain privileged token for {token_id}: {e}")
+            raise
+
+    async def async_get_cached(
+        self,
+        method: Callable[..., Any],
+        ttl: timedelta,
+        *args,
+        call: Optional[Callable[..., Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Call a client method, reusing its result for ttl.
+
+        Results are cached per method and arguments. None is treated as a
+        failed request and is not cached. The method is awaited directly,
+        unless call is given to dispatch it, which blocking methods need.
+        """
+        cache = self.method_caches.setdefault(method.__name__, TTLCache(ttl))
+        cache.ttl = ttl
+        if args in cache:
+            return cache.get(args)
+
+        result = await (call(method, *args) if call else method(*args))
+        if result is not None:
+            cache.set(args, result)
+        return result
+
     def get_vehicle_makes(self):
         """Retrieve vehicle makes."""
         return self.dimo.device_definitions.list_device_makes()
@@ -53,20 +197,116 @@ class DimoClient:
         query = GET_VEHICLE_REWARDS_QUERY.format(token_id=token_id)
         return self.dimo.identity.query(query)
 
+    async def async_get_rewards_for_vehicle(self, token_id: str):
+        """Get total token rewards generated by vehicle without blocking"""
+        return (await self.async_get_rewards_for_vehicles([token_id])).get(token_id)
+
+    async def async_get_rewards_for_vehicles(
+        self, token_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get total token rewards for several vehicles without blocking.
+
+        Vehicles are aliased into as few identity queries as possible. The
+        result for each token id is shaped like the response of a single
+        vehicle rewards query. Successful results are cached for rewards_ttl.
+        """
+        results: dict[str, dict[str, Any]] = {}
+        missing = []
+        for token_id in token_ids:
+            cached = self.rewards_cache.get(token_id)
+            if cached is not None:
+                results[token_id] = cached
+            else:
+                missing.append(token_id)
+
+        batches = [
+            missing[i : i + MAX_VEHICLES_PER_IDENTITY_QUERY]
+            for i in range(0, len(missing), MAX_VEHICLES_PER_IDENTITY_QUERY)
+        ]
+        for batch_results in await asyncio.gather(
+            *(self._async_query_rewards_batch(batch) for batch in batches)
+        ):
+            results.update(batch_results)
+        return results
+
+    async def _async_query_rewards_batch(
+        self, token_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Query rewards for a batch of vehicles, halving it on complexity errors."""
+        resp = await self.async_dimo.identity.query(
+            self._build_vehicles_rewards_query(token_ids)
+        )
+        resp = resp or {}
+
+        if self._is_complexity_error(resp) and len(token_ids) > 1:
+            mid = math.ceil(len(token_ids) / 2)
+            _LOGGER.debug(
+                "Rewards query too complex for %d vehicles, splitting",
+                len(token_ids),
+            )
+            first, second = await asyncio.gather(
+                self._async_query_rewards_batch(token_ids[:mid]),
+                self._async_query_rewards_batch(token_ids[mid:]),
+            )
+            return {**first, **second}
+
+        data = resp.get("data") or {}
+        errors = resp.get("errors") or []
+        results = {}
+        for token_id in token_ids:
+            alias = self._vehicle_alias(token_id)
+            vehicle = data.get(alias)
+            # Errors are attributed to a vehicle by the alias in their path
+            vehicle_errors = [
+                error
+                for error in errors
+                if (error.get("path") or [None])[0] == alias
+                or (vehicle is None and not error.get("path"))
+            ]
+
+            result: dict[str, Any] = {"data": {"vehicle": vehicle}}
+            if vehicle_errors:
+                result["errors"] = vehicle_errors
+            elif vehicle is not None:
+                self.rewards_cache.set(token_id, result)
+            results[token_id] = result
+        return results
+
+    @staticmethod
+    def _vehicle_alias(token_id: str) -> str:
+        return f"v{token_id}"
+
+    def _build_vehicles_rewards_query(self, token_ids: list[str]) -> str:
+        """Build an identity query fetching the rewards of every vehicle via aliases."""
+        vehicles = "".join(
+            VEHICLE_REWARDS_SELECTION.format(
+                alias=self._vehicle_alias(token_id), token_id=token_id
+            )
+            for token_id in token_ids
+        )
+        return GET_VEHICLES_REWARDS_QUERY.format(vehicles=vehicles)
+
     @requires_vehicle_jwt
     def get_available_signals(self, vehicle_jwt: str, token_id: str):
         """Get list of available signals for a specified vehicle"""
         return self.dimo.telemetry.available_signals(vehicle_jwt, token_id)
 
+    @async_requires_vehicle_jwt
+    async def async_get_available_signals(self, vehicle_jwt: str, token_id: str):
+        """Get list of available signals for a specified vehicle without blocking"""
+        return await self.async_dimo.telemetry.available_signals(vehicle_jwt, token_id)
+
     @staticmethod
     def _merge_graphql_data(responses: list[dict]) -> dict:
         """
         Merge multiple GraphQL responses for signalsLatest:
-          {"data": {"signalsLatest": {...}}, "errors":[...]}
+          {"data": {"signalsLatest": {...}}, "errors":[...], "failed_chunks":[...]}
         into one combined response.
         """
         merged: dict = {"data": {"signalsLatest": {}}}
         errors: list = []
+        failed_chunks: list = []
 
         for r in responses or []:
             if not isinstance(r, dict):
@@ -85,8 +325,15 @@ class DimoClient:
             if isinstance(errs, list):
                 errors.extend(errs)
 
+            # Carry over chunks that could not be fetched
+            failed = r.get("failed_chunks")
+            if isinstance(failed, list):
+                failed_chunks.extend(failed)
+
         if errors:
             merged["errors"] = errors
+        if failed_chunks:
+            merged["failed_chunks"] = failed_chunks
 
         signals = merged["data"]["signalsLatest"]
         if "currentLocationCoordinates" in signals:
@@ -131,19 +378,55 @@ class DimoClient:
                 return True
         return False
 
+    @classmethod
+    def _signal_errors(cls, resp: Dict[str, Any]) -> list[dict]:
+        """Return the GraphQL errors of a response, other than complexity errors."""
+        errs = resp.get("errors") if isinstance(resp, dict) else None
+        if not isinstance(errs, list) or cls._is_complexity_error(resp):
+            return []
+        return errs
+
+    @staticmethod
+    def _erroring_signals(errors: list[dict], chunk: list[str]) -> list[str]:
+        """Return the signals of the chunk that errors point at through their path."""
+        paths = [e.get("path") for e in errors if isinstance(e, dict)]
+        return [
+            name
+            for name in chunk
+            if any(isinstance(p, list) and len(p) > 1 and p[1] == name for p in paths)
+        ]
+
+    def _quarantine_signals(self, token_id: str, signal_names: list[str]) -> None:
+        """Leave signals out of queries for the vehicle until the quarantine ends."""
+        _LOGGER.warning(
+            "Signals %s of token id %s return errors, leaving them out for %s",
+            ", ".join(signal_names),
+            token_id,
+            self.signal_quarantine.ttl,
+        )
+        for name in signal_names:
+            self.signal_quarantine.set((token_id, name), True)
+
+    def quarantined_signals(self, token_id: str) -> list[str]:
+        """Return the signals of a vehicle currently left out of queries."""
+        return [
+            name
+            for quarantined_token_id, name in self.signal_quarantine.keys()
+            if quarantined_token_id == token_id
+        ]
+
+    def _without_quarantined(self, token_id: str, signal_names: list[str]) -> list[str]:
+        return [
+            name
+            for name in signal_names
+            if (token_id, name) not in self.signal_quarantine
+        ]
+
     def _build_latest_signals_query(
         self, token_id: str, signal_names: list[str]
     ) -> str:
         """Build the GraphQL query body for the provided signal names."""
-        signal_blocks = []
-
-        for name in signal_names:
-            if name in CUSTOM_SIGNAL_FRAGMENTS:
-                signal_blocks.append(CUSTOM_SIGNAL_FRAGMENTS[name].strip())
-            else:
-                signal_blocks.append(f"{name} {{\n  timestamp\n  value\n}}")
-
-        signals_query = "\n".join(signal_blocks)
+        signals_query = "\n".join(build_signal_selection(name) for name in signal_names)
         return GET_LATEST_SIGNALS_QUERY.format(token_id=token_id, signals=signals_query)
 
     @requires_vehicle_jwt
@@ -159,13 +442,18 @@ class DimoClient:
         """
         Fetch latest signals in multiple sub-queries to avoid GraphQL complexity limits.
 
-        Returns a combined GraphQL-style response dict.
+        Returns a combined GraphQL-style response dict. Chunks that fail are
+        listed under "failed_chunks" while the others are still returned;
+        only when every chunk fails is the first error raised. Quarantined
+        signals are left out.
         """
+        signal_names = self._without_quarantined(token_id, signal_names)
         if not signal_names:
             return {"data": {"signalsLatest": {}}}
 
         chunk_size = max(initial_chunk_size, min_chunk_size)
         merged_responses: List[Dict[str, Any]] = []
+        failures: list[tuple[list[str], Exception]] = []
 
         i = 0
         total = len(signal_names)
@@ -222,7 +510,7 @@ class DimoClient:
                     break
 
                 except Exception as e:
-                    # Unknown error: propagate so caller can decide
+                    # Keep the other chunks, the caller can retry this one
                     _LOGGER.error(
                         "Unexpected error querying signals %d..%d for token %s: %s",
                         i,
@@ -230,22 +518,368 @@ class DimoClient:
                         token_id,
                         e,
                     )
-                    raise
+                    failures.append((chunk, e))
+                    break
 
             # advance window
             i = end
 
         # merge all chunk results into one GraphQL-like response
-        combined = self._merge_graphql_data(merged_responses)
-        return combined
+        return self._merge_chunk_results(merged_responses, failures)
+
+    def _merge_chunk_results(
+        self,
+        responses: list[Dict[str, Any]],
+        failures: list[tuple[list[str], Exception]],
+    ) -> Dict[str, Any]:
+        """Merge the successful chunks, listing the failed ones, or raise if all failed."""
+        if failures and not responses:
+            raise failures[0][1]
+
+        if failures:
+            responses = [
+                *responses,
+                {
+                    "failed_chunks": [
+                        {"signals": chunk, "error": str(error)}
+                        for chunk, error in failures
+                    ]
+                },
+            ]
+        return self._merge_graphql_data(responses)
+
+    def _unresolved_signal_errors(
+        self, chunk: list[str], resp: Dict[str, Any] | Exception
+    ) -> bool:
+        """Return True if a chunk got signal errors not pointing at a signal."""
+        if isinstance(resp, Exception):
+            return False
+        errors = self._signal_errors(resp)
+        return bool(errors) and not self._erroring_signals(errors, chunk)
+
+    async def _async_query_signal_chunk(
+        self,
+        vehicle_jwt: str,
+        token_id: str,
+        chunk: list[str],
+        semaphore: asyncio.Semaphore,
+        suspects: list[str],
+        bisect: bool = True,
+    ) -> List[tuple[list[str], list[str], Dict[str, Any] | Exception]]:
+        """
+        Query one chunk of signals, splitting it in half while the server
+        reports a complexity error. Returns (plan_chunk, chunk, response)
+        triples, with the exception in place of the response for chunks
+        that failed. plan_chunk is the chunk the complexity splits ended
+        up with, which is what the learned partition is made of.
+
+        A chunk answered with other GraphQL errors is bisected to isolate
+        the offending signals, and those are added to suspects. Errors whose
+        path names a signal identify it straight away. Without bisect such a
+        chunk is returned as is.
+        """
+        query = self._build_latest_signals_query(token_id, chunk)
+        _LOGGER.debug(
+            "Querying %d signals for token id %s: %s",
+            len(chunk),
+            token_id,
+            ", ".join(chunk),
+        )
+        try:
+            async with semaphore:
+                if self.hedger:
+                    resp = await self.hedger.run(
+                        lambda: self.async_dimo.telemetry.query(query, vehicle_jwt)
+                    )
+                else:
+                    resp = await self.async_dimo.telemetry.query(query, vehicle_jwt)
+        except Exception as e:
+            _LOGGER.error(
+                "Unexpected error querying signals %s for token %s: %s",
+                ", ".join(chunk),
+                token_id,
+                e,
+            )
+            return [(chunk, chunk, e)]
+
+        if errors := self._signal_errors(resp):
+            if bad_signals := self._erroring_signals(errors, chunk):
+                suspects.extend(bad_signals)
+            elif bisect:
+                return await self._async_bisect_signal_errors(
+                    vehicle_jwt, token_id, chunk, resp, semaphore, suspects
+                )
+            return [(chunk, chunk, resp)]
+        if not self._is_complexity_error(resp):
+            return [(chunk, chunk, resp)]
+        if len(chunk) <= 1:
+            _LOGGER.warning(
+                "Complexity limit exceeded by a single signal (%s).", ", ".join(chunk)
+            )
+            return [
+                (
+                    chunk,
+                    chunk,
+                    RuntimeError(
+                        "GraphQL complexity limit exceeded at minimum chunk size"
+                    ),
+                )
+            ]
+
+        # The estimate was too optimistic for this chunk; split it only,
+        # sibling chunks keep their size.
+        half = math.ceil(len(chunk) / 2)
+        _LOGGER.debug(
+            "Complexity hit. Reducing chunk_size to %d for token id %s.",
+            half,
+            token_id,
+        )
+        results = await asyncio.gather(
+            *(
+                self._async_query_signal_chunk(
+                    vehicle_jwt,
+                    token_id,
+                    chunk[i : i + half],
+                    semaphore,
+                    suspects,
+                    bisect,
+                )
+                for i in range(0, len(chunk), half)
+            )
+        )
+        return [triple for chunk_results in results for triple in chunk_results]
+
+    async def _async_bisect_signal_errors(
+        self,
+        vehicle_jwt: str,
+        token_id: str,
+        chunk: list[str],
+        resp: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        suspects: list[str],
+    ) -> List[tuple[list[str], list[str], Dict[str, Any] | Exception]]:
+        """
+        Narrow the signal errors of a chunk down to the signals causing them.
+
+        Erroring chunks are halved level by level, for at most
+        SIGNAL_BISECT_BUDGET requests. Chunks still erroring once the budget
+        is spent are returned as they are, the next poll carries on without
+        the signals isolated so far. If every half queried errors, the
+        errors concern the vehicle rather than some of its signals: the
+        chunk's own response is returned and the vehicle is not bisected
+        again for the quarantine period. The triples keep chunk as their
+        plan chunk, as splits made to find broken signals are not worth
+        remembering.
+        """
+        results: List[tuple[list[str], Dict[str, Any] | Exception]] = []
+        found: list[str] = []
+        erroring = [(chunk, resp)]
+        budget = SIGNAL_BISECT_BUDGET
+        any_clean = False
+        while erroring:
+            splits = []
+            for sub_chunk, sub_resp in erroring:
+                if len(sub_chunk) <= 1:
+                    found.extend(sub_chunk)
+                    results.append((sub_chunk, sub_resp))
+                else:
+                    splits.append((sub_chunk, sub_resp))
+            if not splits:
+                break
+
+            halves = []
+            for sub_chunk, _ in splits:
+                half = math.ceil(len(sub_chunk) / 2)
+                halves.extend(
+                    sub_chunk[i : i + half] for i in range(0, len(sub_chunk), half)
+                )
+            if len(halves) > budget:
+                results.extend(splits)
+                break
+            budget -= len(halves)
+
+            _LOGGER.debug(
+                "Signal errors. Bisecting %d chunks for token id %s.",
+                len(splits),
+                token_id,
+            )
+            queried = await asyncio.gather(
+                *(
+                    self._async_query_signal_chunk(
+                        vehicle_jwt, token_id, half, semaphore, suspects, bisect=False
+                    )
+                    for half in halves
+                )
+            )
+            erroring = []
+            for triples in queried:
+                for _, sub_chunk, sub_resp in triples:
+                    if self._unresolved_signal_errors(sub_chunk, sub_resp):
+                        erroring.append((sub_chunk, sub_resp))
+                    else:
+                        any_clean = True
+                        results.append((sub_chunk, sub_resp))
+
+        if budget < SIGNAL_BISECT_BUDGET and not any_clean:
+            _LOGGER.warning(
+                "Signal errors of token id %s concern the whole vehicle, "
+                "not bisecting them for %s",
+                token_id,
+                self.vehicle_wide_errors.ttl,
+            )
+            self.vehicle_wide_errors.set(token_id, True)
+            return [(chunk, chunk, resp)]
+
+        suspects.extend(found)
+        return [(chunk, sub_chunk, sub_resp) for sub_chunk, sub_resp in results]
+
+    @async_requires_vehicle_jwt
+    async def async_get_latest_signals_batched(
+        self,
+        vehicle_jwt: str,
+        token_id: str,
+        signal_names: list[str],
+        *,
+        complexity_budget: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fetch latest signals in multiple sub-queries without blocking.
+
+        Signals are packed into the fewest chunks whose estimated complexity
+        fits complexity_budget (default: the client's complexity_budget).
+        All chunks are dispatched concurrently, with at most max_concurrency
+        (default: the client's chunk_concurrency) requests in flight. With
+        hedging enabled, a chunk slower than most is requested a second time
+        and the first answer is used. A chunk
+        the server still rejects as too complex is halved and retried on its
+        own, and the resulting partition is remembered per vehicle so
+        following polls do not rediscover the limit. Polls for only some of
+        the signals reuse the partition's chunks, limited to those signals.
+
+        Chunks that fail are listed under "failed_chunks" while the others
+        are still returned; only when every chunk fails is the first error
+        raised. Quarantined signals are left out.
+        """
+        signal_names = self._without_quarantined(token_id, signal_names)
+        if not signal_names:
+            return {"data": {"signalsLatest": {}}}
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.chunk_concurrency)
+
+        planned_chunks = plan_signal_chunks(
+            signal_names, complexity_budget or self.complexity_budget
+        )
+        plan = self.chunk_plans.get(token_id)
+        # Only a poll for every signal of the plan can relearn it
+        learn = plan is None or not plan.covers(signal_names) or plan.matches(
+            signal_names
+        )
+        if (
+            plan
+            and plan.covers(signal_names)
+            and not (learn and plan.is_due_for_reprobe(len(planned_chunks)))
+        ):
+            chunks = plan.chunks_for(signal_names)
+        else:
+            chunks = planned_chunks
+
+        suspects: list[str] = []
+        bisect = token_id not in self.vehicle_wide_errors
+        results = await asyncio.gather(
+            *(
+                self._async_query_signal_chunk(
+                    vehicle_jwt, token_id, chunk, semaphore, suspects, bisect
+                )
+                for chunk in chunks
+            )
+        )
+        triples = [triple for chunk_results in results for triple in chunk_results]
+
+        if suspects and set(suspects) != set(signal_names):
+            self._quarantine_signals(token_id, suspects)
+        elif suspects:
+            # Errors for every signal point at the vehicle, not at its signals
+            _LOGGER.warning(
+                "All signals of token id %s return errors, not quarantining them",
+                token_id,
+            )
+
+        # Only complexity splits are learned, bisecting for broken signals
+        # keeps the chunk that was bisected
+        used_chunks: list[list[str]] = []
+        for plan_chunk, _, _ in triples:
+            if not used_chunks or used_chunks[-1] is not plan_chunk:
+                used_chunks.append(plan_chunk)
+        if learn and (
+            plan is None or chunks is planned_chunks or used_chunks != plan.chunks
+        ):
+            self.chunk_plans[token_id] = ChunkPlan(used_chunks)
+            self.chunk_plans_changed = True
+
+        return self._merge_chunk_results(
+            [resp for _, _, resp in triples if not isinstance(resp, Exception)],
+            [
+                (chunk, resp)
+                for _, chunk, resp in triples
+                if isinstance(resp, Exception)
+            ],
+        )
+
+    def export_chunk_plans(self) -> list[dict[str, Any]]:
+        """Return the learned chunk plans in a json serializable form."""
+        return [
+            {
+                "token_id": token_id,
+                "chunks": plan.chunks,
+                "learned_at": plan.learned_at.isoformat(),
+            }
+            for token_id, plan in self.chunk_plans.items()
+        ]
+
+    def import_chunk_plans(self, data: Optional[list[dict[str, Any]]]) -> None:
+        """Restore chunk plans previously returned by export_chunk_plans."""
+        for item in data or []:
+            try:
+                self.chunk_plans[item["token_id"]] = ChunkPlan(
+                    chunks=item["chunks"],
+                    learned_at=datetime.fromisoformat(item["learned_at"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.debug("Ignoring malformed stored chunk plan: %s", item)
 
     def get_all_vehicles_for_license(self, license_id=None):
-        """List all vehicles for the specified license."""
+        """List the first page of vehicles for the specified license."""
         query = GET_ALL_VEHICLES_QUERY.format(
-            license_id=license_id or self.auth.client_id
+            license_id=license_id or self.auth.client_id,
+            page_size=VEHICLES_PAGE_SIZE,
         )
         return self.dimo.identity.query(query)
 
+    async def async_iter_vehicles_for_license(
+        self, license_id=None
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        List all vehicles for the specified license, one page at a time.
+
+        Follows the pageInfo cursor so licenses with more vehicles than
+        fit a single page are returned in full.
+        """
+        query = GET_ALL_VEHICLES_QUERY.format(
+            license_id=license_id or self.auth.client_id,
+            page_size=VEHICLES_PAGE_SIZE,
+        )
+        cursor = None
+        while True:
+            result = await self.async_dimo.identity.query(query, {"after": cursor})
+            vehicles = (result or {}).get("data", {}).get("vehicles") or {}
+            yield vehicles.get("nodes") or []
+
+            page_info = vehicles.get("pageInfo") or {}
+            cursor = page_info.get("endCursor")
+            if not page_info.get("hasNextPage") or not cursor:
+                return
+
     def get_total_dimo_vehicles(self) -> Optional[int]:
         """Get the total number of vehicles on DIMO."""
         try:
@@ -260,6 +894,32 @@ class DimoClient:
             _LOGGER.error(f"Failed to get total DIMO vehicles count: {e}")
             return None
 
+    async def async_get_total_dimo_vehicles(self) -> Optional[int]:
+        """Get the total number of vehicles on DIMO without blocking."""
+        try:
+            result = await self.async_dimo.identity.count_dimo_vehicles()
+            return result.get("data", {}).get("vehicles", {}).get("totalCount")
+        except dimo_sdk.request.HTTPError as ex:
+            _LOGGER.warning(
+                "DIMO API request error when retrieving DIMO vehicle count: %s", ex
+            )
+            return None
+        except Exception as e:
+            _LOGGER.error(f"Failed to get total DIMO vehicles count: {e}")
+            return None
+
+    def get_rate_limit(self) -> float:
+        """Get the request rate in requests per second currently allowed by the limiter."""
+        return self.auth.rate_limiter.state()["rate"]
+
+    def is_rate_limited(self) -> bool:
+        """Return whether requests are paused after a 429 response."""
+        return self.auth.rate_limiter.state()["throttled"]
+
+    def get_rate_limit_retry_in(self) -> float:
+        """Get the seconds until requests paused by a 429 response resume."""
+        return self.auth.rate_limiter.state()["retry_in"]
+
     @requires_vehicle_jwt
     def get_vin(self, vehicle_jwt: str, token_id: str) -> Optional[str]:
         """Retrieve the Vehicle Identification Number (VIN) for the specified token ID."""
@@ -290,3 +950,29 @@ class DimoClient:
         except Exception as e:
             _LOGGER.error(f"Failed to retrieve VIN for token_id {token_id}: {e}")
             return None
+
+    @async_requires_vehicle_jwt
+    async def async_get_vin(self, vehicle_jwt: str, token_id: str) -> Optional[str]:
+        """Retrieve the VIN for the specified token ID without blocking."""
+        try:
+            vin_response = await self.async_dimo.telemetry.get_vin(vehicle_jwt, token_id)
+            vin = vin_response.get("data", {}).get("vinVCLatest", {}).get("vin")
+            if vin:
+                _LOGGER.debug(
+                    f"Successfully retrieved VIN for token_id {token_id}: {vin}"
+                )
+                return vin
+            _LOGGER.warning(
+                f"VIN not found in response for token_id {token_id}: {vin_response}"
+            )
+            return None
+        except dimo_sdk.request.HTTPError as ex:
+            _LOGGER.warning(
+                "Connection error occurred while retrieving VIN for token id %s: %s",
+                token_id,
+                ex,
+            )
+            return None
+        except Exception as e:
+            _LOGGER.error(f"Failed to retrieve VIN for token_id {token_id}: {e}")
+            return None
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional, TypeVar
+
+from .rate_limiter import RateLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# A request is hedged once it has taken longer than this percentile of the
+# recent ones
+DEFAULT_HEDGE_PERCENTILE = 0.95
+# Hedges may be at most this fraction of all requests
+DEFAULT_HEDGE_BUDGET = 0.05
+# Recent latencies the percentile is learned from
+LATENCY_WINDOW = 200
+# Latencies needed before anything is hedged
+MIN_LATENCY_SAMPLES = 20
+
+
+class RequestHedger:
+    """
+    Sends a duplicate of a slow request and uses whichever answers first.
+
+    The hedge delay is a percentile of recently observed latencies, so only
+    the slowest requests are duplicated. The request that loses the race is
+    cancelled. Hedges are capped at a fraction of all requests so a slow
+    api is never hit with much extra traffic, and nothing is hedged while
+    the rate limiter holds requests back after a 429.
+    """
+
+    def __init__(
+        self,
+        budget: float = DEFAULT_HEDGE_BUDGET,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        self.budget = budget
+        self.percentile = percentile
+        self.rate_limiter = rate_limiter
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def hedge_delay(self) -> Optional[float]:
+        """Return the seconds after which a request is hedged, once learned."""
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(math.ceil(self.percentile * len(ordered)), len(ordered)) - 1]
+
+    def _may_hedge(self) -> bool:
+        if self.rate_limiter and self.rate_limiter.retry_in > 0:
+            # Slow because we are throttled, a hedge would only queue too
+            return False
+        return self.hedges + 1 <= self.budget * self.requests
+
+    async def _timed(self, request: Callable[[], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        try:
+            result = await request()
+        except asyncio.CancelledError:
+            # A lost race took at least this long, leaving it out would
+            # make the slowest requests look faster than they are
+            self.latencies.append(time.monotonic() - start)
+            raise
+        self.latencies.append(time.monotonic() - start)
+        return result
+
+    async def run(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Await request, hedging it with a second call if it is slow."""
+        self.requests += 1
+        primary = asyncio.ensure_future(self._timed(request))
+        tasks = [primary]
+        try:
+            delay = self.hedge_delay
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+            if primary.done() or delay is None or not self._may_hedge():
+                return await primary
+
+            self.hedges += 1
+            _LOGGER.debug("Request slower than %.2fs, hedging it", delay)
+            tasks.append(asyncio.ensure_future(self._timed(request)))
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hedging statistics for diagnostics."""
+        delay = self.hedge_delay
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay": round(delay, 3) if delay is not None else None,
+        }
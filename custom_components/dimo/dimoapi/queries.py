@@ -8,6 +8,19 @@ query GetVehicleRewardsByTokenId {{
 }}
 """
 
+GET_VEHICLES_REWARDS_QUERY = """
+query GetVehiclesRewardsByTokenIds {{
+{vehicles}
+}}
+"""
+
+VEHICLE_REWARDS_SELECTION = """
+  {alias}: vehicle(tokenId: {token_id}) {{
+      earnings {{
+        totalTokens
+      }}
+    }}"""
+
 GET_LATEST_SIGNALS_QUERY = """
 query {{
   signalsLatest(tokenId: {token_id}) {{
@@ -17,13 +30,17 @@ query {{
 """
 
 GET_ALL_VEHICLES_QUERY = """
-query VehiclesForLicense {{
-  vehicles(filterBy: {{ privileged: "{license_id}" }}, first: 100) {{
+query VehiclesForLicense($after: String) {{
+  vehicles(filterBy: {{ privileged: "{license_id}" }}, first: {page_size}, after: $after) {{
     nodes {{
       syntheticDevice {{ id }}
       tokenId
       definition {{ make model year }}
     }}
+    pageInfo {{
+      hasNextPage
+      endCursor
+    }}
     totalCount
   }}
 }}
@@ -0,0 +1,71 @@
+import re
+
+from .queries import CUSTOM_SIGNAL_FRAGMENTS
+
+# Complexity allowed per signalsLatest query. Roughly what the previous fixed
+# chunk size of 30 plain signals amounted to, with a little headroom.
+DEFAULT_COMPLEXITY_BUDGET = 100
+
+# Cost of the signalsLatest field wrapping every selection
+QUERY_BASE_COST = 1
+
+_ARGUMENTS = re.compile(r"\([^)]*\)")
+_FIELD = re.compile(r"[_A-Za-z][_0-9A-Za-z]*")
+
+
+def build_signal_selection(name: str) -> str:
+    """Return the GraphQL selection used to query a single signal."""
+    if name in CUSTOM_SIGNAL_FRAGMENTS:
+        return CUSTOM_SIGNAL_FRAGMENTS[name].strip()
+    return f"{name} {{\n  timestamp\n  value\n}}"
+
+
+def estimate_selection_cost(selection: str) -> int:
+    """
+    Estimate the complexity of a GraphQL selection set.
+
+    Mirrors the default server side calculation where every selected field
+    costs one point on top of the cost of its children, so the estimate is
+    simply the number of fields selected.
+    """
+    return len(_FIELD.findall(_ARGUMENTS.sub("", selection)))
+
+
+def estimate_signal_cost(name: str) -> int:
+    """Estimate the complexity a signal adds to a signalsLatest query."""
+    return estimate_selection_cost(build_signal_selection(name))
+
+
+def estimate_query_cost(signal_names: list[str]) -> int:
+    """Estimate the complexity of a signalsLatest query for the given signals."""
+    return QUERY_BASE_COST + sum(estimate_signal_cost(name) for name in signal_names)
+
+
+def plan_signal_chunks(
+    signal_names: list[str], budget: int = DEFAULT_COMPLEXITY_BUDGET
+) -> list[list[str]]:
+    """
+    Pack signals into the fewest chunks whose estimated cost fits the budget.
+
+    Uses first-fit decreasing bin packing. A signal that does not fit the
+    budget on its own still gets a chunk of its own so it is not dropped.
+    Signals keep their original order inside each chunk.
+    """
+    capacity = budget - QUERY_BASE_COST
+    order = {name: index for index, name in enumerate(signal_names)}
+    costs = {name: estimate_signal_cost(name) for name in signal_names}
+
+    bins: list[list[str]] = []
+    remaining: list[int] = []
+    for name in sorted(signal_names, key=lambda n: (-costs[n], order[n])):
+        for index, space in enumerate(remaining):
+            if costs[name] <= space:
+                bins[index].append(name)
+                remaining[index] -= costs[name]
+                break
+        else:
+            bins.append([name])
+            remaining.append(capacity - costs[name])
+
+    chunks = [sorted(chunk, key=order.__getitem__) for chunk in bins]
+    return sorted(chunks, key=lambda chunk: order[chunk[0]])
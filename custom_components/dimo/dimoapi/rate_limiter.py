@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+# Sustained requests per second allowed towards the DIMO apis
+DEFAULT_RATE = 10.0
+# Requests that may be made back to back before the rate applies
+DEFAULT_BURST = 20
+# The rate is halved on every 429 response, but never below this
+MIN_RATE = 0.5
+# Requests per second regained after every successful request
+RATE_RECOVERY = 0.1
+# Pause after a 429 response that did not say how long to wait
+DEFAULT_RETRY_AFTER = 5.0
+# Longest pause honoured from a Retry-After header
+MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the seconds to wait from a Retry-After header, if it has any."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request made to the DIMO apis.
+
+    Executor threads and the event loop draw from the same bucket. A 429
+    response pauses all requests for the Retry-After period and halves the
+    rate, which then creeps back up with every successful request.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.throttled_count = 0
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._tokens + (now - self._updated) * self.rate, self.burst
+            )
+            self._updated = now
+            self._tokens -= 1
+            # Tokens may go negative, each waiter queues behind the ones before
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> None:
+        """Block the calling thread until a request may be made."""
+        if wait := self._reserve():
+            time.sleep(wait)
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be made."""
+        if wait := self._reserve():
+            await asyncio.sleep(wait)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Back off after a 429 response."""
+        delay = min(
+            DEFAULT_RETRY_AFTER if retry_after is None else retry_after,
+            MAX_RETRY_AFTER,
+        )
+        with self._lock:
+            now = self._clock()
+            self._blocked_until = max(self._blocked_until, now + delay)
+            self.rate = max(self.rate / 2, MIN_RATE)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = now
+            self.throttled_count += 1
+
+    def record_success(self) -> None:
+        """Let the rate recover towards its maximum after a successful request."""
+        with self._lock:
+            self.rate = min(self.rate + RATE_RECOVERY, self.max_rate)
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until requests are no longer paused."""
+        return max(self._blocked_until - self._clock(), 0.0)
+
+    def state(self) -> dict[str, Any]:
+        """Return the current throttle state."""
+        return {
+            "rate": round(self.rate, 2),
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "throttled": self.retry_in > 0,
+            "retry_in": round(self.retry_in, 1),
+            "throttled_count": self.throttled_count,
+        }
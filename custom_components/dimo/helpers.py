@@ -1,7 +1,11 @@
 """Helper functions."""
 
+from collections.abc import Mapping
 from typing import Any
 
+from .const import (CONF_MIN_POLL_INTERVAL, CONF_POLL_INTERVAL,
+                    DEFAULT_MIN_POLL_INTERVAL)
+
 
 def get_key(path: str, data: Any, default: Any = None) -> Any:
     """
@@ -39,3 +43,29 @@ def get_key(path: str, data: Any, default: Any = None) -> Any:
         return default
 
     return current
+
+
+def get_changed_keys(
+    previous: Mapping[str, Any] | None, current: Mapping[str, Any] | None
+) -> set[str]:
+    """Return the keys that were added, removed or whose value differs."""
+    previous = previous or {}
+    current = current or {}
+    return {
+        key
+        for key in previous.keys() | current.keys()
+        if previous.get(key) != current.get(key)
+    }
+
+
+def get_min_poll_interval(options: Mapping[str, Any]) -> int:
+    """
+    Return the minimum vehicle poll interval in seconds.
+
+    Entries set up before the option existed polled vehicles at the poll
+    interval, so that stays the default.
+    """
+    return options.get(
+        CONF_MIN_POLL_INTERVAL,
+        options.get(CONF_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL),
+    )
@@ -0,0 +1,62 @@
+"""Bounded concurrency for DIMO api calls."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any
+
+
+class IOLimiter:
+    """
+    Limits how many DIMO api calls run at once.
+
+    Calls beyond the limit queue for a slot. Blocking calls hold their slot
+    while they occupy an executor thread, so a fleet poll never takes more
+    than max_concurrency of Home Assistant's shared executor threads and
+    cannot starve other integrations. Queue depth and wait times are
+    recorded for diagnostics.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.queued = 0
+        self.max_queued = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a free slot and hold it for the duration of the block."""
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        start = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        wait = time.monotonic() - start
+        self.calls += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and wait time metrics."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "calls": self.calls,
+            "average_wait": round(self.total_wait / self.calls, 3) if self.calls else 0,
+            "max_wait": round(self.max_wait, 3),
+        }
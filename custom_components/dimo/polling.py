@@ -0,0 +1,152 @@
+"""Adaptive polling of vehicle signals."""
+
+import math
+import random
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+IGNITION_KEY = "isIgnitionOn"
+SPEED_KEY = "speed"
+LATITUDE_KEY = "currentLocationLatitude"
+LONGITUDE_KEY = "currentLocationLongitude"
+
+# Speed in km/h above which a vehicle counts as moving
+MOVING_SPEED = 2
+# Distance in metres between two polls above which a vehicle counts as moving
+MOVING_DISTANCE = 50
+
+# Fraction of the interval a staggered vehicle's next poll may be moved by
+POLL_JITTER = 0.1
+# Vehicles active this recently are polled first in rolling mode
+RECENTLY_ACTIVE = timedelta(minutes=10)
+
+_EARTH_RADIUS = 6371000
+
+
+def _signal_value(signal_data: Optional[dict[str, Any]], key: str) -> Any:
+    signal = (signal_data or {}).get(key)
+    return signal.get("value") if isinstance(signal, dict) else None
+
+
+def _location(signal_data: Optional[dict[str, Any]]) -> Optional[tuple[float, float]]:
+    latitude = _signal_value(signal_data, LATITUDE_KEY)
+    longitude = _signal_value(signal_data, LONGITUDE_KEY)
+    if latitude is None or longitude is None:
+        return None
+    return float(latitude), float(longitude)
+
+
+def distance_between(origin: tuple[float, float], target: tuple[float, float]) -> float:
+    """Return the great circle distance in metres between two coordinates."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*origin, *target))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * _EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def is_vehicle_active(
+    signal_data: Optional[dict[str, Any]],
+    previous_signal_data: Optional[dict[str, Any]] = None,
+) -> bool:
+    """Return True if the ignition is on, or the vehicle is moving."""
+    if _signal_value(signal_data, IGNITION_KEY):
+        return True
+
+    speed = _signal_value(signal_data, SPEED_KEY)
+    if isinstance(speed, (int, float)) and speed > MOVING_SPEED:
+        return True
+
+    location = _location(signal_data)
+    previous_location = _location(previous_signal_data)
+    return bool(
+        location
+        and previous_location
+        and distance_between(previous_location, location) > MOVING_DISTANCE
+    )
+
+
+def select_poll_interval(
+    current_interval: timedelta,
+    signal_data: Optional[dict[str, Any]],
+    previous_signal_data: Optional[dict[str, Any]],
+    min_interval: timedelta,
+    max_interval: timedelta,
+) -> timedelta:
+    """
+    Pick the interval until a vehicle is polled again.
+
+    Active vehicles are polled at the minimum interval. Once a vehicle is
+    parked the interval doubles on every poll up to the maximum, so short
+    stops are still followed closely while parked cars are barely polled.
+    """
+    max_interval = max(max_interval, min_interval)
+    if is_vehicle_active(signal_data, previous_signal_data):
+        return min_interval
+    return min(max(current_interval * 2, min_interval), max_interval)
+
+
+def stagger_offsets(count: int, interval: timedelta) -> list[timedelta]:
+    """
+    Return start offsets spreading count vehicles evenly over an interval.
+
+    Each vehicle gets its own slot, with a random position inside the slot
+    so fleets set up at the same time do not poll in lockstep.
+    """
+    if count <= 0:
+        return []
+    slot = interval / count
+    return [slot * index + slot * random.random() for index in range(count)]
+
+
+def jitter_interval(interval: timedelta, fraction: float = POLL_JITTER) -> timedelta:
+    """Move an interval randomly by up to the given fraction either way."""
+    return interval * (1 + random.uniform(-fraction, fraction))
+
+
+@dataclass
+class VehiclePollState:
+    """What rolling polling needs to know about a vehicle."""
+
+    last_polled: Optional[datetime]
+    interval: timedelta
+    last_active: Optional[datetime] = None
+
+
+def select_vehicle_shard(
+    vehicles: Mapping[str, VehiclePollState],
+    shard_size: int,
+    now: datetime,
+    max_staleness: timedelta,
+) -> list[str]:
+    """
+    Pick the vehicles to refresh on one rolling tick.
+
+    Only vehicles due by their own adaptive interval are considered. Vehicles
+    never polled or past the maximum staleness come first, then recently
+    active ones, then the rest. Within each group the least recently polled
+    vehicle goes first, so the fleet is covered round-robin.
+    """
+
+    def priority(item: tuple[str, VehiclePollState]):
+        _, state = item
+        if state.last_polled is None:
+            return (0, datetime.min.replace(tzinfo=now.tzinfo))
+        if now - state.last_polled >= max_staleness:
+            group = 0
+        elif state.last_active and now - state.last_active <= RECENTLY_ACTIVE:
+            group = 1
+        else:
+            group = 2
+        return (group, state.last_polled)
+
+    due = [
+        (token_id, state)
+        for token_id, state in vehicles.items()
+        if state.last_polled is None
+        or now - state.last_polled >= min(state.interval, max_staleness)
+    ]
+    return [token_id for token_id, _ in sorted(due, key=priority)[:shard_size]]
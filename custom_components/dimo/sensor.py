@@ -1,14 +1,16 @@
 """Handles sensor entities."""
 
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import DIMOConfigEntry
-from .base_entity import DimoBaseEntity, DimoBaseVehicleEntity
+from . import DIMOConfigEntry, DimoVehicleCoordinator
+from .base_entity import (DimoBaseEntity, DimoBaseVehicleEntity,
+                          async_get_vehicle_entities)
 from .const import DIMO_SENSORS, DOMAIN, SIGNALS
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,18 +37,7 @@ async def async_setup_entry(
     )
 
     # Add vehicle entities
-    for vehicle_token_id, vehicle_data in coordinator.vehicle_data.items():
-        entities.extend(
-            [
-                DimoVehicleSensorEntity(coordinator, vehicle_token_id, key)
-                for key in vehicle_data.signal_data
-                if vehicle_data.signal_data[key]
-                and (
-                    (SIGNALS.get(key) and SIGNALS[key].platform == Platform.SENSOR)
-                    or not SIGNALS.get(key)
-                )
-            ]
-        )
+    entities.extend(async_get_vehicle_entities(entry, add_entities, _vehicle_entities))
 
     add_entities(entities)
 
@@ -93,3 +84,20 @@ class DimoVehicleSensorEntity(DimoBaseVehicleEntity, _DimoSensorMixin, SensorEnt
 
     def _get_unit(self):
         return SIGNALS[self.key].unit_of_measure if SIGNALS.get(self.key) else None
+
+
+def _vehicle_entities(
+    vehicle_coordinator: DimoVehicleCoordinator,
+    vehicle_token_id: str,
+    signal_data: dict[str, Any],
+) -> list[DimoVehicleSensorEntity]:
+    """Return the sensor entities of a vehicle."""
+    return [
+        DimoVehicleSensorEntity(vehicle_coordinator, vehicle_token_id, key)
+        for key in signal_data
+        if signal_data[key]
+        and (
+            (SIGNALS.get(key) and SIGNALS[key].platform == Platform.SENSOR)
+            or not SIGNALS.get(key)
+        )
+    ]
@@ -0,0 +1,69 @@
+"""Encrypted storage of DIMO authentication tokens."""
+
+import base64
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from typing import Any, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _derive_key(secret: str) -> bytes:
+    """Derive a Fernet key from the private key of the config entry."""
+    digest = hashlib.sha256(f"{DOMAIN}.tokens:{secret}".encode()).digest()
+    return base64.urlsafe_b64encode(digest)
+
+
+class EncryptedTokenStore:
+    """
+    Store for the JWTs of a config entry, encrypted at rest.
+
+    The tokens are encrypted with a key derived from the entry's private
+    key, so they can only be read back by the entry that wrote them.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, secret: str) -> None:
+        self._store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.tokens", private=True
+        )
+        self._fernet = Fernet(_derive_key(secret))
+
+    def _encrypt(self, data: dict[str, Any]) -> dict[str, str]:
+        token = self._fernet.encrypt(json.dumps(data).encode())
+        return {"tokens": token.decode()}
+
+    async def async_load(self) -> Optional[dict[str, Any]]:
+        """Load and decrypt the stored tokens, if any."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict) or "tokens" not in stored:
+            return None
+
+        try:
+            return json.loads(self._fernet.decrypt(stored["tokens"].encode()))
+        except (InvalidToken, AttributeError, ValueError):
+            # Written with a different private key or corrupted
+            _LOGGER.debug("Discarding stored tokens that could not be decrypted")
+            return None
+
+    @callback
+    def async_delay_save(
+        self, data_func: Callable[[], dict[str, Any]], delay: float = 0
+    ) -> None:
+        """Encrypt and save the tokens returned by data_func after a delay."""
+        self._store.async_delay_save(lambda: self._encrypt(data_func()), delay)
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Encrypt and save the tokens now."""
+        await self._store.async_save(self._encrypt(data))
+
+    async def async_remove(self) -> None:
+        """Delete the stored tokens."""
+        await self._store.async_remove()
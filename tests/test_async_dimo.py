@@ -0,0 +1,220 @@
+import asyncio
+import json
+
+import aiohttp
+import dimo as dimo_sdk
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pytest_homeassistant_custom_component.test_util.aiohttp import \
+    AiohttpClientMockResponse
+
+from custom_components.dimo.dimoapi import async_dimo as async_dimo_module
+from custom_components.dimo.dimoapi.async_dimo import AsyncDIMO
+
+TELEMETRY_URL = "https://telemetry-api.dimo.zone/query"
+IDENTITY_URL = "https://identity-api.dimo.zone/query"
+EXCHANGE_URL = "https://token-exchange-api.dimo.zone/v1/tokens/exchange"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@pytest.fixture
+def async_dimo(hass, aioclient_mock):
+    """Return an AsyncDIMO bound to the aiohttp mocker."""
+    return AsyncDIMO(aioclient_mock.create_session(hass.loop))
+
+
+async def test_telemetry_query_sends_bearer_token(async_dimo, aioclient_mock):
+    aioclient_mock.post(
+        TELEMETRY_URL,
+        json={"data": {"signalsLatest": {"speed": {"value": 10}}}},
+        headers=JSON_HEADERS,
+    )
+
+    result = await async_dimo.telemetry.query("query { x }", "vehicle_jwt")
+
+    assert result == {"data": {"signalsLatest": {"speed": {"value": 10}}}}
+    _, _, data, headers = aioclient_mock.mock_calls[0]
+    assert headers["Authorization"] == "Bearer vehicle_jwt"
+    assert json.loads(data) == {"query": "query { x }", "variables": {}}
+
+
+async def test_request_raises_sdk_http_error(async_dimo, aioclient_mock):
+    aioclient_mock.post(
+        IDENTITY_URL, status=404, json={"message": "nope"}, headers=JSON_HEADERS
+    )
+
+    with pytest.raises(dimo_sdk.request.HTTPError) as err:
+        await async_dimo.identity.query("query { x }")
+
+    assert err.value.status == 404
+    assert err.value.body == {"message": "nope"}
+
+
+async def test_token_exchange_decodes_privileges(async_dimo, aioclient_mock):
+    aioclient_mock.post(
+        IDENTITY_URL,
+        json={
+            "data": {
+                "vehicle": {
+                    "sacds": {
+                        "nodes": [
+                            {"grantee": "0xOTHER", "permissions": "0x3"},
+                            {"grantee": "0xabc", "permissions": "0x3c"},
+                        ]
+                    }
+                }
+            }
+        },
+        headers=JSON_HEADERS,
+    )
+    aioclient_mock.post(EXCHANGE_URL, json={"token": "jwt"}, headers=JSON_HEADERS)
+
+    result = await async_dimo.token_exchange.exchange(
+        developer_jwt="dev_jwt", token_id=1337, client_id="0xABC"
+    )
+
+    assert result == {"token": "jwt"}
+    _, _, data, headers = aioclient_mock.mock_calls[1]
+    assert headers["Authorization"] == "Bearer dev_jwt"
+    assert json.loads(data)["privileges"] == [1, 2]
+    assert json.loads(data)["tokenId"] == 1337
+
+
+async def test_token_exchange_without_client_id(async_dimo):
+    with pytest.raises(ValueError):
+        await async_dimo.token_exchange.exchange(developer_jwt="dev_jwt", token_id=1)
+
+
+async def test_request_retries_after_rate_limit(async_dimo, aioclient_mock):
+    aioclient_mock.post(
+        IDENTITY_URL, status=429, headers={"Retry-After": "0", **JSON_HEADERS}
+    )
+
+    with pytest.raises(dimo_sdk.request.HTTPError) as err:
+        await async_dimo.identity.query("query { x }")
+
+    assert err.value.status == 429
+    # The first attempt and both retries were throttled
+    assert aioclient_mock.call_count == 3
+    assert async_dimo.rate_limiter.throttled_count == 3
+    assert async_dimo.rate_limiter.rate < async_dimo.rate_limiter.max_rate
+
+
+async def test_request_timeout_raises_sdk_http_error(async_dimo, aioclient_mock):
+    aioclient_mock.post(IDENTITY_URL, exc=asyncio.TimeoutError())
+
+    with pytest.raises(dimo_sdk.request.HTTPError) as err:
+        await async_dimo.identity.query("query { x }")
+
+    assert err.value.status == -1
+    assert async_dimo.timeouts == 1
+
+
+async def test_request_retries_server_errors(async_dimo, aioclient_mock, monkeypatch):
+    monkeypatch.setattr(async_dimo_module, "SERVER_ERROR_BACKOFF", 0)
+    responses = [
+        AiohttpClientMockResponse("POST", IDENTITY_URL, status=502),
+        AiohttpClientMockResponse(
+            "POST", IDENTITY_URL, status=503, headers={"Retry-After": "0"}
+        ),
+        AiohttpClientMockResponse(
+            "POST", IDENTITY_URL, json={"data": {}}, headers=JSON_HEADERS
+        ),
+    ]
+
+    async def respond(method, url, data):
+        return responses.pop(0)
+
+    aioclient_mock.post(IDENTITY_URL, side_effect=respond)
+
+    assert await async_dimo.identity.query("query { x }") == {"data": {}}
+    assert aioclient_mock.call_count == 3
+
+
+async def test_request_gives_up_on_server_errors(
+    async_dimo, aioclient_mock, monkeypatch
+):
+    monkeypatch.setattr(async_dimo_module, "SERVER_ERROR_BACKOFF", 0)
+    aioclient_mock.post(IDENTITY_URL, status=500)
+
+    with pytest.raises(dimo_sdk.request.HTTPError) as err:
+        await async_dimo.identity.query("query { x }")
+
+    assert err.value.status == 500
+    # The first attempt and every retry
+    assert aioclient_mock.call_count == async_dimo_module.SERVER_ERROR_RETRIES + 1
+
+
+async def test_request_retries_connection_errors(
+    async_dimo, aioclient_mock, monkeypatch
+):
+    monkeypatch.setattr(async_dimo_module, "SERVER_ERROR_BACKOFF", 0)
+    aioclient_mock.post(IDENTITY_URL, exc=aiohttp.ClientConnectionError("reset"))
+
+    with pytest.raises(dimo_sdk.request.HTTPError) as err:
+        await async_dimo.identity.query("query { x }")
+
+    assert err.value.status == -1
+    assert aioclient_mock.call_count == async_dimo_module.SERVER_ERROR_RETRIES + 1
+
+
+def test_server_error_delay_backs_off():
+    backoff = async_dimo_module.SERVER_ERROR_BACKOFF
+    assert AsyncDIMO._server_error_delay(0, None) == backoff
+    assert AsyncDIMO._server_error_delay(2, None) == backoff * 4
+    # Retry-After wins over the backoff, but is capped
+    assert AsyncDIMO._server_error_delay(0, 7) == 7
+    assert (
+        AsyncDIMO._server_error_delay(0, 10**6) == async_dimo_module.MAX_RETRY_AFTER
+    )
+
+
+async def _poll_local_server(session, connection_stats, requests_per_poll, polls, gap):
+    """Poll a local keep-alive server, returning the connections it accepted."""
+    peers = set()
+    # Holds every request until all of a poll are in flight
+    in_flight = asyncio.Barrier(requests_per_poll)
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        await in_flight.wait()
+        return web.json_response({})
+
+    async def fetch(url):
+        async with session.get(url) as response:
+            await response.read()
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    async with TestServer(app) as server:
+        url = str(server.make_url("/"))
+        for _ in range(polls):
+            await asyncio.gather(*(fetch(url) for _ in range(requests_per_poll)))
+            await asyncio.sleep(gap)
+        await session.close()
+
+    assert connection_stats.as_dict() == {
+        "127.0.0.1": {
+            "connections_opened": len(peers),
+            "requests": requests_per_poll * polls,
+        }
+    }
+    return len(peers)
+
+
+async def test_client_session_reuses_connections_between_polls(socket_enabled):
+    # Connections kept open longer than the gap between polls are reused
+    connection_stats = async_dimo_module.ConnectionStats()
+    session = async_dimo_module.create_client_session(
+        16, 10, connection_stats=connection_stats
+    )
+    assert session.connector.limit_per_host == 16
+    assert await _poll_local_server(session, connection_stats, 16, 3, 0.05) == 16
+
+    # Otherwise every poll handshakes its connections again
+    connection_stats = async_dimo_module.ConnectionStats()
+    session = async_dimo_module.create_client_session(
+        16, 0.01, connection_stats=connection_stats
+    )
+    assert await _poll_local_server(session, connection_stats, 16, 3, 0.05) == 48
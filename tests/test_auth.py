@@ -1,13 +1,22 @@
-from unittest.mock import Mock
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock
 
 import dimo as dimo_sdk
 import pytest
 from helper import create_mock_token
 
 from custom_components.dimo.dimoapi import Auth, DimoClient
-from custom_components.dimo.dimoapi.auth import (InvalidApiKeyFormat,
+from custom_components.dimo.dimoapi.async_dimo import ConnectionStats
+from custom_components.dimo.dimoapi.auth import (DEFAULT_POOL_SIZE,
+                                                 TOKEN_REFRESH_AHEAD,
+                                                 TOKEN_REFRESH_SPREAD,
+                                                 InvalidApiKeyFormat,
                                                  InvalidClientIdError,
-                                                 InvalidCredentialsError)
+                                                 InvalidCredentialsError,
+                                                 connection_pool_size)
 
 
 def test_auth_get_token(mocker):
@@ -190,3 +199,302 @@ def test_access_token_not_refreshed_if_not_expired(mocker):
 
     assert token == valid_token
     dimo_mock.auth.get_dev_jwt.assert_not_called()
+
+
+async def test_auth_async_get_privileged_token():
+    fake_privileged_token = create_mock_token(1600)
+    async_dimo_mock = Mock()
+    async_dimo_mock.token_exchange.exchange = AsyncMock(
+        return_value={"token": fake_privileged_token.token}
+    )
+
+    auth = Auth("client_id", "domain", "private_key", dimo=Mock())
+    auth.async_dimo = async_dimo_mock
+    auth.access_token = create_mock_token(3600)
+
+    privileged_token = await auth.async_get_privileged_token(1337)
+
+    assert privileged_token.token == fake_privileged_token.token
+    async_dimo_mock.token_exchange.exchange.assert_awaited_once_with(
+        developer_jwt=auth.access_token.token,
+        token_id=1337,
+        client_id="client_id",
+    )
+
+
+@pytest.mark.parametrize(
+    "mocked_exception,expected_exception",
+    [
+        (
+            dimo_sdk.request.HTTPError(status=404, message="Invalid Client ID"),
+            InvalidClientIdError,
+        ),
+        (ValueError("Invalid API key format"), InvalidApiKeyFormat),
+    ],
+)
+async def test_auth_async_exceptions(mocked_exception, expected_exception):
+    async_dimo_mock = Mock()
+    async_dimo_mock.auth.get_dev_jwt = AsyncMock(side_effect=mocked_exception)
+
+    auth = Auth("client_id", "domain", "private_key", dimo=Mock())
+    auth.async_dimo = async_dimo_mock
+
+    with pytest.raises(expected_exception):
+        await auth.async_get_access_token()
+
+
+def test_privileged_token_refresh_is_single_flight():
+    vehicle_ids = [1, 2, 3]
+    callers_per_vehicle = 10
+    exchange_calls = []
+    calls_lock = threading.Lock()
+    barrier = threading.Barrier(len(vehicle_ids) * callers_per_vehicle)
+
+    def exchange(developer_jwt, token_id):
+        with calls_lock:
+            exchange_calls.append(token_id)
+        # Hold the refresh open so every other caller piles up behind it
+        time.sleep(0.05)
+        return {"token": create_mock_token(3600).token}
+
+    def get_dev_jwt(**kwargs):
+        time.sleep(0.05)
+        return {"access_token": create_mock_token(3600).token}
+
+    dimo_mock = Mock()
+    dimo_mock.token_exchange.exchange = Mock(side_effect=exchange)
+    dimo_mock.auth.get_dev_jwt = Mock(side_effect=get_dev_jwt)
+    auth = Auth("client_id", "domain", "private_key", dimo=dimo_mock)
+    # Tokens that expire within the leeway must be refreshed
+    auth.access_token = create_mock_token(10)
+    for vehicle_id in vehicle_ids:
+        auth.privileged_tokens[vehicle_id] = create_mock_token(10)
+
+    def worker(vehicle_id):
+        barrier.wait()
+        auth.get_access_token()
+        return auth.get_privileged_token(vehicle_id)
+
+    with ThreadPoolExecutor(max_workers=len(vehicle_ids) * callers_per_vehicle) as pool:
+        tokens = list(pool.map(worker, vehicle_ids * callers_per_vehicle))
+
+    assert dimo_mock.auth.get_dev_jwt.call_count == 1
+    assert sorted(exchange_calls) == vehicle_ids
+    for vehicle_id, token in zip(vehicle_ids * callers_per_vehicle, tokens):
+        assert token is auth.privileged_tokens[vehicle_id]
+
+
+async def test_async_privileged_token_refresh_is_single_flight():
+    vehicle_ids = [1, 2, 3]
+
+    async def exchange(developer_jwt, token_id, client_id):
+        await asyncio.sleep(0.01)
+        return {"token": create_mock_token(3600).token}
+
+    async def get_dev_jwt(**kwargs):
+        await asyncio.sleep(0.01)
+        return {"access_token": create_mock_token(3600).token}
+
+    async_dimo_mock = Mock()
+    async_dimo_mock.token_exchange.exchange = AsyncMock(side_effect=exchange)
+    async_dimo_mock.auth.get_dev_jwt = AsyncMock(side_effect=get_dev_jwt)
+    auth = Auth("client_id", "domain", "private_key", dimo=Mock())
+    auth.async_dimo = async_dimo_mock
+
+    async def caller(vehicle_id):
+        await auth.async_get_access_token()
+        return await auth.async_get_privileged_token(vehicle_id)
+
+    await asyncio.gather(*[caller(vehicle_id) for vehicle_id in vehicle_ids * 10])
+
+    assert async_dimo_mock.auth.get_dev_jwt.await_count == 1
+    assert sorted(
+        call.kwargs["token_id"]
+        for call in async_dimo_mock.token_exchange.exchange.await_args_list
+    ) == vehicle_ids
+
+
+def test_refresh_ahead_leeway_is_stable_and_within_spread():
+    leeways = {Auth.refresh_ahead_leeway(token_id) for token_id in range(50)}
+
+    assert Auth.refresh_ahead_leeway(1337) == Auth.refresh_ahead_leeway(1337)
+    assert all(
+        TOKEN_REFRESH_AHEAD <= leeway <= TOKEN_REFRESH_AHEAD + TOKEN_REFRESH_SPREAD
+        for leeway in leeways
+    )
+    # Vehicles are staggered rather than renewed at the same moment
+    assert len(leeways) > 1
+
+
+async def test_async_renew_privileged_tokens_renews_only_due_tokens():
+    window = TOKEN_REFRESH_AHEAD + TOKEN_REFRESH_SPREAD
+    async_dimo_mock = Mock()
+    async_dimo_mock.token_exchange.exchange = AsyncMock(
+        return_value={"token": create_mock_token(3600).token}
+    )
+    auth = Auth("client_id", "domain", "private_key", dimo=Mock())
+    auth.async_dimo = async_dimo_mock
+    auth.access_token = create_mock_token(3600)
+    # Outside the default leeway, but inside the refresh-ahead window
+    auth.privileged_tokens[1] = create_mock_token(
+        int(TOKEN_REFRESH_AHEAD.total_seconds()) - 5
+    )
+    auth.privileged_tokens[2] = create_mock_token(int(window.total_seconds()) + 60)
+
+    assert auth.privileged_tokens_due_for_renewal() == [1]
+    failures = await auth.async_renew_privileged_tokens()
+
+    assert failures == {}
+    async_dimo_mock.token_exchange.exchange.assert_awaited_once()
+    assert async_dimo_mock.token_exchange.exchange.await_args.kwargs["token_id"] == 1
+    assert not auth.privileged_tokens[1].is_expired(window)
+
+
+async def test_async_renew_privileged_tokens_reports_failures():
+    async_dimo_mock = Mock()
+    async_dimo_mock.token_exchange.exchange = AsyncMock(return_value={})
+    auth = Auth("client_id", "domain", "private_key", dimo=Mock())
+    auth.async_dimo = async_dimo_mock
+    auth.access_token = create_mock_token(3600)
+    auth.privileged_tokens[1] = create_mock_token(30)
+
+    failures = await auth.async_renew_privileged_tokens()
+
+    assert isinstance(failures[1], ValueError)
+    # Too close to expiry for polls to use, they obtain a new one on demand
+    assert 1 not in auth.privileged_tokens
+
+
+async def test_async_renew_privileged_tokens_backs_off_failing_vehicles():
+    async_dimo_mock = Mock()
+    async_dimo_mock.token_exchange.exchange = AsyncMock(
+        side_effect=dimo_sdk.request.HTTPError(status=403, message="revoked")
+    )
+    auth = Auth("client_id", "domain", "private_key", dimo=Mock())
+    auth.async_dimo = async_dimo_mock
+    auth.access_token = create_mock_token(3600)
+    auth.privileged_tokens[1] = create_mock_token(
+        int(TOKEN_REFRESH_AHEAD.total_seconds()) - 5
+    )
+    calls = []
+
+    async def call(method, *args):
+        calls.append(method)
+        return await method(*args)
+
+    failures = await auth.async_renew_privileged_tokens(call=call)
+    assert list(failures) == [1]
+    assert calls == [auth.async_get_access_token, auth.async_get_privileged_token]
+    # Still usable, so kept, but not retried on the next check
+    assert 1 in auth.privileged_tokens
+
+    assert auth.privileged_tokens_due_for_renewal() == []
+    assert await auth.async_renew_privileged_tokens(call=call) == {}
+    async_dimo_mock.token_exchange.exchange.assert_awaited_once()
+
+
+def test_export_and_import_tokens_round_trip():
+    auth = Auth("client_id", "domain", "private_key", dimo=Mock())
+    auth.access_token = create_mock_token(3600)
+    auth.privileged_tokens[1337] = create_mock_token(1600)
+    auth.privileged_tokens[42] = create_mock_token(-10)
+
+    exported = auth.export_tokens()
+
+    assert exported["privileged_tokens"] == [
+        {"token_id": 1337, "token": auth.privileged_tokens[1337].token}
+    ]
+
+    dimo_mock = Mock()
+    restored = Auth("client_id", "domain", "private_key", dimo=dimo_mock)
+    restored.import_tokens(exported)
+
+    assert restored.access_token == auth.access_token
+    assert restored.privileged_tokens == {1337: auth.privileged_tokens[1337]}
+    assert dimo_mock._client_id == "client_id"
+    assert restored.tokens_changed is False
+
+    # A restored access token skips the dev JWT handshake
+    assert restored.get_access_token() == auth.access_token
+    dimo_mock.auth.get_dev_jwt.assert_not_called()
+
+
+def test_import_tokens_ignores_expired_and_malformed():
+    auth = Auth("client_id", "domain", "private_key", dimo=Mock())
+
+    auth.import_tokens(
+        {
+            "access_token": create_mock_token(-10).token,
+            "privileged_tokens": [
+                {"token_id": 1, "token": "not a jwt"},
+                {"token": create_mock_token(3600).token},
+                "garbage",
+            ],
+        }
+    )
+    auth.import_tokens(None)
+
+    assert auth.access_token is None
+    assert auth.privileged_tokens == {}
+
+
+def test_session_adapter_backs_off_on_rate_limit(mocker):
+    responses = [
+        Mock(status_code=429, headers={"Retry-After": "0"}),
+        Mock(status_code=200, headers={}),
+    ]
+    send = mocker.patch("requests.adapters.HTTPAdapter.send", side_effect=responses)
+    auth = Auth("client_id", "domain", "private_key")
+
+    response = auth.dimo.session.get_adapter("https://x").send(Mock())
+
+    assert response.status_code == 200
+    assert send.call_count == 2
+    assert auth.rate_limiter.throttled_count == 1
+    responses[0].close.assert_called_once()
+
+
+def test_session_adapter_applies_default_timeout(mocker):
+    import requests
+
+    send = mocker.patch(
+        "requests.adapters.HTTPAdapter.send",
+        side_effect=[Mock(status_code=200, headers={}), requests.exceptions.ReadTimeout()],
+    )
+    auth = Auth("client_id", "domain", "private_key")
+    adapter = auth.dimo.session.get_adapter("https://x")
+
+    adapter.send(Mock())
+    assert send.call_args.kwargs["timeout"] == adapter.request_timeout
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        adapter.send(Mock(), timeout=5)
+    assert send.call_args.kwargs["timeout"] == 5
+    assert auth.request_timeouts == 1
+
+
+def test_connection_pool_size():
+    # Never below the default pool
+    assert connection_pool_size(1, 1) == DEFAULT_POOL_SIZE
+    # Each api call can have its chunks in flight, next to the account's own
+    assert connection_pool_size(8, 4) == 34
+
+
+def test_connection_pool_stats_come_from_the_asyncio_transport():
+    assert Auth("client_id", "domain", "private_key").connection_pool_stats() == {}
+
+    connection_stats = ConnectionStats()
+    connection_stats.hosts["telemetry-api.dimo.zone"] = {
+        "connections_opened": 2,
+        "requests": 5,
+    }
+    auth = Auth(
+        "client_id",
+        "domain",
+        "private_key",
+        session=Mock(),
+        connection_stats=connection_stats,
+    )
+    assert auth.connection_pool_stats() == {
+        "telemetry-api.dimo.zone": {"connections_opened": 2, "requests": 5}
+    }
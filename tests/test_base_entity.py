@@ -92,6 +92,51 @@ def test_dimo_base_entity_handle_coordinator_update(
         mock_write_ha_state.assert_called_once()
 
 
+def test_dimo_base_entity_skips_write_when_signal_unchanged(
+    hass: HomeAssistant, mock_coordinator: DataUpdateCoordinator
+):
+    """Test that entities are only written when their own signal changed."""
+    mock_coordinator.changed_keys = {"other_key"}
+    mock_coordinator.suppressed_writes = 0
+    entity = DimoBaseEntity(mock_coordinator, "vehicle_123", "mock_key")
+    entity.hass = hass
+
+    with patch.object(entity, "async_write_ha_state") as mock_write_ha_state:
+        entity._handle_coordinator_update()
+        mock_write_ha_state.assert_not_called()
+        assert mock_coordinator.suppressed_writes == 1
+
+        mock_coordinator.changed_keys = {"mock_key"}
+        entity._handle_coordinator_update()
+        mock_write_ha_state.assert_called_once()
+
+
+def test_dimo_base_entity_writes_when_coordinator_recovers(
+    hass: HomeAssistant, mock_coordinator: DataUpdateCoordinator
+):
+    """Test that entities leave the unavailable state even if data is unchanged."""
+    mock_coordinator.suppressed_writes = 0
+    entity = DimoBaseEntity(mock_coordinator, "vehicle_123", "mock_key")
+    entity.hass = hass
+
+    with patch.object(entity, "async_write_ha_state") as mock_write_ha_state:
+        # A failed update notifies every entity
+        mock_coordinator.last_update_success = False
+        mock_coordinator.changed_keys = None
+        entity._handle_coordinator_update()
+        assert mock_write_ha_state.call_count == 1
+
+        # The next success with unchanged data must still write
+        mock_coordinator.last_update_success = True
+        mock_coordinator.changed_keys = set()
+        entity._handle_coordinator_update()
+        assert mock_write_ha_state.call_count == 2
+
+        entity._handle_coordinator_update()
+        assert mock_write_ha_state.call_count == 2
+        assert mock_coordinator.suppressed_writes == 1
+
+
 def test_dimo_base_entity_extra_state_attributes(
     hass: HomeAssistant, mock_coordinator: DataUpdateCoordinator
 ):
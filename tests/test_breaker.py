@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+from custom_components.dimo.breaker import BreakerState, CircuitBreaker
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _open_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, base_backoff=timedelta(minutes=1))
+    for _ in range(3):
+        assert breaker.allow_request(NOW)
+        breaker.record_failure(NOW)
+    return breaker
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = _open_breaker()
+
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.open_until == NOW + timedelta(minutes=1)
+    assert not breaker.allow_request(NOW + timedelta(seconds=30))
+
+
+def test_breaker_success_resets_failures():
+    breaker = CircuitBreaker(failure_threshold=3)
+    breaker.record_failure(NOW)
+    breaker.record_failure(NOW)
+    breaker.record_success()
+    breaker.record_failure(NOW)
+
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.failures == 1
+
+
+def test_breaker_half_open_probe():
+    breaker = _open_breaker()
+    later = NOW + timedelta(minutes=1)
+
+    # Only one probe is let through
+    assert breaker.allow_request(later)
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert not breaker.allow_request(later)
+
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.allow_request(later)
+
+
+def test_breaker_backoff_doubles_on_failed_probe():
+    breaker = _open_breaker()
+    later = NOW + timedelta(minutes=1)
+
+    assert breaker.allow_request(later)
+    breaker.record_failure(later)
+
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.open_until == later + timedelta(minutes=2)
+    assert breaker.as_dict() == {
+        "state": "open",
+        "failures": 4,
+        "open_until": (later + timedelta(minutes=2)).isoformat(),
+    }
+
+
+def test_breaker_backoff_is_capped():
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        base_backoff=timedelta(minutes=1),
+        max_backoff=timedelta(minutes=5),
+    )
+    for _ in range(10):
+        breaker.record_failure(NOW)
+
+    assert breaker.open_until == NOW + timedelta(minutes=5)
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from custom_components.dimo.dimoapi.cache import TTLCache
+
+
+def test_ttl_cache_returns_fresh_values():
+    cache = TTLCache(timedelta(minutes=5))
+    cache.set("key", {"value": 1})
+
+    assert cache.get("key") == {"value": 1}
+    assert "key" in cache
+    assert cache.get("other", "default") == "default"
+
+
+def test_ttl_cache_expires_values():
+    cache = TTLCache(timedelta(0))
+    cache.set("key", {"value": 1})
+
+    assert cache.get("key") is None
+    assert "key" not in cache
+
+
+def test_ttl_cache_invalidate():
+    cache = TTLCache(timedelta(minutes=5))
+    cache.set("key", 1)
+    cache.invalidate("key")
+    cache.invalidate("missing")
+
+    assert "key" not in cache
+
+
+def test_ttl_cache_keys_skip_expired():
+    cache = TTLCache(timedelta(minutes=5))
+    cache.set("first", 1)
+    cache.set("second", 2)
+
+    assert cache.keys() == ["first", "second"]
+
+    cache.ttl = timedelta(0)
+    assert cache.keys() == []
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+from custom_components.dimo.cadence import (LOCATION_SIGNAL,
+                                            MAX_SIGNAL_STALENESS,
+                                            SignalCadence,
+                                            SignalCadenceLearner)
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(minutes):
+    return START + timedelta(minutes=minutes)
+
+
+def _signal(minutes):
+    return {"timestamp": _at(minutes).isoformat().replace("+00:00", "Z"), "value": 1}
+
+
+def test_unknown_and_always_polled_signals_are_due():
+    learner = SignalCadenceLearner()
+    learner.observe({"speed": _signal(0)}, ["speed"], _at(0))
+    learner.observe({"speed": _signal(0)}, ["speed"], _at(1))
+
+    assert learner.due_signals(["speed", "odometer"], _at(1)) == ["speed", "odometer"]
+
+
+def test_location_is_always_due():
+    learner = SignalCadenceLearner()
+    learner.signals[LOCATION_SIGNAL] = SignalCadence(
+        last_timestamp=_at(0), interval=timedelta(minutes=10), last_polled=_at(0)
+    )
+
+    assert learner.due_signals([LOCATION_SIGNAL, "odometer"], _at(1)) == [
+        LOCATION_SIGNAL,
+        "odometer",
+    ]
+
+
+def test_signal_is_skipped_until_plausibly_due():
+    learner = SignalCadenceLearner()
+    # Odometer reports every 10 minutes
+    learner.observe({"odometer": _signal(0)}, ["odometer"], _at(0.5))
+    learner.observe({"odometer": _signal(10)}, ["odometer"], _at(10.5))
+
+    assert learner.signals["odometer"].interval == timedelta(minutes=10)
+    assert not learner.is_due("odometer", _at(11))
+    assert not learner.is_due("odometer", _at(17.5))
+    assert learner.is_due("odometer", _at(18))
+
+    # No new value yet: wait half a cadence before asking again
+    learner.observe({"odometer": _signal(10)}, ["odometer"], _at(18))
+    assert not learner.is_due("odometer", _at(22))
+    assert learner.is_due("odometer", _at(23))
+
+
+def test_cadence_is_smoothed():
+    learner = SignalCadenceLearner()
+    for polled, timestamp in [(0, 0), (10, 10), (30, 30)]:
+        learner.observe({"odometer": _signal(timestamp)}, ["odometer"], _at(polled))
+
+    # 10 minutes, then 20 minutes weighted at 0.3
+    assert learner.signals["odometer"].interval == timedelta(minutes=13)
+
+
+def test_stale_signals_are_always_due():
+    learner = SignalCadenceLearner()
+    learner.observe({"odometer": _signal(0)}, ["odometer"], _at(0))
+    learner.observe({"odometer": _signal(600)}, ["odometer"], _at(600))
+
+    stale = _at(600) + MAX_SIGNAL_STALENESS
+    assert learner.is_due("odometer", stale)
+    assert not learner.is_due("odometer", stale - timedelta(minutes=1))
@@ -4,7 +4,12 @@ import pytest
 
 from custom_components.dimo.config_flow import InvalidAuth
 from custom_components.dimo.const import (CONF_AUTH_PROVIDER, CONF_LICENSE_ID,
+                                          CONF_MAX_POLL_INTERVAL,
+                                          CONF_MIN_POLL_INTERVAL,
                                           CONF_POLL_INTERVAL, CONF_PRIVATE_KEY,
+                                          CONF_RATE_LIMIT,
+                                          CONF_RATE_LIMIT_BURST,
+                                          CONF_REWARDS_INTERVAL,
                                           DEFAULT_POLL_INTERVAL, DOMAIN)
 
 
@@ -105,6 +110,11 @@ async def test_options_flow_init_default_values(hass, monkeypatch):
     # Verify the schema contains the poll interval field
     schema_keys = [str(key) for key in result["data_schema"].schema.keys()]
     assert any(CONF_POLL_INTERVAL in key for key in schema_keys)
+    assert any(CONF_REWARDS_INTERVAL in key for key in schema_keys)
+    assert any(CONF_MIN_POLL_INTERVAL in key for key in schema_keys)
+    assert any(CONF_MAX_POLL_INTERVAL in key for key in schema_keys)
+    assert any(CONF_RATE_LIMIT in key for key in schema_keys)
+    assert any(CONF_RATE_LIMIT_BURST in key for key in schema_keys)
 
 
 async def test_options_flow_update_poll_interval(hass, monkeypatch):
@@ -148,6 +158,35 @@ async def test_options_flow_update_poll_interval(hass, monkeypatch):
     assert result["data"][CONF_POLL_INTERVAL] == new_poll_interval
 
 
+async def test_options_flow_rejects_min_interval_above_max(hass, monkeypatch):
+    """Test that the minimum poll interval can not exceed the maximum."""
+    async def mock_validate_input(hass, data):
+        return {"title": "DIMO"}
+
+    monkeypatch.setattr(
+        "custom_components.dimo.config_flow.validate_input", mock_validate_input
+    )
+
+    user_input = {
+        CONF_LICENSE_ID: "dummy_client",
+        CONF_AUTH_PROVIDER: "dummy_provider",
+        CONF_PRIVATE_KEY: "dummy_private",
+    }
+    await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}, data=user_input
+    )
+    config_entry = hass.config_entries.async_entries(DOMAIN)[0]
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_MIN_POLL_INTERVAL: 600, CONF_MAX_POLL_INTERVAL: 300},
+    )
+
+    assert result["type"] == "form"
+    assert result["errors"] == {"base": "min_poll_interval_above_max"}
+
+
 async def test_options_flow_triggers_reload(hass, monkeypatch):
     """Test that updating options triggers a config entry reload."""
     # Mock validate_input to allow creating a config entry
@@ -1,8 +1,15 @@
-from unittest.mock import Mock
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
 
+import dimo as dimo_sdk
 from helper import create_mock_token
 
 from custom_components.dimo.dimoapi import DimoClient
+from custom_components.dimo.dimoapi.dimo_client import (
+    CHUNK_PLAN_REPROBE_INTERVAL, SIGNAL_BISECT_BUDGET, ChunkPlan)
+from custom_components.dimo.dimoapi.rate_limiter import RateLimiter
 
 
 def test_dimo_client_init():
@@ -394,6 +401,22 @@ def test_dimo_client_get_total_dimo_vehicles_exception():
     dimo_mock.identity.count_dimo_vehicles.assert_called_once()
 
 
+def test_dimo_client_reports_rate_limiter_throttling():
+    auth_mock = Mock()
+    auth_mock.rate_limiter = RateLimiter(rate=4, burst=8)
+    dimo_client = DimoClient(auth=auth_mock)
+
+    assert dimo_client.get_rate_limit() == 4
+    assert dimo_client.is_rate_limited() is False
+    assert dimo_client.get_rate_limit_retry_in() == 0
+
+    auth_mock.rate_limiter.throttle(30)
+
+    assert dimo_client.get_rate_limit() == 2
+    assert dimo_client.is_rate_limited() is True
+    assert 29 < dimo_client.get_rate_limit_retry_in() <= 30
+
+
 def test_fetch_privileged_token_success():
     auth_mock = Mock()
     priv_token = create_mock_token(1200)
@@ -577,3 +600,540 @@ def test_get_latest_signals_batched_unknown_exception():
 
     assert total_vehicles is None
     dimo_mock.identity.count_dimo_vehicles.assert_called_once()
+
+
+def _async_client(priv_token):
+    """Return a DimoClient whose auth and asyncio transport are mocked."""
+    auth_mock = Mock()
+    auth_mock.async_get_access_token = AsyncMock()
+    auth_mock.async_get_privileged_token = AsyncMock(return_value=priv_token)
+    async_dimo_mock = auth_mock.get_async_dimo.return_value
+    async_dimo_mock.telemetry.query = AsyncMock()
+    async_dimo_mock.telemetry.get_vin = AsyncMock()
+    async_dimo_mock.identity.query = AsyncMock()
+    return DimoClient(auth=auth_mock), auth_mock, async_dimo_mock
+
+
+async def test_dimo_client_async_get_latest_signals_batched():
+    priv_token = create_mock_token(3600)
+    dimo_client, auth_mock, async_dimo_mock = _async_client(priv_token)
+    async_dimo_mock.telemetry.query.side_effect = [
+        {"data": {"signalsLatest": {f"signal{i}": {"value": i}}}} for i in range(2)
+    ]
+
+    signal_names = [f"signal{i}" for i in range(40)]
+    result = await dimo_client.async_get_latest_signals_batched("4242", signal_names)
+
+    assert result == {
+        "data": {"signalsLatest": {"signal0": {"value": 0}, "signal1": {"value": 1}}}
+    }
+    assert async_dimo_mock.telemetry.query.await_count == 2
+    auth_mock.async_get_privileged_token.assert_awaited_once_with("4242")
+
+
+async def test_dimo_client_async_get_vin():
+    priv_token = create_mock_token(3600)
+    dimo_client, _, async_dimo_mock = _async_client(priv_token)
+    async_dimo_mock.telemetry.get_vin.return_value = {
+        "data": {"vinVCLatest": {"vin": "1HGCM82633A123456"}}
+    }
+
+    assert await dimo_client.async_get_vin("18003") == "1HGCM82633A123456"
+    async_dimo_mock.telemetry.get_vin.assert_awaited_once_with(
+        priv_token.token, "18003"
+    )
+
+
+async def test_dimo_client_async_get_vin_http_error():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.telemetry.get_vin.side_effect = dimo_sdk.request.HTTPError(
+        status=-1, message="connection reset"
+    )
+
+    assert await dimo_client.async_get_vin("18003") is None
+
+
+async def test_dimo_client_async_batched_chunks_run_concurrently():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_query(query, vehicle_jwt):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"data": {"signalsLatest": {}}}
+
+    async_dimo_mock.telemetry.query.side_effect = slow_query
+
+    signal_names = [f"signal{i}" for i in range(90)]
+    await dimo_client.async_get_latest_signals_batched(
+        "4242", signal_names, complexity_budget=31, max_concurrency=3
+    )
+
+    assert async_dimo_mock.telemetry.query.await_count == 9
+    assert max_in_flight == 3
+
+
+async def test_dimo_client_async_batched_complexity_split_per_chunk():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    complexity_error = {
+        "errors": [{"extensions": {"code": "COMPLEXITY_LIMIT_EXCEEDED"}}]
+    }
+
+    async def query(query, vehicle_jwt):
+        names = re.findall(r"(signal\d+) \{", query)
+        # only the chunk holding signal0 is too complex at full size
+        if "signal0" in names and len(names) > 5:
+            return complexity_error
+        return {"data": {"signalsLatest": {name: {"value": 1} for name in names}}}
+
+    async_dimo_mock.telemetry.query.side_effect = query
+
+    signal_names = [f"signal{i}" for i in range(20)]
+    result = await dimo_client.async_get_latest_signals_batched(
+        "4242", signal_names, complexity_budget=31
+    )
+
+    assert set(result["data"]["signalsLatest"]) == set(signal_names)
+    # chunk 1 failed once and was split in two, chunk 2 succeeded directly
+    assert async_dimo_mock.telemetry.query.await_count == 4
+
+
+async def test_dimo_client_async_batched_returns_partial_results():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+
+    async def query(query, vehicle_jwt):
+        names = re.findall(r"(signal\d+) \{", query)
+        if "signal0" in names:
+            raise dimo_sdk.request.HTTPError(status=502, message="bad gateway")
+        return {"data": {"signalsLatest": {name: {"value": 1} for name in names}}}
+
+    async_dimo_mock.telemetry.query.side_effect = query
+
+    signal_names = [f"signal{i}" for i in range(20)]
+    result = await dimo_client.async_get_latest_signals_batched(
+        "4242", signal_names, complexity_budget=31
+    )
+
+    failed = result["failed_chunks"]
+    assert len(failed) == 1
+    assert "signal0" in failed[0]["signals"]
+    assert "bad gateway" in failed[0]["error"]
+    assert set(result["data"]["signalsLatest"]) == set(signal_names) - set(
+        failed[0]["signals"]
+    )
+
+
+async def test_dimo_client_async_batched_raises_when_all_chunks_fail():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.telemetry.query.side_effect = dimo_sdk.request.HTTPError(
+        status=502, message="bad gateway"
+    )
+
+    try:
+        await dimo_client.async_get_latest_signals_batched(
+            "4242", [f"signal{i}" for i in range(20)], complexity_budget=31
+        )
+        assert False, "Exception should be reraised!"
+    except dimo_sdk.request.HTTPError as ex:
+        assert ex.status == 502
+
+
+def test_get_latest_signals_batched_returns_partial_results():
+    auth_mock = Mock()
+    auth_mock.get_privileged_token.return_value = create_mock_token(20)
+    dimo_client = DimoClient(auth=auth_mock)
+    dimo_client.dimo = Mock()
+    dimo_client.dimo.telemetry.query.side_effect = [
+        {"data": {"signalsLatest": {"sig1": {"value": 1}}}},
+        Exception("telemetry fail"),
+    ]
+
+    result = dimo_client.get_latest_signals_batched(
+        "56777", ["sig1", "sig2"], initial_chunk_size=1, min_chunk_size=1
+    )
+
+    assert result == {
+        "data": {"signalsLatest": {"sig1": {"value": 1}}},
+        "failed_chunks": [{"signals": ["sig2"], "error": "telemetry fail"}],
+    }
+
+
+def _broken_signal_query(*broken, with_path=False):
+    """Return a telemetry.query side effect erroring on chunks holding broken."""
+    calls = []
+
+    async def query(query, vehicle_jwt):
+        names = re.findall(r"(signal\d+) \{", query)
+        calls.append(names)
+        data = {name: {"value": 1} for name in names if name not in broken}
+        errors = []
+        for name in broken:
+            if name in names:
+                error = {"message": "internal error"}
+                if with_path:
+                    error["path"] = ["signalsLatest", name]
+                errors.append(error)
+        if not errors:
+            return {"data": {"signalsLatest": data}}
+        return {"data": {"signalsLatest": data}, "errors": errors}
+
+    return query, calls
+
+
+async def test_dimo_client_async_batched_bisects_and_quarantines_bad_signal():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    query, calls = _broken_signal_query("signal5")
+    async_dimo_mock.telemetry.query.side_effect = query
+    signal_names = [f"signal{i}" for i in range(8)]
+
+    await dimo_client.async_get_latest_signals_batched("4242", signal_names)
+
+    assert dimo_client.quarantined_signals("4242") == ["signal5"]
+    # 8 -> 4 -> 2 -> 1, querying both halves at every level
+    assert len(calls) == 7
+    # Splits made to find the broken signal are not learned
+    assert dimo_client.chunk_plans["4242"].chunks == [signal_names]
+
+    calls.clear()
+    result = await dimo_client.async_get_latest_signals_batched("4242", signal_names)
+
+    assert calls == [[name for name in signal_names if name != "signal5"]]
+    assert "errors" not in result
+
+
+async def test_dimo_client_async_batched_quarantines_signal_from_error_path():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    query, calls = _broken_signal_query("signal5", with_path=True)
+    async_dimo_mock.telemetry.query.side_effect = query
+
+    await dimo_client.async_get_latest_signals_batched(
+        "4242", [f"signal{i}" for i in range(8)]
+    )
+
+    assert dimo_client.quarantined_signals("4242") == ["signal5"]
+    assert len(calls) == 1
+
+
+async def test_dimo_client_async_batched_does_not_quarantine_every_signal():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.telemetry.query.return_value = {
+        "data": None,
+        "errors": [{"message": "unauthorized"}],
+    }
+
+    await dimo_client.async_get_latest_signals_batched("4242", ["signal0", "signal1"])
+
+    assert dimo_client.quarantined_signals("4242") == []
+
+
+async def test_dimo_client_async_batched_stops_bisecting_vehicle_wide_errors():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.telemetry.query.return_value = {
+        "data": None,
+        "errors": [{"message": "unauthorized"}],
+    }
+    signal_names = [f"signal{i}" for i in range(40)]
+
+    # The chunk, then halves, quarters and eighths until the next level
+    # would exceed the budget, all of which error too
+    for requests in [1 + 2 + 4 + 8, 1]:
+        async_dimo_mock.telemetry.query.reset_mock()
+        await dimo_client.async_get_latest_signals_batched(
+            "4242", signal_names, complexity_budget=10_000
+        )
+
+        assert async_dimo_mock.telemetry.query.await_count == requests
+        assert dimo_client.chunk_plans["4242"].chunks == [signal_names]
+    assert dimo_client.quarantined_signals("4242") == []
+
+
+async def test_dimo_client_async_batched_isolates_broken_signals_in_both_halves():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    query, calls = _broken_signal_query("signal3", "signal20")
+    async_dimo_mock.telemetry.query.side_effect = query
+    signal_names = [f"signal{i}" for i in range(40)]
+
+    await dimo_client.async_get_latest_signals_batched(
+        "4242", signal_names, complexity_budget=10_000
+    )
+
+    assert sorted(dimo_client.quarantined_signals("4242")) == ["signal20", "signal3"]
+    assert len(calls) <= 1 + SIGNAL_BISECT_BUDGET
+
+    calls.clear()
+    result = await dimo_client.async_get_latest_signals_batched(
+        "4242", signal_names, complexity_budget=10_000
+    )
+
+    assert len(calls) == 1
+    assert "errors" not in result
+
+
+async def test_dimo_client_async_batched_hedges_chunks():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    assert dimo_client.hedger is None
+
+    dimo_client.hedger = Mock(
+        run=AsyncMock(return_value={"data": {"signalsLatest": {"signal0": {"value": 1}}}})
+    )
+    result = await dimo_client.async_get_latest_signals_batched("4242", ["signal0"])
+
+    assert result == {"data": {"signalsLatest": {"signal0": {"value": 1}}}}
+    dimo_client.hedger.run.assert_awaited_once()
+    # The hedger is handed a factory it can call again for the hedge
+    await dimo_client.hedger.run.call_args.args[0]()
+    async_dimo_mock.telemetry.query.assert_awaited_once()
+
+
+def _complexity_limited_query(limit):
+    """Return a telemetry.query side effect failing chunks larger than limit."""
+
+    async def query(query, vehicle_jwt):
+        names = re.findall(r"(signal\d+) \{", query)
+        if len(names) > limit:
+            return {"errors": [{"extensions": {"code": "COMPLEXITY_LIMIT_EXCEEDED"}}]}
+        return {"data": {"signalsLatest": {name: {"value": 1} for name in names}}}
+
+    return query
+
+
+async def test_dimo_client_async_batched_reuses_learned_chunk_plan():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.telemetry.query.side_effect = _complexity_limited_query(8)
+    signal_names = [f"signal{i}" for i in range(30)]
+
+    await dimo_client.async_get_latest_signals_batched("4242", signal_names)
+    # 30 -> 15 / 15 -> 8 / 7 split with three failed requests on the way
+    assert async_dimo_mock.telemetry.query.await_count == 7
+    assert dimo_client.chunk_plans_changed
+    assert [len(c) for c in dimo_client.chunk_plans["4242"].chunks] == [8, 7, 8, 7]
+
+    dimo_client.chunk_plans_changed = False
+    async_dimo_mock.telemetry.query.reset_mock()
+    result = await dimo_client.async_get_latest_signals_batched("4242", signal_names)
+
+    assert set(result["data"]["signalsLatest"]) == set(signal_names)
+    assert async_dimo_mock.telemetry.query.await_count == 4
+    assert not dimo_client.chunk_plans_changed
+
+
+async def test_dimo_client_async_batched_reprobes_stale_chunk_plan():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.telemetry.query.side_effect = _complexity_limited_query(30)
+    signal_names = [f"signal{i}" for i in range(30)]
+    dimo_client.chunk_plans["4242"] = ChunkPlan(
+        chunks=[signal_names[:15], signal_names[15:]],
+        learned_at=datetime.now(timezone.utc) - CHUNK_PLAN_REPROBE_INTERVAL,
+    )
+
+    await dimo_client.async_get_latest_signals_batched("4242", signal_names)
+
+    assert async_dimo_mock.telemetry.query.await_count == 1
+    assert dimo_client.chunk_plans["4242"].chunks == [signal_names]
+
+
+def test_dimo_client_chunk_plans_round_trip():
+    dimo_client = DimoClient(auth=Mock())
+    dimo_client.chunk_plans[4242] = ChunkPlan(chunks=[["speed"], ["isIgnitionOn"]])
+
+    restored = DimoClient(auth=Mock())
+    restored.import_chunk_plans(dimo_client.export_chunk_plans() + [{"bogus": 1}])
+
+    assert restored.chunk_plans == dimo_client.chunk_plans
+
+
+async def test_dimo_client_async_iter_vehicles_follows_cursor():
+    dimo_client, auth_mock, async_dimo_mock = _async_client(create_mock_token(3600))
+    auth_mock.client_id = "0xabc"
+    async_dimo_mock.identity.query.side_effect = [
+        {
+            "data": {
+                "vehicles": {
+                    "nodes": [{"tokenId": 1}, {"tokenId": 2}],
+                    "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                }
+            }
+        },
+        {
+            "data": {
+                "vehicles": {
+                    "nodes": [{"tokenId": 3}],
+                    "pageInfo": {"hasNextPage": False, "endCursor": "c2"},
+                }
+            }
+        },
+    ]
+
+    pages = [page async for page in dimo_client.async_iter_vehicles_for_license()]
+
+    assert pages == [[{"tokenId": 1}, {"tokenId": 2}], [{"tokenId": 3}]]
+    calls = async_dimo_mock.identity.query.call_args_list
+    assert [call.args[1] for call in calls] == [{"after": None}, {"after": "c1"}]
+    assert 'privileged: "0xabc"' in calls[0].args[0]
+    assert "pageInfo" in calls[0].args[0]
+
+
+async def test_dimo_client_async_rewards_are_cached():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    earnings = {"earnings": {"totalTokens": 42}}
+    async_dimo_mock.identity.query.side_effect = [
+        {"data": {"v1": None}, "errors": [{"message": "boom"}]},
+        {"data": {"v1": earnings}},
+    ]
+
+    # Errors are not cached, so the next poll asks again
+    assert await dimo_client.async_get_rewards_for_vehicle(1) == {
+        "data": {"vehicle": None},
+        "errors": [{"message": "boom"}],
+    }
+    expected = {"data": {"vehicle": earnings}}
+    assert await dimo_client.async_get_rewards_for_vehicle(1) == expected
+    assert await dimo_client.async_get_rewards_for_vehicle(1) == expected
+    assert async_dimo_mock.identity.query.await_count == 2
+
+    dimo_client.rewards_cache.ttl = timedelta(0)
+    async_dimo_mock.identity.query.side_effect = None
+    async_dimo_mock.identity.query.return_value = {"data": {"v1": earnings}}
+    await dimo_client.async_get_rewards_for_vehicle(1)
+    assert async_dimo_mock.identity.query.await_count == 3
+
+
+def _aliased_rewards_query(limit=None):
+    """Return a fake identity query answering every aliased vehicle."""
+
+    async def query(query_str):
+        token_ids = re.findall(r"v(\d+): vehicle\(tokenId: \d+\)", query_str)
+        if limit is not None and len(token_ids) > limit:
+            return {"errors": [{"extensions": {"code": "COMPLEXITY_LIMIT_EXCEEDED"}}]}
+        return {
+            "data": {
+                f"v{token_id}": {"earnings": {"totalTokens": int(token_id)}}
+                for token_id in token_ids
+            }
+        }
+
+    return query
+
+
+async def test_dimo_client_async_rewards_for_vehicles_are_batched():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.identity.query.side_effect = _aliased_rewards_query()
+    token_ids = list(range(1, 121))
+
+    result = await dimo_client.async_get_rewards_for_vehicles(token_ids)
+
+    # 120 vehicles fit in three aliased queries
+    assert async_dimo_mock.identity.query.await_count == 3
+    assert result[77] == {"data": {"vehicle": {"earnings": {"totalTokens": 77}}}}
+    assert sorted(result) == token_ids
+
+    # Served from the cache on the next poll
+    await dimo_client.async_get_rewards_for_vehicles(token_ids)
+    assert async_dimo_mock.identity.query.await_count == 3
+
+
+async def test_dimo_client_async_rewards_split_on_complexity_error():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.identity.query.side_effect = _aliased_rewards_query(limit=10)
+
+    result = await dimo_client.async_get_rewards_for_vehicles(list(range(1, 41)))
+
+    assert len(result) == 40
+    assert all(
+        response["data"]["vehicle"]["earnings"]["totalTokens"] == token_id
+        for token_id, response in result.items()
+    )
+    # 40 -> 2x20 -> 4x10
+    assert async_dimo_mock.identity.query.await_count == 7
+
+
+async def test_dimo_client_async_rewards_attribute_errors_by_alias():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    error = {"message": "vehicle not found", "path": ["v2"]}
+    async_dimo_mock.identity.query.return_value = {
+        "data": {"v1": {"earnings": {"totalTokens": 1}}, "v2": None},
+        "errors": [error],
+    }
+
+    result = await dimo_client.async_get_rewards_for_vehicles([1, 2])
+
+    assert "errors" not in result[1]
+    assert result[2] == {"data": {"vehicle": None}, "errors": [error]}
+    assert 1 in dimo_client.rewards_cache
+    assert 2 not in dimo_client.rewards_cache
+
+
+async def test_dimo_client_async_get_cached_reuses_results():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.identity.count_dimo_vehicles = AsyncMock(
+        side_effect=[
+            dimo_sdk.request.HTTPError(status=500, message="boom"),
+            {"data": {"vehicles": {"totalCount": 1000}}},
+            {"data": {"vehicles": {"totalCount": 1001}}},
+        ]
+    )
+    method = dimo_client.async_get_total_dimo_vehicles
+
+    # Failures come back as None and are retried on the next call
+    assert await dimo_client.async_get_cached(method, timedelta(hours=1)) is None
+    assert await dimo_client.async_get_cached(method, timedelta(hours=1)) == 1000
+    assert await dimo_client.async_get_cached(method, timedelta(hours=1)) == 1000
+    assert async_dimo_mock.identity.count_dimo_vehicles.await_count == 2
+
+    assert await dimo_client.async_get_cached(method, timedelta(0)) == 1001
+
+
+async def test_dimo_client_async_get_cached_dispatches_through_call():
+    dimo_client, _, _ = _async_client(create_mock_token(3600))
+    calls = []
+
+    def get_value():
+        return 1000
+
+    async def call(method, *args):
+        calls.append(method)
+        return method(*args)
+
+    assert await dimo_client.async_get_cached(get_value, timedelta(hours=1), call=call) == 1000
+    assert await dimo_client.async_get_cached(get_value, timedelta(hours=1), call=call) == 1000
+    assert calls == [get_value]
+
+
+async def test_dimo_client_subset_query_keeps_learned_plan():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.telemetry.query.side_effect = (
+        lambda query, vehicle_jwt: {"data": {"signalsLatest": {}}}
+    )
+    learned = ChunkPlan([[f"signal{i}" for i in range(10)]])
+    dimo_client.chunk_plans["4242"] = learned
+
+    await dimo_client.async_get_latest_signals_batched(
+        "4242", [f"signal{i}" for i in range(3)]
+    )
+
+    assert dimo_client.chunk_plans["4242"] is learned
+    assert not dimo_client.chunk_plans_changed
+
+
+async def test_dimo_client_subset_polls_reuse_learned_plan_chunks():
+    dimo_client, _, async_dimo_mock = _async_client(create_mock_token(3600))
+    async_dimo_mock.telemetry.query.side_effect = _complexity_limited_query(8)
+    signal_names = [f"signal{i}" for i in range(30)]
+    subset = signal_names[::2]
+
+    await dimo_client.async_get_latest_signals_batched("4242", signal_names)
+    learned = dimo_client.chunk_plans["4242"]
+    # 30 -> 15 / 15 -> 8 / 7, the only complexity split
+    assert async_dimo_mock.telemetry.query.await_count == 7
+
+    for names, requests in [(subset, 4), (signal_names, 4), (subset, 4)]:
+        async_dimo_mock.telemetry.query.reset_mock()
+        result = await dimo_client.async_get_latest_signals_batched("4242", names)
+
+        assert set(result["data"]["signalsLatest"]) == set(names)
+        assert async_dimo_mock.telemetry.query.await_count == requests
+        assert dimo_client.chunk_plans["4242"] is learned
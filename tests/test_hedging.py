@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from custom_components.dimo.dimoapi.hedging import (MIN_LATENCY_SAMPLES,
+                                                    RequestHedger)
+from custom_components.dimo.dimoapi.rate_limiter import RateLimiter
+
+
+def _learned_hedger(budget=1.0, latency=0.01):
+    hedger = RequestHedger(budget=budget)
+    hedger.latencies.extend([latency] * MIN_LATENCY_SAMPLES)
+    hedger.requests = MIN_LATENCY_SAMPLES
+    return hedger
+
+
+async def test_no_hedge_before_latencies_are_learned():
+    hedger = RequestHedger(budget=1.0)
+    calls = 0
+
+    async def request():
+        nonlocal calls
+        calls += 1
+        return "ok"
+
+    assert await hedger.run(request) == "ok"
+    assert calls == 1
+    assert hedger.hedge_delay is None
+    assert len(hedger.latencies) == 1
+
+
+async def test_slow_request_is_hedged_and_loser_cancelled():
+    hedger = _learned_hedger()
+    delays = [10, 0]
+    cancelled = []
+
+    async def request():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert await hedger.run(request) == 0
+    await asyncio.sleep(0)
+    assert cancelled == [10]
+    assert hedger.stats()["hedges"] == 1
+    assert hedger.stats()["hedge_wins"] == 1
+    # The cancelled request is recorded with the time it ran for, at least
+    # the hedge delay
+    assert len(hedger.latencies) == MIN_LATENCY_SAMPLES + 2
+    assert hedger.latencies[-1] >= 0.01
+
+
+async def test_no_hedge_while_throttled():
+    hedger = _learned_hedger()
+    hedger.rate_limiter = RateLimiter()
+    hedger.rate_limiter.throttle(60)
+    calls = 0
+
+    async def request():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.03)
+        return "ok"
+
+    assert await hedger.run(request) == "ok"
+    assert calls == 1
+    assert hedger.hedges == 0
+
+
+async def test_hedge_falls_back_when_first_answer_fails():
+    hedger = _learned_hedger()
+    outcomes = [("slow", 0.05), ("fail", 0)]
+
+    async def request():
+        result, delay = outcomes.pop(0)
+        await asyncio.sleep(delay)
+        if result == "fail":
+            raise RuntimeError("boom")
+        return result
+
+    assert await hedger.run(request) == "slow"
+    assert hedger.hedge_wins == 0
+
+
+async def test_hedges_stay_within_budget():
+    hedger = _learned_hedger(budget=0.05)
+    calls = 0
+
+    async def request():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.03)
+        return "ok"
+
+    # 21 requests allow a single hedge at 5%
+    for _ in range(2):
+        assert await hedger.run(request) == "ok"
+
+    assert hedger.hedges == 1
+    assert calls == 3
+
+
+async def test_errors_propagate_when_every_request_fails():
+    hedger = _learned_hedger()
+
+    async def request():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await hedger.run(request)
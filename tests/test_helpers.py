@@ -1,4 +1,4 @@
-from custom_components.dimo.helpers import get_key
+from custom_components.dimo.helpers import get_changed_keys, get_key
 
 
 def test_simple_key():
@@ -47,3 +47,12 @@ def test_invalid_list_index_type():
 def test_empty_path():
     assert get_key("", {"a": 1}) is None
     assert get_key("", {"a": 1}, default="default") == "default"
+
+
+def test_get_changed_keys():
+    previous = {"speed": {"timestamp": "t1", "value": 10}, "gone": 1, "same": 2}
+    current = {"speed": {"timestamp": "t2", "value": 10}, "new": 3, "same": 2}
+
+    assert get_changed_keys(previous, current) == {"speed", "gone", "new"}
+    assert get_changed_keys(None, {"a": 1}) == {"a"}
+    assert get_changed_keys(current, current) == set()
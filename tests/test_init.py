@@ -1,6 +1,6 @@
-
+from datetime import datetime
 import logging
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import dimo as dimo_sdk
 import pytest
@@ -9,8 +9,11 @@ from homeassistant.exceptions import ConfigEntryNotReady
 
 from custom_components.dimo import (DOMAIN, PLATFORMS,
                                     async_remove_config_entry_device,
-                                    async_setup_entry, async_unload_entry)
-from custom_components.dimo.__init__ import DimoUpdateCoordinator, VehicleData
+                                    async_remove_entry, async_setup_entry,
+                                    async_unload_entry)
+from custom_components.dimo.__init__ import (DimoUpdateCoordinator,
+                                             DimoVehicleCoordinator,
+                                             VehicleData)
 from custom_components.dimo.config_flow import InvalidAuth, NoVehiclesException
 from custom_components.dimo.dimoapi import (InvalidApiKeyFormat,
                                             InvalidClientIdError,
@@ -26,6 +29,22 @@ def hass() -> HomeAssistant:
     return hass_mock
 
 
+@pytest.fixture(autouse=True)
+def mock_clientsession():
+    """Avoid creating a real aiohttp session on the dummy hass instance."""
+    with patch("custom_components.dimo.create_client_session") as mock_session:
+        mock_session.return_value.close = AsyncMock()
+        yield mock_session
+
+
+@pytest.fixture(autouse=True)
+def mock_token_store():
+    """Avoid creating a real Store on the dummy hass instance."""
+    with patch("custom_components.dimo.EncryptedTokenStore") as mock_store_class:
+        mock_store_class.return_value.async_load = AsyncMock(return_value=None)
+        yield mock_store_class
+
+
 @pytest.fixture
 def entry():
     """Return a dummy config entry."""
@@ -73,7 +92,7 @@ async def test_get_vehicle_vin_success(coordinator):
         await coordinator._get_vehicle_vin(vehicle_token_id)
         # Verify that get_api_data was called with the client's get_vin and vehicle_token_id.
         mock_get_api_data.assert_called_once_with(
-            coordinator.client.get_vin, vehicle_token_id
+            coordinator.client.async_get_vin, vehicle_token_id
         )
         # Check that the VIN is stored on the vehicle data.
         assert coordinator.vehicle_data[vehicle_token_id].vin == expected_vin
@@ -175,11 +194,12 @@ async def test_update_listener_registered_on_setup():
     
     # Track the update listener
     update_listener = None
+    remove_update_listener = MagicMock()
     
     def mock_add_update_listener(listener):
         nonlocal update_listener
         update_listener = listener
-        return MagicMock()  # Return a mock unload function
+        return remove_update_listener
     
     entry.add_update_listener = mock_add_update_listener
     entry.async_on_unload = MagicMock()
@@ -188,13 +208,7 @@ async def test_update_listener_registered_on_setup():
     with patch("custom_components.dimo.DimoClient") as mock_client_class:
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
-        mock_client.init = MagicMock()
-        
-        # Mock async_add_executor_job to simulate successful client init
-        async def mock_executor_job(func, *args):
-            return None
-        
-        hass.async_add_executor_job = mock_executor_job
+        mock_client.async_init = AsyncMock()
         
         # Mock the coordinator to avoid full initialization
         with patch("custom_components.dimo.DimoUpdateCoordinator") as mock_coordinator_class:
@@ -210,9 +224,17 @@ async def test_update_listener_registered_on_setup():
             
             mock_coordinator.async_initialise = MagicMock(side_effect=mock_async_initialise)
             mock_coordinator.async_config_entry_first_refresh = MagicMock(side_effect=mock_async_refresh)
+            mock_coordinator.async_refresh_vehicles = AsyncMock()
+            mock_coordinator.async_refresh_vehicle_shard = AsyncMock()
+            mock_coordinator.async_refresh_rewards = AsyncMock()
+            mock_coordinator.rolling = True
             
             # Call async_setup_entry
             result = await async_setup_entry(hass, entry)
+
+            # Rolling ticks refresh the vehicles instead of one burst at setup
+            mock_coordinator.async_refresh_vehicles.assert_not_awaited()
+            mock_coordinator.async_refresh_vehicle_shard.assert_awaited_once()
             
             # Verify setup succeeded
             assert result is True
@@ -221,7 +243,7 @@ async def test_update_listener_registered_on_setup():
             assert update_listener is not None
             
             # Verify async_on_unload was called
-            entry.async_on_unload.assert_called_once()
+            entry.async_on_unload.assert_any_call(remove_update_listener)
 
 
 @pytest.mark.asyncio
@@ -286,19 +308,44 @@ async def test_poll_interval_default_when_not_in_options():
     assert coordinator.update_interval.total_seconds() == DEFAULT_POLL_INTERVAL
 
 @pytest.mark.asyncio
-async def test_async_setup_entry_invalid_auth(hass, entry):
+async def test_async_setup_entry_invalid_auth(hass, entry, mock_clientsession):
     with patch("custom_components.dimo.DimoClient") as mock_client_class:
         mock_client = mock_client_class.return_value
-        # async_add_executor_job throws InvalidAuth
-        hass.async_add_executor_job.side_effect = InvalidAuth()
+        # async_init throws InvalidAuth
+        mock_client.async_init = AsyncMock(side_effect=InvalidAuth())
         result = await async_setup_entry(hass, entry)
         assert result is False
 
+    # A connection for each of 8 io slots times 4 chunks, plus headroom,
+    # kept open 10s past the poll interval
+    mock_clientsession.assert_called_once_with(
+        34, 40, ssl=ANY, connection_stats=ANY
+    )
+    mock_clientsession.return_value.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_uses_rate_limit_options(
+    hass, entry, mock_clientsession
+):
+    entry.options = {"rate_limit": 4.0, "rate_limit_burst": 6}
+    with patch("custom_components.dimo.DimoClient") as mock_client_class:
+        mock_client_class.return_value.async_init = AsyncMock(
+            side_effect=InvalidAuth()
+        )
+        await async_setup_entry(hass, entry)
+
+    rate_limiter = mock_client_class.call_args.args[0].rate_limiter
+    assert rate_limiter.max_rate == 4.0
+    assert rate_limiter.burst == 6
+
 
 @pytest.mark.asyncio
 async def test_async_setup_entry_no_vehicles(hass, entry):
     with patch("custom_components.dimo.DimoClient") as mock_client_class:
-        hass.async_add_executor_job.side_effect = NoVehiclesException()
+        mock_client_class.return_value.async_init = AsyncMock(
+            side_effect=NoVehiclesException()
+        )
         with pytest.raises(ConfigEntryNotReady):
             await async_setup_entry(hass, entry)
 
@@ -306,7 +353,9 @@ async def test_async_setup_entry_no_vehicles(hass, entry):
 @pytest.mark.asyncio
 async def test_async_setup_entry_general_exception(hass, entry):
     with patch("custom_components.dimo.DimoClient") as mock_client_class:
-        hass.async_add_executor_job.side_effect = Exception("General error")
+        mock_client_class.return_value.async_init = AsyncMock(
+            side_effect=Exception("General error")
+        )
         with pytest.raises(ConfigEntryNotReady):
             await async_setup_entry(hass, entry)
 
@@ -317,6 +366,19 @@ async def test_async_remove_config_entry_device(hass, entry):
     assert result is True
 
 
+@pytest.mark.asyncio
+async def test_async_remove_entry_deletes_stores(hass, entry, mock_token_store):
+    mock_token_store.return_value.async_remove = AsyncMock()
+    with patch("custom_components.dimo.Store") as mock_store_class:
+        mock_store_class.return_value.async_remove = AsyncMock()
+        await async_remove_entry(hass, entry)
+
+    mock_token_store.assert_called_once_with(hass, "test_entry", "dummy_key")
+    mock_token_store.return_value.async_remove.assert_awaited_once()
+    assert mock_store_class.call_args.args[2] == "dimo.test_entry.chunk_plans"
+    mock_store_class.return_value.async_remove.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_async_unload_entry(hass, entry):
     hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
@@ -325,6 +387,29 @@ async def test_async_unload_entry(hass, entry):
     hass.config_entries.async_unload_platforms.assert_called_once_with(entry, PLATFORMS)
 
 
+@pytest.mark.asyncio
+async def test_get_api_data_bounded_by_max_concurrent_requests(hass, entry):
+    import asyncio
+
+    entry.options = {"max_concurrent_requests": 2}
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    in_flight = 0
+    max_in_flight = 0
+
+    async def api_call(*args):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {}
+
+    await asyncio.gather(*(coordinator.get_api_data(api_call) for _ in range(5)))
+
+    assert max_in_flight == 2
+    assert coordinator.io_limiter.stats()["calls"] == 5
+
+
 @pytest.mark.asyncio
 async def test_get_api_data_exceptions(hass, entry):
     coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
@@ -345,35 +430,196 @@ async def test_get_api_data_exceptions(hass, entry):
         hass.async_add_executor_job.side_effect = Exception("Some other error")
         await coordinator.get_api_data(MagicMock())
 
+def _vehicle_pages(*pages):
+    """Return a stand in for DimoClient.async_iter_vehicles_for_license."""
+
+    async def iter_pages(license_id=None):
+        for page in pages:
+            if isinstance(page, Exception):
+                raise page
+            yield page
+
+    return iter_pages
+
+
 @pytest.mark.asyncio
-async def test_get_vehicles_data(hass, entry):
-    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
-    # Return valid vehicle data
-    with patch.object(coordinator, "get_api_data", return_value={"data": {"vehicles": {"nodes": [{"tokenId": "v1", "definition": {"make": "Ford"}}]}}}):
-        await coordinator.get_vehicles_data()
-        assert "v1" in coordinator.vehicle_data
-        assert coordinator.vehicle_data["v1"].definition["make"] == "Ford"
+async def test_get_dimo_sensor_data_uses_refresh_interval(hass, entry):
+    from datetime import timedelta
+
+    from homeassistant.const import Platform
+
+    from custom_components.dimo.const import DimoSensorDef
+
+    client = MagicMock()
+    client.async_get_cached = AsyncMock(return_value=1000)
+    client.async_get_uncached = AsyncMock(return_value=5)
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+    sensors = {
+        "cached": DimoSensorDef(
+            "Cached",
+            Platform.SENSOR,
+            value_fn="async_get_cached_value",
+            refresh_interval=timedelta(hours=1),
+        ),
+        "uncached": DimoSensorDef(
+            "Uncached", Platform.SENSOR, value_fn="async_get_uncached"
+        ),
+    }
+
+    with patch("custom_components.dimo.__init__.DIMO_SENSORS", sensors):
+        await coordinator.get_dimo_sensor_data()
+
+    assert coordinator.dimo_data == {"cached": 1000, "uncached": 5}
+    client.async_get_cached.assert_awaited_once_with(
+        client.async_get_cached_value,
+        timedelta(hours=1),
+        call=coordinator._async_call,
+    )
+    client.async_get_uncached.assert_awaited_once_with()
+
+
+@pytest.mark.asyncio
+async def test_get_dimo_sensor_data_reads_local_sensors_without_io_slot(
+    hass, entry
+):
+    from homeassistant.const import Platform
+
+    from custom_components.dimo.const import DimoSensorDef
+
+    client = MagicMock()
+    client.is_rate_limited.return_value = True
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+    sensors = {
+        "throttled": DimoSensorDef(
+            "Throttled",
+            Platform.BINARY_SENSOR,
+            value_fn="is_rate_limited",
+            local=True,
+        ),
+    }
+
+    with (
+        patch("custom_components.dimo.__init__.DIMO_SENSORS", sensors),
+        patch.object(coordinator, "_async_call") as mock_call,
+    ):
+        await coordinator.get_dimo_sensor_data()
+
+    assert coordinator.dimo_data == {"throttled": True}
+    mock_call.assert_not_called()
+    assert coordinator.io_limiter.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_iter_vehicles_data(hass, entry):
+    client = MagicMock()
+    client.async_iter_vehicles_for_license = _vehicle_pages(
+        [{"tokenId": "v1", "definition": {"make": "Ford"}}],
+        [{"tokenId": "v2", "definition": {"make": "Kia"}}],
+    )
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+
+    pages = [page async for page in coordinator.async_iter_vehicles_data()]
+
+    assert pages == [["v1"], ["v2"]]
+    assert coordinator.vehicle_data["v1"].definition["make"] == "Ford"
+    assert coordinator.vehicle_data["v2"].definition["make"] == "Kia"
 
-    # Return None
-    with patch.object(coordinator, "get_api_data", return_value=None):
-        coordinator.vehicle_data = {}
-        await coordinator.get_vehicles_data()
-        assert not coordinator.vehicle_data
+
+@pytest.mark.asyncio
+async def test_iter_vehicles_data_raises_on_page_error(hass, entry):
+    client = MagicMock()
+    client.async_iter_vehicles_for_license = _vehicle_pages(
+        [{"tokenId": "v1", "definition": {}}],
+        dimo_sdk.request.HTTPError(status=500, message="boom"),
+    )
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+
+    pages = []
+    with pytest.raises(ConfigEntryNotReady):
+        async for page in coordinator.async_iter_vehicles_data():
+            pages.append(page)
+
+    assert pages == [["v1"]]
+
+
+@pytest.mark.asyncio
+async def test_async_initialise_cancels_setup_on_page_error(hass, entry):
+    import asyncio
+
+    client = MagicMock()
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def setup_vehicle(vehicle_token_id):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def pages(license_id=None):
+        yield [{"tokenId": "v1", "definition": {}}]
+        await started.wait()
+        raise dimo_sdk.request.HTTPError(status=500, message="boom")
+
+    client.async_iter_vehicles_for_license = pages
+
+    with patch.object(coordinator, "_async_load_chunk_plans", new_callable=AsyncMock), \
+            patch.object(coordinator, "create_dimo_device"), \
+            patch.object(coordinator, "get_dimo_sensor_data", new_callable=AsyncMock), \
+            patch.object(coordinator, "_async_setup_single_vehicle", side_effect=setup_vehicle):
+        with pytest.raises(ConfigEntryNotReady):
+            await coordinator.async_initialise()
+
+    assert cancelled.is_set()
 
 @pytest.mark.asyncio
 async def test_async_initialise(hass, entry):
-    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
-    coordinator.vehicle_data = {"v1": VehicleData(definition={"make": "Test"})}
-    
-    with patch.object(coordinator, "get_vehicles_data", new_callable=AsyncMock) as mock_get_veh:
+    client = MagicMock()
+    client.async_iter_vehicles_for_license = _vehicle_pages(
+        [{"tokenId": "v1", "definition": {"make": "Test"}}],
+        [{"tokenId": "v2", "definition": {"make": "Test"}}],
+    )
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+
+    with patch.object(coordinator, "_async_load_chunk_plans", new_callable=AsyncMock), \
+            patch("custom_components.dimo.__init__.async_track_time_interval") as mock_track:
         with patch.object(coordinator, "create_dimo_device") as mock_create_dimo:
             with patch.object(coordinator, "get_dimo_sensor_data", new_callable=AsyncMock) as mock_dimo_sens:
                 with patch.object(coordinator, "_async_setup_single_vehicle", new_callable=AsyncMock) as mock_setup_veh:
                     await coordinator.async_initialise()
-                    mock_get_veh.assert_called_once()
                     mock_create_dimo.assert_called_once()
                     mock_dimo_sens.assert_called_once()
-                    mock_setup_veh.assert_called_once_with("v1")
+                    assert [c.args for c in mock_setup_veh.call_args_list] == [("v1",), ("v2",)]
+                    tracked = [call.args[1] for call in mock_track.call_args_list]
+                    assert tracked == [
+                        coordinator.async_renew_tokens,
+                        coordinator.async_refresh_rewards,
+                    ]
+                    entry.async_on_unload.assert_any_call(mock_track.return_value)
+
+
+@pytest.mark.asyncio
+async def test_async_renew_tokens_logs_failures(hass, entry, caplog):
+    client = MagicMock()
+    client.auth.async_renew_privileged_tokens = AsyncMock(
+        return_value={"v1": ValueError("exchange failed")}
+    )
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+
+    with caplog.at_level(logging.DEBUG):
+        await coordinator.async_renew_tokens()
+    assert "Unable to renew token for vehicle v1" in caplog.text
+    # Renewals wait for io slots like every other api call
+    client.auth.async_renew_privileged_tokens.assert_awaited_once_with(
+        call=coordinator._async_call
+    )
+
+    client.auth.async_renew_privileged_tokens.side_effect = Exception("offline")
+    await coordinator.async_renew_tokens()
+    assert "Unable to renew vehicle tokens ahead of expiry" in caplog.text
 
 @pytest.mark.asyncio
 async def test_get_available_signals_for_vehicle(hass, entry):
@@ -397,12 +643,10 @@ async def test_get_signals_data_for_vehicle(hass, entry):
         "get_api_data",
         side_effect=[
             {"data": {"signalsLatest": {"speed": 100}}, "errors": None},
-            {"data": {"vehicle": {"earnings": {"totalTokens": 50}}}},
         ],
     ):
-        with patch.object(coordinator, "_process_token_rewards"):
-            await coordinator.get_signals_data_for_vehicle("v1")
-            assert coordinator.vehicle_data["v1"].signal_data == {"speed": 100}
+        await coordinator.get_signals_data_for_vehicle("v1")
+        assert coordinator.vehicle_data["v1"].signal_data == {"speed": 100}
 
     # Unknown vehicle
     await coordinator.get_signals_data_for_vehicle("v2")
@@ -424,3 +668,617 @@ async def test_async_update_data(hass, entry):
         with patch.object(coordinator, "get_signals_data_for_vehicle", new_callable=AsyncMock):
             res = await coordinator.async_update_data()
             assert res is True
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_rewards_applies_batched_rewards(hass, entry):
+    client = MagicMock()
+    client.async_get_rewards_for_vehicles = AsyncMock(
+        return_value={
+            "v1": {"data": {"vehicle": {"earnings": {"totalTokens": 50}}}},
+            "unknown": {"data": {"vehicle": {"earnings": {"totalTokens": 1}}}},
+        }
+    )
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+    coordinator.vehicle_data = {
+        "v1": VehicleData(definition={}, signal_data={"speed": 100}),
+        "v2": VehicleData(definition={}, signal_data={"speed": 10}),
+    }
+
+    await coordinator.async_refresh_rewards()
+
+    client.async_get_rewards_for_vehicles.assert_awaited_once_with(["v1", "v2"])
+    assert coordinator.vehicle_data["v1"].signal_data["tokenRewards"]["value"] == 50
+    assert "tokenRewards" not in coordinator.vehicle_data["v2"].signal_data
+    assert "unknown" not in coordinator.vehicle_data
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_rewards_survives_errors(hass, entry, caplog):
+    client = MagicMock()
+    client.async_get_rewards_for_vehicles = AsyncMock(side_effect=Exception("offline"))
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+
+    await coordinator.async_refresh_rewards()
+
+    assert "Unable to refresh token rewards" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_async_update_data_saves_learned_chunk_plans(hass, entry):
+    client = MagicMock()
+    client.chunk_plans_changed = True
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+    coordinator._chunk_plan_store = MagicMock()
+
+    with patch.object(coordinator, "get_dimo_sensor_data", new_callable=AsyncMock):
+        await coordinator.async_update_data()
+
+    coordinator._chunk_plan_store.async_delay_save.assert_called_once()
+    assert client.chunk_plans_changed is False
+
+    # Nothing new learned, nothing saved
+    with patch.object(coordinator, "get_dimo_sensor_data", new_callable=AsyncMock):
+        await coordinator.async_update_data()
+    coordinator._chunk_plan_store.async_delay_save.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_restores_stored_tokens(hass, entry, mock_token_store):
+    stored = {"access_token": "jwt", "privileged_tokens": []}
+    mock_token_store.return_value.async_load.return_value = stored
+
+    with patch("custom_components.dimo.Auth") as mock_auth_class, \
+            patch("custom_components.dimo.DimoClient") as mock_client_class:
+        mock_client_class.return_value.async_init = AsyncMock(
+            side_effect=InvalidAuth()
+        )
+        await async_setup_entry(hass, entry)
+
+    mock_token_store.assert_called_once_with(hass, entry.entry_id, "dummy_key")
+    mock_auth_class.return_value.import_tokens.assert_called_once_with(stored)
+
+
+@pytest.mark.asyncio
+async def test_async_update_data_saves_refreshed_tokens(hass, entry):
+    client = MagicMock()
+    client.chunk_plans_changed = False
+    client.auth.tokens_changed = True
+    token_store = MagicMock()
+    coordinator = DimoUpdateCoordinator(hass, entry, client, token_store)
+
+    with patch.object(coordinator, "get_dimo_sensor_data", new_callable=AsyncMock):
+        await coordinator.async_update_data()
+        await coordinator.async_update_data()
+
+    token_store.async_delay_save.assert_called_once()
+    assert token_store.async_delay_save.call_args.args[0] == client.auth.export_tokens
+    assert client.auth.tokens_changed is False
+
+
+@pytest.mark.asyncio
+async def test_async_shutdown_persists_tokens(hass, entry):
+    client = MagicMock()
+    client.auth.export_tokens.return_value = {"access_token": "jwt"}
+    token_store = MagicMock()
+    token_store.async_save = AsyncMock()
+    coordinator = DimoUpdateCoordinator(hass, entry, client, token_store)
+
+    await coordinator.async_shutdown()
+
+    token_store.async_save.assert_awaited_once_with({"access_token": "jwt"})
+
+
+@pytest.mark.asyncio
+async def test_setup_single_vehicle_creates_vehicle_coordinator(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {"v1": VehicleData(definition={})}
+
+    with patch.object(coordinator, "get_available_signals_for_vehicle", new_callable=AsyncMock), \
+            patch.object(coordinator, "_get_vehicle_vin", new_callable=AsyncMock), \
+            patch.object(coordinator, "create_vehicle_device"):
+        await coordinator._async_setup_single_vehicle("v1")
+
+    vehicle_coordinator = coordinator.vehicle_coordinators["v1"]
+    assert isinstance(vehicle_coordinator, DimoVehicleCoordinator)
+    assert vehicle_coordinator.vehicle_data is coordinator.vehicle_data
+    assert vehicle_coordinator.update_interval == coordinator.update_interval
+
+
+@pytest.mark.asyncio
+async def test_vehicle_coordinator_updates_only_its_vehicle(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        "v1": VehicleData(definition={}, available_signals=["speed"]),
+        "v2": VehicleData(definition={}, available_signals=["speed"]),
+    }
+    coordinator.rewards_data = {
+        "v1": {"data": {"vehicle": {"earnings": {"totalTokens": 50}}}}
+    }
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+
+    with patch.object(
+        coordinator,
+        "get_api_data",
+        return_value={"data": {"signalsLatest": {"speed": {"value": 100}}}},
+    ) as mock_get_api_data:
+        assert await vehicle_coordinator.async_update_data() is True
+
+    assert mock_get_api_data.call_args.args[1] == "v1"
+    assert coordinator.vehicle_data["v1"].signal_data["speed"] == {"value": 100}
+    # Rewards fetched by the account coordinator are carried over
+    assert coordinator.vehicle_data["v1"].signal_data["tokenRewards"]["value"] == 50
+    assert coordinator.vehicle_data["v2"].signal_data is None
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_vehicles_refreshes_each_vehicle(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_coordinators = {
+        "v1": MagicMock(async_refresh=AsyncMock(), last_polled=None),
+        "v2": MagicMock(async_refresh=AsyncMock(), last_polled=None),
+        "v3": MagicMock(async_refresh=AsyncMock(), last_polled=datetime.now()),
+    }
+
+    await coordinator.async_refresh_vehicles()
+
+    coordinator.vehicle_coordinators["v1"].async_refresh.assert_awaited_once()
+    coordinator.vehicle_coordinators["v2"].async_refresh.assert_awaited_once()
+    # Already polled by the first rolling tick
+    coordinator.vehicle_coordinators["v3"].async_refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_vehicle_coordinator_reports_changed_signal_keys(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        "v1": VehicleData(definition={}, available_signals=["speed", "odometer"])
+    }
+    coordinator.rewards_data = {
+        "v1": {"data": {"vehicle": {"earnings": {"totalTokens": 50}}}}
+    }
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+    responses = [
+        {"speed": {"timestamp": "t1", "value": 0}, "odometer": {"timestamp": "t1", "value": 5}},
+        {"speed": {"timestamp": "t1", "value": 0}, "odometer": {"timestamp": "t2", "value": 6}},
+        {"speed": {"timestamp": "t1", "value": 0}, "odometer": {"timestamp": "t2", "value": 6}},
+    ]
+
+    changed = []
+    for signals in responses:
+        with patch.object(
+            coordinator,
+            "get_api_data",
+            return_value={"data": {"signalsLatest": signals}},
+        ):
+            await vehicle_coordinator.async_update_data()
+        changed.append(vehicle_coordinator.changed_keys)
+
+    assert changed == [{"speed", "odometer", "tokenRewards"}, {"odometer"}, set()]
+
+
+@pytest.mark.asyncio
+async def test_rewards_refresh_publishes_changed_rewards(hass, entry):
+    client = MagicMock()
+    client.async_get_rewards_for_vehicles = AsyncMock(
+        return_value={"v1": {"data": {"vehicle": {"earnings": {"totalTokens": 60}}}}}
+    )
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+    coordinator.vehicle_data = {
+        "v1": VehicleData(definition={}, signal_data={"speed": {"value": 0}})
+    }
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+    coordinator.vehicle_coordinators = {"v1": vehicle_coordinator}
+    vehicle_coordinator._published_signal_data = {"speed": {"value": 0}}
+
+    with patch.object(vehicle_coordinator, "async_update_listeners") as mock_notify:
+        await coordinator.async_refresh_rewards()
+        # Unchanged rewards are not published again
+        await coordinator.async_refresh_rewards()
+
+    mock_notify.assert_called_once()
+    assert vehicle_coordinator.changed_keys == {"tokenRewards"}
+
+
+@pytest.mark.asyncio
+async def test_vehicle_coordinator_notifies_all_after_failed_update(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        "v1": VehicleData(definition={}, available_signals=["speed"])
+    }
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+    signals = {"data": {"signalsLatest": {"speed": {"timestamp": "t1", "value": 0}}}}
+
+    with patch.object(coordinator, "get_api_data", return_value=signals):
+        await vehicle_coordinator.async_update_data()
+    with patch.object(coordinator, "get_api_data", side_effect=Exception("boom")):
+        with pytest.raises(Exception):
+            await vehicle_coordinator.async_update_data()
+    assert vehicle_coordinator.changed_keys is None
+
+    with patch.object(coordinator, "get_api_data", return_value=signals):
+        await vehicle_coordinator.async_update_data()
+    # Same data as before the failure, but entities were written as unavailable
+    assert vehicle_coordinator.changed_keys == {"speed"}
+
+
+def test_token_rewards_timestamp_kept_while_unchanged(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {"v1": VehicleData(definition={}, signal_data={})}
+    rewards_data = {"data": {"vehicle": {"earnings": {"totalTokens": 50}}}}
+
+    with patch.object(coordinator, "_get_current_timestamp", side_effect=["t1", "t2"]):
+        coordinator._process_token_rewards("v1", rewards_data)
+        coordinator.vehicle_data["v1"].signal_data = {}
+        coordinator._process_token_rewards("v1", rewards_data)
+        assert coordinator.vehicle_data["v1"].signal_data["tokenRewards"]["timestamp"] == "t1"
+
+        rewards_data["data"]["vehicle"]["earnings"]["totalTokens"] = 60
+        coordinator._process_token_rewards("v1", rewards_data)
+        assert coordinator.vehicle_data["v1"].signal_data["tokenRewards"] == {
+            "timestamp": "t2",
+            "value": 60,
+        }
+
+
+@pytest.mark.asyncio
+async def test_vehicle_coordinator_adapts_update_interval(hass, entry):
+    from datetime import timedelta
+
+    entry.options = {
+        "min_poll_interval": 20,
+        "max_poll_interval": 600,
+        "poll_scheduling": "burst",
+    }
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {"v1": VehicleData(definition={}, available_signals=["speed"])}
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+    assert vehicle_coordinator.update_interval == timedelta(seconds=20)
+
+    async def update(signals):
+        with patch.object(
+            coordinator, "get_api_data", return_value={"data": {"signalsLatest": signals}}
+        ):
+            await vehicle_coordinator.async_update_data()
+        return vehicle_coordinator.update_interval.total_seconds()
+
+    parked = {"isIgnitionOn": {"value": 0}, "speed": {"value": 0}}
+    assert [await update(parked) for _ in range(3)] == [40, 80, 160]
+
+    driving = {"isIgnitionOn": {"value": 1}, "speed": {"value": 70}}
+    assert await update(driving) == 20
+
+
+def test_vehicle_coordinator_min_interval_defaults_to_poll_interval(hass, entry):
+    from datetime import timedelta
+
+    entry.options = {"poll_interval": 300, "poll_scheduling": "burst"}
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+
+    assert vehicle_coordinator.min_interval == timedelta(seconds=300)
+    assert vehicle_coordinator.update_interval == timedelta(seconds=300)
+
+
+@pytest.mark.asyncio
+async def test_vehicle_coordinator_jitters_staggered_interval(hass, entry):
+    from datetime import timedelta
+
+    entry.options = {"min_poll_interval": 100, "max_poll_interval": 100}
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {"v1": VehicleData(definition={}, available_signals=["speed"])}
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+
+    intervals = set()
+    for _ in range(5):
+        with patch.object(
+            coordinator,
+            "get_api_data",
+            return_value={"data": {"signalsLatest": {"speed": {"value": 0}}}},
+        ):
+            await vehicle_coordinator.async_update_data()
+        assert vehicle_coordinator.base_interval == timedelta(seconds=100)
+        assert 90 <= vehicle_coordinator.update_interval.total_seconds() <= 110
+        intervals.add(vehicle_coordinator.update_interval)
+
+    assert len(intervals) > 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("scheduling", "staggered"), [("staggered", True), ("burst", False)]
+)
+async def test_refresh_vehicles_staggers_next_polls(hass, entry, scheduling, staggered):
+    entry.options = {"min_poll_interval": 60, "poll_scheduling": scheduling}
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    vehicle_coordinators = [
+        MagicMock(async_refresh=AsyncMock(), last_polled=None) for _ in range(3)
+    ]
+    coordinator.vehicle_coordinators = {
+        f"v{index}": vehicle_coordinator
+        for index, vehicle_coordinator in enumerate(vehicle_coordinators)
+    }
+
+    await coordinator.async_refresh_vehicles()
+
+    for index, vehicle_coordinator in enumerate(vehicle_coordinators):
+        vehicle_coordinator.async_refresh.assert_awaited_once()
+        if staggered:
+            offset = vehicle_coordinator.delay_next_refresh.call_args.args[0]
+            assert 20 * index <= offset.total_seconds() <= 20 * (index + 1)
+        else:
+            vehicle_coordinator.delay_next_refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_rolling_ticks_do_not_depend_on_account_listeners(hass, entry):
+    entry.options = {"poll_scheduling": "rolling"}
+    client = MagicMock()
+    client.async_iter_vehicles_for_license = _vehicle_pages([])
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+
+    with patch.object(coordinator, "_async_load_chunk_plans", new_callable=AsyncMock), \
+            patch.object(coordinator, "create_dimo_device"), \
+            patch.object(coordinator, "get_dimo_sensor_data", new_callable=AsyncMock), \
+            patch("custom_components.dimo.__init__.async_track_time_interval") as mock_track:
+        await coordinator.async_initialise()
+
+    # Ticks and rewards run on their own timers, not through account updates
+    # that stop once the DIMO sensors are disabled
+    tracked = [call.args[1] for call in mock_track.call_args_list]
+    assert coordinator.async_refresh_vehicle_shard in tracked
+    assert coordinator.async_refresh_rewards in tracked
+    with patch.object(coordinator, "async_refresh_vehicle_shard", AsyncMock()) as shard, \
+            patch.object(coordinator, "async_refresh_rewards", AsyncMock()) as rewards:
+        await coordinator.async_update_data()
+    shard.assert_not_awaited()
+    rewards.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_rolling_tick_skipped_while_previous_shard_refreshes(hass, entry):
+    import asyncio
+
+    entry.options = {"poll_scheduling": "rolling"}
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    release = asyncio.Event()
+
+    async def refresh():
+        await release.wait()
+
+    vehicle_coordinator = MagicMock(async_refresh=AsyncMock(side_effect=refresh))
+    coordinator.vehicle_coordinators = {"v1": vehicle_coordinator}
+
+    with patch(
+        "custom_components.dimo.__init__.select_vehicle_shard", return_value=["v1"]
+    ):
+        tick = asyncio.create_task(coordinator.async_refresh_vehicle_shard())
+        await asyncio.sleep(0)
+        await coordinator.async_refresh_vehicle_shard()
+        release.set()
+        await tick
+
+    vehicle_coordinator.async_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_rolling_tick_refreshes_vehicle_shard(hass, entry):
+    entry.options = {"poll_scheduling": "rolling", "vehicles_per_tick": 2}
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        token_id: VehicleData(definition={}, available_signals=["speed"])
+        for token_id in ("v1", "v2", "v3")
+    }
+    for token_id in coordinator.vehicle_data:
+        coordinator.vehicle_coordinators[token_id] = DimoVehicleCoordinator(
+            hass, entry, coordinator, token_id
+        )
+    assert all(
+        vehicle_coordinator.update_interval is None
+        for vehicle_coordinator in coordinator.vehicle_coordinators.values()
+    )
+
+    with (
+        patch.object(coordinator, "get_api_data", return_value=None),
+        patch.object(coordinator, "get_dimo_sensor_data", AsyncMock()),
+        patch.object(coordinator, "_async_save_chunk_plans"),
+        patch.object(coordinator, "_async_save_tokens"),
+    ):
+        await coordinator.async_refresh_vehicle_shard()
+        polled = {
+            token_id
+            for token_id, vehicle_coordinator in coordinator.vehicle_coordinators.items()
+            if vehicle_coordinator.last_polled
+        }
+        assert len(polled) == 2
+
+        await coordinator.async_refresh_vehicle_shard()
+
+    # The vehicle left out of the first shard is refreshed next, while the
+    # others are not due yet
+    remaining = set(coordinator.vehicle_data) - polled
+    assert all(
+        coordinator.vehicle_coordinators[token_id].last_polled for token_id in remaining
+    )
+    assert all(
+        vehicle_coordinator.update_interval is None
+        for vehicle_coordinator in coordinator.vehicle_coordinators.values()
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_signals_data_skips_vehicle_with_open_breaker(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        "v1": VehicleData(definition={}, available_signals=["speed"])
+    }
+
+    with patch.object(coordinator, "get_api_data", return_value=None) as mock_get_api_data:
+        for _ in range(5):
+            assert not await coordinator.get_signals_data_for_vehicle("v1")
+
+    # The breaker opened after three failures, so later polls skip the api
+    assert mock_get_api_data.call_count == 3
+    assert coordinator.breakers["v1"].state == "open"
+
+
+@pytest.mark.asyncio
+async def test_vehicle_coordinator_retries_failed_chunks(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        "v1": VehicleData(
+            definition={},
+            available_signals=["speed", "odometer"],
+            signal_data={"odometer": {"value": 5}},
+        )
+    }
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+    responses = [
+        {
+            "data": {"signalsLatest": {"speed": {"value": 2}}},
+            "failed_chunks": [{"signals": ["odometer"], "error": "bad gateway"}],
+        },
+        {"data": {"signalsLatest": {"odometer": {"value": 6}}}},
+    ]
+
+    with patch.object(
+        coordinator, "get_api_data", side_effect=responses
+    ) as mock_get_api_data:
+        await vehicle_coordinator.async_update_data()
+
+    # Only the failed signals were asked for again
+    assert mock_get_api_data.call_args_list[1].args[2] == ["odometer"]
+    vehicle = coordinator.vehicle_data["v1"]
+    assert vehicle.signal_data == {"speed": {"value": 2}, "odometer": {"value": 6}}
+    assert vehicle.failed_signals == []
+
+
+@pytest.mark.asyncio
+async def test_get_signals_data_keeps_values_of_failed_chunks(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        "v1": VehicleData(
+            definition={},
+            available_signals=["speed", "odometer"],
+            signal_data={"speed": {"value": 1}, "odometer": {"value": 5}},
+        )
+    }
+
+    with patch.object(
+        coordinator,
+        "get_api_data",
+        return_value={
+            "data": {"signalsLatest": {"speed": {"value": 2}}},
+            "failed_chunks": [{"signals": ["odometer"], "error": "bad gateway"}],
+        },
+    ):
+        assert await coordinator.get_signals_data_for_vehicle("v1")
+
+    vehicle = coordinator.vehicle_data["v1"]
+    assert vehicle.signal_data == {"speed": {"value": 2}, "odometer": {"value": 5}}
+    assert vehicle.failed_signals == ["odometer"]
+
+
+@pytest.mark.asyncio
+async def test_vehicle_coordinator_cancels_update_after_deadline(hass, entry):
+    import asyncio
+
+    from homeassistant.helpers.update_coordinator import UpdateFailed
+
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {"v1": VehicleData(definition={}, available_signals=["speed"])}
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    with (
+        patch("custom_components.dimo.__init__.POLL_CYCLE_TIMEOUT", 0.01),
+        patch.object(coordinator, "get_api_data", side_effect=hang),
+        pytest.raises(UpdateFailed),
+    ):
+        await vehicle_coordinator.async_update_data()
+
+    assert vehicle_coordinator.cycle_timeouts == 1
+    assert coordinator.breakers["v1"].failures == 1
+
+
+@pytest.mark.asyncio
+async def test_vehicle_deadline_starts_after_io_slot_is_acquired(hass, entry):
+    import asyncio
+
+    entry.options = {"max_concurrent_requests": 1}
+    client = MagicMock()
+    release = asyncio.Event()
+
+    async def get_signals(token_id, signal_names):
+        await release.wait()
+        return {"data": {"signalsLatest": {}}}
+
+    client.async_get_latest_signals_batched = get_signals
+    coordinator = DimoUpdateCoordinator(hass, entry, client)
+    coordinator.vehicle_data = {
+        token_id: VehicleData(definition={}, available_signals=["speed"])
+        for token_id in ("v1", "v2")
+    }
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v2")
+
+    # v1 holds the only slot for longer than v2's deadline
+    v1_poll = asyncio.create_task(coordinator.get_signals_data_for_vehicle("v1"))
+    await asyncio.sleep(0)
+    with patch("custom_components.dimo.__init__.POLL_CYCLE_TIMEOUT", 0.01):
+        v2_update = asyncio.create_task(vehicle_coordinator.async_update_data())
+        await asyncio.sleep(0.05)
+        assert not v2_update.done()
+        release.set()
+        assert await v1_poll
+        assert await v2_update
+
+    assert vehicle_coordinator.cycle_timeouts == 0
+    assert coordinator.breakers["v2"].failures == 0
+
+
+@pytest.mark.asyncio
+async def test_get_signals_data_for_subset_keeps_other_signals(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        "v1": VehicleData(
+            definition={},
+            available_signals=["speed", "odometer"],
+            signal_data={"speed": {"value": 1}, "odometer": {"value": 5}},
+        )
+    }
+
+    with patch.object(
+        coordinator,
+        "get_api_data",
+        return_value={"data": {"signalsLatest": {"speed": {"value": 2}}}},
+    ) as mock_get_api_data:
+        await coordinator.get_signals_data_for_vehicle("v1", ["speed"])
+
+    assert mock_get_api_data.call_args.args[2] == ["speed"]
+    assert coordinator.vehicle_data["v1"].signal_data == {
+        "speed": {"value": 2},
+        "odometer": {"value": 5},
+    }
+
+
+@pytest.mark.asyncio
+async def test_vehicle_coordinator_skips_signals_not_due(hass, entry):
+    coordinator = DimoUpdateCoordinator(hass, entry, MagicMock())
+    coordinator.vehicle_data = {
+        "v1": VehicleData(definition={}, available_signals=["speed", "odometer"])
+    }
+    vehicle_coordinator = DimoVehicleCoordinator(hass, entry, coordinator, "v1")
+
+    with patch.object(
+        vehicle_coordinator.cadence, "due_signals", return_value=["speed"]
+    ), patch.object(
+        coordinator, "get_signals_data_for_vehicle", new_callable=AsyncMock
+    ) as mock_get_signals, patch.object(
+        vehicle_coordinator.cadence, "observe"
+    ) as mock_observe:
+        await vehicle_coordinator.async_update_data()
+
+    mock_get_signals.assert_awaited_once_with("v1", ["speed"], acquire_slot=False)
+    assert mock_observe.call_args.args[1] == ["speed"]
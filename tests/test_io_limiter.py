@@ -0,0 +1,44 @@
+import asyncio
+
+from custom_components.dimo.io_limiter import IOLimiter
+
+
+async def test_io_limiter_bounds_concurrency_and_records_queueing():
+    limiter = IOLimiter(2)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def call():
+        nonlocal in_flight, max_in_flight
+        async with limiter.slot():
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert max_in_flight == 2
+    stats = limiter.stats()
+    assert stats["calls"] == 6
+    # Two calls got a slot straight away, the other four queued
+    assert stats["max_queued"] == 4
+    assert stats["queued"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["max_wait"] > 0
+
+
+async def test_io_limiter_releases_slot_on_error():
+    limiter = IOLimiter(1)
+
+    for _ in range(2):
+        try:
+            async with limiter.slot():
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+    assert limiter.stats()["in_flight"] == 0
+    async with asyncio.timeout(1):
+        async with limiter.slot():
+            pass
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+
+from custom_components.dimo.polling import (VehiclePollState, distance_between,
+                                            is_vehicle_active, jitter_interval,
+                                            select_poll_interval,
+                                            select_vehicle_shard,
+                                            stagger_offsets)
+
+MIN = timedelta(seconds=30)
+MAX = timedelta(seconds=900)
+
+
+def _signals(**values):
+    return {key: {"timestamp": "t", "value": value} for key, value in values.items()}
+
+
+def _location(latitude, longitude):
+    return _signals(currentLocationLatitude=latitude, currentLocationLongitude=longitude)
+
+
+def test_distance_between():
+    # One thousandth of a degree of latitude is about 111 metres
+    assert round(distance_between((59.0, 10.0), (59.001, 10.0))) == 111
+    assert distance_between((59.0, 10.0), (59.0, 10.0)) == 0
+
+
+def test_is_vehicle_active():
+    assert is_vehicle_active(_signals(isIgnitionOn=1))
+    assert is_vehicle_active(_signals(isIgnitionOn=0, speed=50))
+    assert not is_vehicle_active(_signals(isIgnitionOn=0, speed=0))
+    assert not is_vehicle_active(None)
+
+    # Moved further than GPS jitter since the last poll
+    assert is_vehicle_active(_location(59.001, 10.0), _location(59.0, 10.0))
+    assert not is_vehicle_active(_location(59.0001, 10.0), _location(59.0, 10.0))
+
+
+def test_select_poll_interval_backs_off_while_parked():
+    parked = _signals(isIgnitionOn=0, speed=0)
+    interval = MIN
+    intervals = []
+    for _ in range(7):
+        interval = select_poll_interval(interval, parked, parked, MIN, MAX)
+        intervals.append(interval.total_seconds())
+
+    assert intervals == [60, 120, 240, 480, 900, 900, 900]
+
+
+def test_select_poll_interval_resets_when_driving():
+    driving = _signals(isIgnitionOn=1, speed=80)
+
+    assert select_poll_interval(MAX, driving, None, MIN, MAX) == MIN
+
+
+def test_select_poll_interval_with_inverted_bounds():
+    parked = _signals(isIgnitionOn=0)
+
+    assert select_poll_interval(MIN, parked, parked, MIN, timedelta(seconds=10)) == MIN
+
+
+def test_stagger_offsets_spread_over_interval():
+    offsets = stagger_offsets(4, timedelta(seconds=60))
+
+    assert len(offsets) == 4
+    for index, offset in enumerate(offsets):
+        assert timedelta(seconds=15 * index) <= offset <= timedelta(seconds=15 * (index + 1))
+    assert stagger_offsets(0, timedelta(seconds=60)) == []
+
+
+def test_jitter_interval_stays_within_fraction():
+    for _ in range(20):
+        jittered = jitter_interval(timedelta(seconds=100), 0.1)
+        assert timedelta(seconds=90) <= jittered <= timedelta(seconds=110)
+
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+STALENESS = timedelta(minutes=30)
+
+
+def _state(polled_ago, interval=MIN, active_ago=None):
+    return VehiclePollState(
+        last_polled=None if polled_ago is None else NOW - timedelta(seconds=polled_ago),
+        interval=interval,
+        last_active=None if active_ago is None else NOW - timedelta(seconds=active_ago),
+    )
+
+
+def test_select_vehicle_shard_bounds_size_and_round_robins():
+    vehicles = {f"v{index}": _state(100 + index) for index in range(5)}
+
+    # The least recently polled vehicles go first
+    assert select_vehicle_shard(vehicles, 2, NOW, STALENESS) == ["v4", "v3"]
+
+
+def test_select_vehicle_shard_priorities():
+    vehicles = {
+        "parked": _state(600),
+        "active": _state(60, active_ago=60),
+        "stale": _state(3600, interval=MAX * 4),
+        "new": _state(None),
+    }
+
+    assert select_vehicle_shard(vehicles, 4, NOW, STALENESS) == [
+        "new",
+        "stale",
+        "active",
+        "parked",
+    ]
+
+
+def test_select_vehicle_shard_skips_vehicles_not_due():
+    vehicles = {"recent": _state(10), "backed_off": _state(600, interval=MAX)}
+
+    assert select_vehicle_shard(vehicles, 10, NOW, STALENESS) == []
@@ -0,0 +1,56 @@
+from custom_components.dimo.dimoapi.query_planner import (
+    QUERY_BASE_COST, build_signal_selection, estimate_query_cost,
+    estimate_selection_cost, estimate_signal_cost, plan_signal_chunks)
+
+
+def test_estimate_signal_cost_plain_signal():
+    assert estimate_signal_cost("speed") == 3
+
+
+def test_estimate_signal_cost_custom_fragment():
+    # currentLocationCoordinates, timestamp, value, latitude, longitude, hdop
+    assert estimate_signal_cost("currentLocationCoordinates") == 6
+
+
+def test_estimate_selection_cost_ignores_arguments():
+    assert estimate_selection_cost('speed(agg: MED, filter: "x") { value }') == 2
+
+
+def test_estimate_query_cost():
+    assert estimate_query_cost(["speed", "currentLocationCoordinates"]) == (
+        QUERY_BASE_COST + 3 + 6
+    )
+
+
+def test_build_signal_selection_uses_custom_fragment():
+    assert "latitude" in build_signal_selection("currentLocationCoordinates")
+    assert build_signal_selection("speed").startswith("speed {")
+
+
+def test_plan_signal_chunks_fits_budget():
+    signal_names = [f"signal{i}" for i in range(20)] + ["currentLocationCoordinates"]
+
+    chunks = plan_signal_chunks(signal_names, budget=31)
+
+    assert sorted(name for chunk in chunks for name in chunk) == sorted(signal_names)
+    assert all(estimate_query_cost(chunk) <= 31 for chunk in chunks)
+    # 66 points of signals into 30 point bins cannot take fewer than 3 chunks
+    assert len(chunks) == 3
+
+
+def test_plan_signal_chunks_keeps_order_within_chunks():
+    signal_names = ["b", "a", "currentLocationCoordinates", "c"]
+
+    chunks = plan_signal_chunks(signal_names, budget=100)
+
+    assert chunks == [signal_names]
+
+
+def test_plan_signal_chunks_oversized_signal_gets_own_chunk():
+    chunks = plan_signal_chunks(["speed", "currentLocationCoordinates"], budget=5)
+
+    assert chunks == [["speed"], ["currentLocationCoordinates"]]
+
+
+def test_plan_signal_chunks_empty():
+    assert plan_signal_chunks([]) == []
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from custom_components.dimo.dimoapi.rate_limiter import (MIN_RATE,
+                                                         RateLimiter,
+                                                         parse_retry_after)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2, burst=2, clock=clock)
+
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == 0
+    # The bucket is empty, so waiters queue behind each other
+    assert limiter._reserve() == pytest.approx(0.5)
+    assert limiter._reserve() == pytest.approx(1.0)
+
+    clock.now += 10
+    assert limiter._reserve() == 0
+
+
+def test_throttle_pauses_and_halves_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=8, burst=5, clock=clock)
+
+    limiter.throttle(30)
+
+    assert limiter.rate == 4
+    assert limiter._reserve() == pytest.approx(30)
+    assert limiter.state() == {
+        "rate": 4,
+        "max_rate": 8,
+        "burst": 5,
+        "throttled": True,
+        "retry_in": 30,
+        "throttled_count": 1,
+    }
+
+    clock.now += 31
+    assert not limiter.state()["throttled"]
+
+
+def test_rate_recovers_after_successes():
+    limiter = RateLimiter(rate=1, clock=FakeClock())
+    for _ in range(10):
+        limiter.throttle(0)
+    assert limiter.rate == MIN_RATE
+
+    for _ in range(100):
+        limiter.record_success()
+    assert limiter.rate == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("12") == 12
+    assert parse_retry_after("garbage") is None
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 60
+
+
+async def test_async_acquire_waits_for_reservation(monkeypatch):
+    waits = []
+
+    async def fake_sleep(delay):
+        waits.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(rate=1, burst=1, clock=FakeClock())
+
+    await limiter.async_acquire()
+    await limiter.async_acquire()
+
+    assert waits == [pytest.approx(1.0)]
@@ -1,17 +1,22 @@
 from types import SimpleNamespace
+from unittest.mock import MagicMock
+
 from homeassistant.const import Platform
 
-from custom_components.dimo.sensor import DimoSensorEntity, DimoVehicleSensorEntity
+from custom_components.dimo.sensor import (DimoSensorEntity,
+                                           DimoVehicleSensorEntity,
+                                           async_setup_entry)
 from custom_components.dimo.const import DIMO_SENSORS, SIGNALS
 
 class MockSensorDef:
-    def __init__(self, unit_of_measure=None, platform=Platform.SENSOR, name="mock_name", device_class=None, icon=None, state_class=None):
+    def __init__(self, unit_of_measure=None, platform=Platform.SENSOR, name="mock_name", device_class=None, icon=None, state_class=None, entity_category=None):
         self.unit_of_measure = unit_of_measure
         self.platform = platform
         self.name = name
         self.device_class = device_class
         self.icon = icon
         self.state_class = state_class
+        self.entity_category = entity_category
 
 def test_dimo_sensor_entity_value(dummy_coordinator):
     key = "test_sensor_key"
@@ -94,3 +99,50 @@ def test_dimo_vehicle_sensor_entity_unit_missing(dummy_coordinator):
     
     entity = DimoVehicleSensorEntity(dummy_coordinator, token, key)
     assert entity.native_unit_of_measurement is None
+
+
+async def test_setup_entry_defers_vehicles_without_signal_data(hass, dummy_coordinator):
+    dummy_coordinator.vehicle_data = {
+        "v1": SimpleNamespace(signal_data=None),
+        "v2": SimpleNamespace(signal_data={"speed": {"value": 65}}),
+    }
+    listeners = []
+
+    def add_listener(listener):
+        listeners.append(listener)
+        return lambda: listeners.remove(listener)
+
+    v1_coordinator = SimpleNamespace(
+        vehicle_token_id="v1",
+        vehicle_data=dummy_coordinator.vehicle_data,
+        entry=dummy_coordinator.entry,
+        async_add_listener=add_listener,
+    )
+    dummy_coordinator.vehicle_coordinators = {
+        "v1": v1_coordinator,
+        "v2": dummy_coordinator,
+    }
+    entry = SimpleNamespace(
+        runtime_data=SimpleNamespace(coordinator=dummy_coordinator),
+        async_on_unload=MagicMock(),
+    )
+    add_entities = MagicMock()
+
+    def added_vehicle_entities():
+        return [
+            (entity.vehicle_token_id, entity.key)
+            for entity in add_entities.call_args.args[0]
+            if isinstance(entity, DimoVehicleSensorEntity)
+        ]
+
+    await async_setup_entry(hass, entry, add_entities)
+    assert added_vehicle_entities() == [("v2", "speed")]
+
+    # A failed refresh adds nothing, the first successful one adds the entities
+    listeners[0]()
+    assert add_entities.call_count == 1
+    dummy_coordinator.vehicle_data["v1"].signal_data = {"odometer": {"value": 5}}
+    listeners[0]()
+    assert add_entities.call_count == 2
+    assert added_vehicle_entities() == [("v1", "odometer")]
+    assert listeners == []
@@ -0,0 +1,33 @@
+from custom_components.dimo.token_store import EncryptedTokenStore
+
+TOKENS = {"access_token": "jwt", "privileged_tokens": [{"token_id": 1, "token": "vjwt"}]}
+
+
+async def test_tokens_are_encrypted_at_rest(hass, hass_storage):
+    store = EncryptedTokenStore(hass, "entry", "private_key")
+
+    await store.async_save(TOKENS)
+
+    stored = hass_storage["dimo.entry.tokens"]["data"]
+    assert "jwt" not in str(stored)
+    assert await EncryptedTokenStore(hass, "entry", "private_key").async_load() == TOKENS
+
+
+async def test_tokens_from_another_key_are_discarded(hass, hass_storage):
+    await EncryptedTokenStore(hass, "entry", "private_key").async_save(TOKENS)
+
+    assert await EncryptedTokenStore(hass, "entry", "other_key").async_load() is None
+
+
+async def test_load_without_stored_tokens(hass, hass_storage):
+    assert await EncryptedTokenStore(hass, "entry", "private_key").async_load() is None
+
+
+async def test_remove_deletes_stored_tokens(hass, hass_storage):
+    store = EncryptedTokenStore(hass, "entry", "private_key")
+    await store.async_save(TOKENS)
+
+    await store.async_remove()
+
+    assert "dimo.entry.tokens" not in hass_storage
+    assert await EncryptedTokenStore(hass, "entry", "private_key").async_load() is None